@@ -5,9 +5,17 @@ CREATE TABLE IF NOT EXISTS "users" (
   password_hash VARCHAR(255) NOT NULL,
   created_at TIMESTAMP NOT NULL DEFAULT now(),
   updated_at TIMESTAMP NOT NULL DEFAULT now(),
-  deleted_at TIMESTAMP
+  deleted_at TIMESTAMP,
+  security_version INT NOT NULL DEFAULT 0,
+  follower_count INT NOT NULL DEFAULT 0,
+  following_count INT NOT NULL DEFAULT 0,
+  post_count INT NOT NULL DEFAULT 0
 );
 
+CREATE INDEX IF NOT EXISTS users_deleted_at_idx ON "users" (deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS users_security_version_idx ON "users" (security_version) WHERE security_version > 0;
+CREATE INDEX IF NOT EXISTS users_updated_at_idx ON "users" (updated_at);
+
 CREATE TABLE IF NOT EXISTS posts (
   id SERIAL PRIMARY KEY,
   user_id INT NOT NULL REFERENCES "users"(id),
@@ -19,10 +27,63 @@ CREATE TABLE IF NOT EXISTS posts (
   deleted_at TIMESTAMP
 );
 
+-- Full-text search document, recomputed by PostgreSQL on every insert and update.
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(content, '')), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS posts_search_vector_idx ON posts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS posts_user_live_idx ON posts (user_id, created_at DESC, id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_live_created_idx ON posts (created_at DESC, id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_user_id_idx ON posts (user_id);
+CREATE INDEX IF NOT EXISTS posts_deleted_at_idx ON posts (deleted_at) WHERE deleted_at IS NOT NULL;
+
 CREATE TABLE IF NOT EXISTS "follows" (
   id SERIAL PRIMARY KEY,
   follower_id INT NOT NULL REFERENCES "users"(id) ON DELETE CASCADE,
   following_id INT NOT NULL REFERENCES "users"(id) ON DELETE CASCADE,
   created_at TIMESTAMP NOT NULL DEFAULT now(),
   UNIQUE (follower_id, following_id)
-);
\ No newline at end of file
+);
+
+CREATE INDEX IF NOT EXISTS follows_following_created_idx ON "follows" (following_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS follows_follower_created_idx ON "follows" (follower_id, created_at DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS timeline_entries (
+  id BIGSERIAL PRIMARY KEY,
+  owner_id INT NOT NULL REFERENCES "users"(id) ON DELETE CASCADE,
+  post_id INT NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+  author_id INT NOT NULL REFERENCES "users"(id) ON DELETE CASCADE,
+  created_at TIMESTAMP NOT NULL,
+  UNIQUE (owner_id, post_id)
+);
+
+CREATE INDEX IF NOT EXISTS timeline_owner_created_idx ON timeline_entries (owner_id, created_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS timeline_owner_author_idx ON timeline_entries (owner_id, author_id);
+CREATE INDEX IF NOT EXISTS timeline_post_idx ON timeline_entries (post_id);
+CREATE INDEX IF NOT EXISTS timeline_author_idx ON timeline_entries (author_id);
+
+CREATE TABLE IF NOT EXISTS archived_users (
+  id INT PRIMARY KEY,
+  name VARCHAR(100) NOT NULL,
+  email VARCHAR(150) NOT NULL,
+  created_at TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP NOT NULL,
+  deleted_at TIMESTAMP NOT NULL,
+  archived_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS archived_posts (
+  id INT PRIMARY KEY,
+  user_id INT NOT NULL,
+  title VARCHAR(100) NOT NULL,
+  content TEXT NOT NULL,
+  image_url VARCHAR(255),
+  created_at TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP NOT NULL,
+  deleted_at TIMESTAMP NOT NULL,
+  archived_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS archived_posts_user_id_idx ON archived_posts (user_id);
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from api.archive.purge import STEPS, Purger
+
+
+class Command(BaseCommand):
+    help = (
+        "Move posts and users soft-deleted longer ago than the retention window to the archive tables, "
+        "in small throttled batches. Safe to interrupt and run again: it resumes with the rows still eligible."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, help='Purge rows deleted more than this many days ago.')
+        parser.add_argument('--batch-size', type=int, help='Rows copied and deleted per transaction.')
+        parser.add_argument('--sleep', type=float, help='Seconds to pause between batches.')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be purged without writing.')
+
+    def handle(self, *args, retention_days, batch_size, sleep, dry_run, verbosity, **options):
+        self.verbosity = verbosity
+        purger = Purger.from_settings(
+            retention_days=retention_days, batch_size=batch_size, sleep=sleep, progress=self.report_progress,
+        )
+        self.stdout.write(f'Purging rows deleted before {purger.cutoff.isoformat()}.')
+
+        counts = purger.count() if dry_run else purger.run()
+        action = 'would be removed' if dry_run else 'removed'
+        for step in STEPS:
+            self.stdout.write(f'  {step:<17} {counts[step]} {action}')
+        self.stdout.write(self.style.SUCCESS('Dry run finished.' if dry_run else 'Purge finished.'))
+
+    def report_progress(self, step, total):
+        if self.verbosity > 1:
+            self.stdout.write(f'  {step}: {total} so far')
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-17 21:54
+
+from django.db import migrations, models
+
+from api.db.operations import AddIndexIfNotExists
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL.
+    atomic = False
+
+    dependencies = [
+        ('archive', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexIfNotExists(
+            model_name='archivedpost',
+            index=models.Index(fields=['user_id'], name='archived_posts_user_id_idx'),
+        ),
+    ]
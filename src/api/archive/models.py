@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ArchivedUser(models.Model):
+    """
+    A user purged from ``users`` after the retention window. The id is the
+    original one; credentials are not kept.
+    """
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    email = models.EmailField(max_length=150)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        db_table = 'archived_users'
+
+
+class ArchivedPost(models.Model):
+    """
+    A post purged from ``posts``, either deleted itself or written by a
+    purged user. ``user_id`` is kept without a foreign key since the author
+    may be archived as well.
+    """
+    id = models.IntegerField(primary_key=True)
+    user_id = models.IntegerField()
+    title = models.CharField(max_length=100)
+    content = models.TextField()
+    image_url = models.CharField(max_length=255, blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Archived post {self.id} by user {self.user_id}"
+
+    class Meta:
+        db_table = 'archived_posts'
+        indexes = [
+            models.Index(fields=['user_id'], name='archived_posts_user_id_idx'),
+        ]
@@ -0,0 +1,198 @@
+"""
+Batched purge of soft-deleted rows into the archive tables.
+
+Posts and users soft-deleted before the retention cutoff are copied to
+``archived_posts``/``archived_users`` and deleted, in this order:
+
+1. posts deleted before the cutoff, and every post of a user deleted before it;
+2. follows of those users, adjusting the counters of the other side;
+3. materialized timeline entries owned by those users;
+4. the users themselves, once nothing references them.
+
+Each batch runs in its own short transaction that copies and deletes the
+same rows, so an interrupted run loses nothing and the next run carries on
+from whatever is still eligible. Rows are locked with ``SKIP LOCKED`` and
+``lock_timeout`` is set per batch, so the job never queues behind, or
+holds up, request traffic. A batch whose lock times out is retried after a
+pause.
+"""
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.auth.user_cache import user_cache
+from api.post.models import Post, TimelineEntry
+from api.post.response_cache import bump_posts_version
+from api.social.models import Follow
+from api.user.counters import adjust_counter
+from api.user.models import User
+from .models import ArchivedPost, ArchivedUser
+
+STEPS = ('posts', 'follows', 'timeline_entries', 'users')
+
+POST_FIELDS = ('id', 'user_id', 'title', 'content', 'image_url', 'created_at', 'updated_at', 'deleted_at')
+USER_FIELDS = ('id', 'name', 'email', 'created_at', 'updated_at', 'deleted_at')
+
+
+def get_config():
+    config = {
+        'RETENTION_DAYS': 30,
+        'BATCH_SIZE': 500,
+        'SLEEP': 0.1,
+        'LOCK_TIMEOUT_MS': 2000,
+        'MAX_RETRIES': 5,
+    }
+    config.update(getattr(settings, 'PURGE', {}))
+    return config
+
+
+def decrement_counters(field, counts):
+    """Apply ``{user_id: n}`` decrements with one UPDATE per distinct n."""
+    by_amount = defaultdict(list)
+    for user_id, n in counts.items():
+        by_amount[n].append(user_id)
+    for n, user_ids in by_amount.items():
+        adjust_counter(user_ids, field, -n)
+
+
+class Purger:
+    def __init__(self, cutoff, batch_size=500, sleep=0.0, lock_timeout_ms=2000, max_retries=5, progress=None):
+        self.cutoff = cutoff
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.lock_timeout_ms = lock_timeout_ms
+        self.max_retries = max_retries
+        self.progress = progress
+
+    @classmethod
+    def from_settings(cls, **overrides):
+        config = get_config()
+        options = {
+            'batch_size': config['BATCH_SIZE'],
+            'sleep': config['SLEEP'],
+            'lock_timeout_ms': config['LOCK_TIMEOUT_MS'],
+            'max_retries': config['MAX_RETRIES'],
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        retention_days = options.pop('retention_days', config['RETENTION_DAYS'])
+        return cls(timezone.now() - timedelta(days=retention_days), **options)
+
+    def expired_users(self):
+        return User.objects.filter(deleted_at__lt=self.cutoff).values('id')
+
+    def querysets(self):
+        expired = self.expired_users()
+        return {
+            'posts': Post.objects.filter(Q(deleted_at__lt=self.cutoff) | Q(user_id__in=expired)),
+            'follows': Follow.objects.filter(Q(follower_id__in=expired) | Q(following_id__in=expired)),
+            'timeline_entries': TimelineEntry.objects.filter(owner_id__in=expired),
+            'users': User.objects.filter(deleted_at__lt=self.cutoff),
+        }
+
+    def count(self):
+        """Rows each step would remove, for dry runs."""
+        return {step: queryset.count() for step, queryset in self.querysets().items()}
+
+    def run(self):
+        handlers = {
+            'posts': self.archive_posts,
+            'follows': self.delete_follows,
+            'timeline_entries': self.delete_timeline_entries,
+            'users': self.archive_users,
+        }
+        querysets = self.querysets()
+        return {step: self.run_step(step, querysets[step], handlers[step]) for step in STEPS}
+
+    def run_step(self, step, queryset, handle):
+        total = 0
+        last_id = 0
+        while True:
+            batch = queryset.filter(id__gt=last_id).order_by('id')[:self.batch_size]
+            ids = self.run_batch(handle, batch)
+            if not ids:
+                return total
+            total += len(ids)
+            last_id = ids[-1]
+            if self.progress:
+                self.progress(step, total)
+            if self.sleep:
+                time.sleep(self.sleep)
+
+    def run_batch(self, handle, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                with transaction.atomic():
+                    self.set_lock_timeout()
+                    return handle(batch)
+            except OperationalError:
+                # Most likely the lock timeout; back off and retry the batch.
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(max(self.sleep, 0.1) * 2 ** attempt)
+
+    def set_lock_timeout(self):
+        if connection.vendor == 'postgresql' and self.lock_timeout_ms:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('lock_timeout', %s, true)", [f'{self.lock_timeout_ms}ms'])
+
+    @staticmethod
+    def lock(batch):
+        return batch.select_for_update(skip_locked=True, of=('self',))
+
+    def archive_posts(self, batch):
+        rows = list(self.lock(batch).values(*POST_FIELDS, 'user__deleted_at'))
+        if not rows:
+            return []
+        archived_at = timezone.now()
+        archived = []
+        for row in rows:
+            fields = {field: row[field] for field in POST_FIELDS}
+            # Live posts of a purged user take the user's deletion time.
+            fields['deleted_at'] = row['deleted_at'] or row['user__deleted_at']
+            archived.append(ArchivedPost(**fields, archived_at=archived_at))
+        ArchivedPost.objects.bulk_create(archived, ignore_conflicts=True)
+        ids = [row['id'] for row in rows]
+        Post.objects.filter(id__in=ids).delete()
+        return ids
+
+    def delete_follows(self, batch):
+        rows = list(self.lock(batch).values('id', 'follower_id', 'following_id'))
+        if not rows:
+            return []
+        ids = [row['id'] for row in rows]
+        Follow.objects.filter(id__in=ids).delete()
+        # Counters of the purged users themselves go away with their rows.
+        decrement_counters('following_count', Counter(row['follower_id'] for row in rows))
+        decrement_counters('follower_count', Counter(row['following_id'] for row in rows))
+        return ids
+
+    def delete_timeline_entries(self, batch):
+        ids = list(self.lock(batch).values_list('id', flat=True))
+        if ids:
+            TimelineEntry.objects.filter(id__in=ids).delete()
+        return ids
+
+    def archive_users(self, batch):
+        rows = list(self.lock(batch).values(*USER_FIELDS))
+        if not rows:
+            return []
+        archived_at = timezone.now()
+        ArchivedUser.objects.bulk_create(
+            [ArchivedUser(**row, archived_at=archived_at) for row in rows],
+            ignore_conflicts=True,
+        )
+        ids = [row['id'] for row in rows]
+        User.objects.filter(id__in=ids).delete()
+        transaction.on_commit(lambda: self.forget_users(ids))
+        return ids
+
+    @staticmethod
+    def forget_users(user_ids):
+        for user_id in user_ids:
+            user_cache.invalidate(user_id)
+            bump_posts_version(user_id)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.post.models import Post, TimelineEntry
+from api.social.models import Follow
+from api.user.models import User
+from .models import ArchivedPost, ArchivedUser
+from .purge import Purger
+
+
+class PurgeDeletedTestCase(APITestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.expired = now - timedelta(days=60)
+        self.alice = User.objects.create(name='Alice', email='alice@example.com', password_hash='hashedpassword')
+        self.bob = User.objects.create(
+            name='Bob', email='bob@example.com', password_hash='hashedpassword', deleted_at=self.expired,
+        )
+        self.carol = User.objects.create(
+            name='Carol', email='carol@example.com', password_hash='hashedpassword', deleted_at=now,
+        )
+
+        self.old_deleted = Post.objects.create(user=self.alice, title='Old', content='x', deleted_at=self.expired)
+        self.recent_deleted = Post.objects.create(user=self.alice, title='Recent', content='x', deleted_at=now)
+        self.live = Post.objects.create(user=self.alice, title='Live', content='x')
+        self.bob_post = Post.objects.create(user=self.bob, title='By Bob', content='x')
+        self.bob_post_deleted = Post.objects.create(user=self.bob, title='By Bob, deleted', content='x', deleted_at=now)
+
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        Follow.objects.create(follower=self.bob, following=self.alice)
+        Follow.objects.create(follower=self.carol, following=self.alice)
+        TimelineEntry.objects.create(owner=self.bob, post=self.live, author=self.alice, created_at=now)
+        call_command('reconcile_user_counters', stdout=StringIO())
+
+    def purge(self, *args):
+        out = StringIO()
+        call_command('purge_deleted', '--retention-days', '30', '--batch-size', '1', '--sleep', '0', *args, stdout=out)
+        return out.getvalue()
+
+    def test_moves_expired_rows_to_the_archive(self):
+        self.purge()
+
+        self.assertEqual(
+            set(Post.objects.values_list('id', flat=True)), {self.recent_deleted.id, self.live.id},
+        )
+        archived = {post.id: post for post in ArchivedPost.objects.all()}
+        self.assertEqual(set(archived), {self.old_deleted.id, self.bob_post.id, self.bob_post_deleted.id})
+        self.assertEqual(archived[self.bob_post.id].deleted_at, self.expired)
+        self.assertEqual(archived[self.bob_post_deleted.id].deleted_at, self.bob_post_deleted.deleted_at)
+
+        self.assertFalse(User.objects.filter(id=self.bob.id).exists())
+        self.assertEqual(list(ArchivedUser.objects.values_list('id', 'email')), [(self.bob.id, 'bob@example.com')])
+        self.assertTrue(User.objects.filter(id=self.carol.id).exists())
+        self.assertFalse(TimelineEntry.objects.exists())
+
+        self.alice.refresh_from_db()
+        self.assertEqual((self.alice.follower_count, self.alice.following_count), (1, 0))
+
+    def test_dry_run_writes_nothing(self):
+        output = self.purge('--dry-run')
+        self.assertIn('posts             3 would be removed', output)
+        self.assertIn('users             1 would be removed', output)
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertFalse(ArchivedPost.objects.exists())
+
+    def test_resumes_after_interruption(self):
+        def interrupt(step, total):
+            raise KeyboardInterrupt
+
+        purger = Purger(timezone.now() - timedelta(days=30), batch_size=1, progress=interrupt)
+        with self.assertRaises(KeyboardInterrupt):
+            purger.run()
+        # The committed batch is complete: archived and gone from the live table.
+        self.assertEqual(ArchivedPost.objects.count(), 1)
+        self.assertEqual(Post.objects.count(), 4)
+        self.assertFalse(Post.objects.filter(id__in=ArchivedPost.objects.values('id')).exists())
+
+        self.purge()
+        self.assertEqual(ArchivedPost.objects.count(), 3)
+        self.assertIn('posts             0 removed', self.purge())
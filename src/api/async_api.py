@@ -0,0 +1,72 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from api.auth.authentication import CustomJWTAuthentication
+from api.renderers import JSONRenderer
+
+
+def is_enabled():
+    return getattr(settings, 'ASYNC_VIEWS', False)
+
+
+def finalize_response(response):
+    """Render a DRF Response the way APIView would, as JSON only."""
+    if isinstance(response, Response):
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = JSONRenderer.media_type
+        response.renderer_context = {}
+        patch_vary_headers(response, ('Accept',))
+        response.render()
+    return response
+
+
+async def authenticate(request):
+    authenticator = CustomJWTAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+        if result is None:
+            raise exceptions.NotAuthenticated()
+    except (exceptions.NotAuthenticated, exceptions.AuthenticationFailed) as exc:
+        exc.auth_header = authenticator.authenticate_header(request)
+        raise
+    request.user, request.auth = result
+
+
+def async_api_view(sync_view):
+    """
+    Serve GET requests of an authenticated endpoint with the decorated
+    coroutine and hand every other method to ``sync_view``, the existing
+    ``@api_view``. The coroutine receives a DRF ``Request`` whose user was
+    resolved with ``CustomJWTAuthentication.aauthenticate`` and may return a
+    DRF ``Response``.
+
+    The wrapper carries the sync view's ``cls`` so the OpenAPI schema is the
+    same whichever view is routed.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+            drf_request = Request(request, authenticators=())
+            try:
+                await authenticate(drf_request)
+                response = await view(drf_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                response = exception_handler(exc, {'request': drf_request})
+            return finalize_response(response)
+
+        wrapper.cls = sync_view.cls
+        wrapper.initkwargs = sync_view.initkwargs
+        # Set directly: Django 4.2's csrf_exempt() does not preserve coroutines.
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
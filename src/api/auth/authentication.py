@@ -1,23 +1,95 @@
+from asgiref.sync import sync_to_async
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
 from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.utils.translation import gettext_lazy as _
 
+from api.db.routing import ause_primary_for, use_primary_for
 from api.user.models import User
+from .user_cache import user_cache
+from .token_versions import SECURITY_VERSION_CLAIM, get_config as get_claims_config, security_versions, user_from_claims
 
 class CustomJWTAuthentication(JWTAuthentication):
-    def get_user(self, validated_token):
+    def get_user_id(self, validated_token):
         try:
-            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+            return validated_token[jwt_settings.USER_ID_CLAIM]
         except KeyError:
             raise InvalidToken(_('Token contained no recognizable user identification'))
 
-        try:
-            user = User.objects.get(**{jwt_settings.USER_ID_FIELD: user_id})
-        except User.DoesNotExist:
-            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        use_primary_for(user_id)
+
+        if get_claims_config()['ENABLED'] and SECURITY_VERSION_CLAIM in validated_token:
+            return self.get_user_from_claims(validated_token, user_id)
+
+        use_cache = user_cache.config['ENABLED']
+        user = user_cache.get(user_id) if use_cache else None
 
+        if user is None:
+            try:
+                user = User.objects.get(**{jwt_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            if use_cache:
+                user_cache.set(user_id, user)
+
+        return self.check_active(user)
+
+    def check_active(self, user):
         if user.deleted_at is not None:
             raise AuthenticationFailed(_('User is inactive or deleted'), code='user_inactive')
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of ``authenticate`` for the async views. Token
+        decoding is CPU only and runs inline; only the user lookup awaits.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
 
-        return user
\ No newline at end of file
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        await ause_primary_for(user_id)
+
+        if get_claims_config()['ENABLED'] and SECURITY_VERSION_CLAIM in validated_token:
+            # The revocation table occasionally refreshes from the database.
+            return await sync_to_async(self.get_user_from_claims)(validated_token, user_id)
+
+        config = user_cache.config
+        use_cache = config['ENABLED']
+        # The local cache is a dict lookup; the shared one is a network round trip.
+        shared = config['USE_DJANGO_CACHE']
+        user = None
+        if use_cache:
+            user = await sync_to_async(user_cache.get)(user_id) if shared else user_cache.get(user_id)
+
+        if user is None:
+            try:
+                user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            if use_cache and shared:
+                await sync_to_async(user_cache.set)(user_id, user)
+            elif use_cache:
+                user_cache.set(user_id, user)
+
+        return self.check_active(user)
+
+    def get_user_from_claims(self, validated_token, user_id):
+        if not security_versions.is_current(int(user_id), validated_token[SECURITY_VERSION_CLAIM]):
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+        try:
+            return user_from_claims(validated_token, user_id)
+        except KeyError:
+            raise InvalidToken(_('Token is missing user claims'))
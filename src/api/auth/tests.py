@@ -0,0 +1,112 @@
+import hashlib
+
+from django.test import override_settings
+from prometheus_client import REGISTRY
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from api.user.models import User
+from api.post.models import Post
+from .user_cache import user_cache
+from .token_versions import security_versions
+
+
+@override_settings(AUTH_USER_CACHE={'ENABLED': True})
+class AuthUserCacheTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            name='Cached User',
+            email='cached@example.com',
+            password_hash=hashlib.md5('secret123'.encode()).hexdigest(),
+        )
+        user_cache.clear()
+
+        response = self.client.post(reverse('post_auth'), {'email': 'cached@example.com', 'password': 'secret123'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}")
+        self.detail_url = reverse('user_detail_operations', kwargs={'user_id': self.user.id})
+
+    def test_second_request_skips_auth_query(self):
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(1):  # only the user_detail_operations lookup
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = user_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_lookups_are_exported_to_prometheus(self):
+        def lookups(result):
+            return REGISTRY.get_sample_value('api_auth_user_cache_lookups_total', {'result': result}) or 0
+
+        local, misses = lookups('local'), lookups('miss')
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.assertEqual(lookups('local') - local, 1)
+        self.assertEqual(lookups('miss') - misses, 1)
+
+    def test_delete_invalidates_cached_user(self):
+        self.client.get(self.detail_url)
+        response = self.client.delete(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_patch_invalidates_cached_user(self):
+        self.client.get(self.detail_url)
+        self.client.patch(self.detail_url, {'name': 'Renamed'}, format='json')
+        self.assertEqual(user_cache.stats()['size'], 0)
+
+    @override_settings(AUTH_USER_CACHE={'ENABLED': False})
+    def test_cache_can_be_disabled(self):
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(2):
+            self.client.get(self.detail_url)
+
+
+@override_settings(TOKEN_CLAIMS_AUTH={'ENABLED': True, 'REFRESH_INTERVAL': 3600})
+class TokenClaimsAuthTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(
+            name='Claims User',
+            email='claims@example.com',
+            password_hash=hashlib.md5('secret123'.encode()).hexdigest(),
+        )
+        self.post = Post.objects.create(user=self.user, title='Title', content='Content')
+        user_cache.clear()
+        security_versions.clear()
+        security_versions.refresh(force=True)
+
+        response = self.client.post(reverse('post_auth'), {'email': 'claims@example.com', 'password': 'secret123'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}")
+        self.detail_url = reverse('user_detail_operations', kwargs={'user_id': self.user.id})
+
+    def test_post_detail_get_runs_no_auth_query(self):
+        url = reverse('post_detail_operations', kwargs={'post_id': self.post.id})
+        with self.assertNumQueries(1):  # the post with its author; nothing for auth
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_claims_user_can_write(self):
+        url = reverse('post_detail_operations', kwargs={'post_id': self.post.id})
+        response = self.client.patch(url, {'title': 'Edited'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_password_change_revokes_tokens(self):
+        response = self.client.patch(self.detail_url, {'password': 'newsecret'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_delete_revokes_tokens(self):
+        self.client.delete(self.detail_url)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_from_another_process_is_picked_up_on_refresh(self):
+        User.objects.filter(id=self.user.id).update(security_version=1)
+        security_versions.refresh(force=True)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
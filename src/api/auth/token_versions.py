@@ -0,0 +1,108 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from api.user.models import User
+
+SECURITY_VERSION_CLAIM = 'sv'
+NAME_CLAIM = 'name'
+EMAIL_CLAIM = 'email'
+
+
+def get_config():
+    config = {
+        'ENABLED': False,
+        'REFRESH_INTERVAL': 30,
+    }
+    config.update(getattr(settings, 'TOKEN_CLAIMS_AUTH', {}))
+    return config
+
+
+def add_user_claims(token, user):
+    token[SECURITY_VERSION_CLAIM] = user.security_version
+    token[NAME_CLAIM] = user.name
+    token[EMAIL_CLAIM] = user.email
+    return token
+
+
+def user_from_claims(validated_token, user_id):
+    """
+    Build a User from token claims without touching the database. Fields not
+    carried by the token are deferred and only loaded if something reads them.
+    """
+    return User.from_db(
+        'default',
+        ['id', 'name', 'email', 'deleted_at', 'security_version'],
+        [
+            user_id,
+            validated_token[NAME_CLAIM],
+            validated_token[EMAIL_CLAIM],
+            None,
+            validated_token[SECURITY_VERSION_CLAIM],
+        ],
+    )
+
+
+class SecurityVersionTable:
+    """
+    In-memory map of user id to current security version and deletion state.
+
+    Only users whose tokens may have been revoked (version bumped or account
+    deleted) are kept. The table is refreshed incrementally from
+    ``users.updated_at`` at most once per ``REFRESH_INTERVAL`` seconds, which
+    bounds how long a revoked token stays usable in other processes.
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._next_refresh = 0.0
+        self._synced_at = None
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return
+        with self._lock:
+            if not force and now < self._next_refresh:
+                return
+            interval = get_config()['REFRESH_INTERVAL']
+            started_at = timezone.now()
+            if self._synced_at is None:
+                rows = User.objects.filter(Q(security_version__gt=0) | Q(deleted_at__isnull=False))
+            else:
+                # Overlap the previous window so rows committed while it ran are not missed.
+                rows = User.objects.filter(updated_at__gte=self._synced_at - timedelta(seconds=interval))
+            for user_id, version, deleted_at in rows.values_list('id', 'security_version', 'deleted_at').iterator():
+                self._store(user_id, version, deleted_at is not None)
+            self._synced_at = started_at
+            self._next_refresh = now + interval
+
+    def _store(self, user_id, version, deleted):
+        if version or deleted:
+            self._versions[user_id] = (version, deleted)
+        else:
+            self._versions.pop(user_id, None)
+
+    def record(self, user):
+        """Apply a change made by this process immediately."""
+        with self._lock:
+            self._store(user.id, user.security_version, user.deleted_at is not None)
+
+    def is_current(self, user_id, version):
+        self.refresh()
+        current_version, deleted = self._versions.get(user_id, (0, False))
+        return not deleted and version >= current_version
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+            self._next_refresh = 0.0
+            self._synced_at = None
+
+
+security_versions = SecurityVersionTable()
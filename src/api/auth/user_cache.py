@@ -0,0 +1,109 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from api.metrics.metrics import AUTH_USER_CACHE_LOOKUPS
+
+
+class UserCache:
+    """
+    Per-process TTL/LRU cache of users resolved during authentication.
+
+    When ``USE_DJANGO_CACHE`` is set, misses fall through to the configured
+    Django cache before the database, so workers share resolved users and an
+    invalidation reaches every process within the local TTL.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def config(self):
+        config = {
+            'ENABLED': False,
+            'TTL': 30,
+            'MAX_SIZE': 10000,
+            'USE_DJANGO_CACHE': False,
+            'CACHE_ALIAS': 'default',
+        }
+        config.update(getattr(settings, 'AUTH_USER_CACHE', {}))
+        return config
+
+    def _shared_key(self, user_id):
+        return f'auth:user:{user_id}'
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        config = self.config
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                AUTH_USER_CACHE_LOOKUPS.labels('local').inc()
+                return copy.copy(entry[1])
+            if entry is not None:
+                del self._entries[user_id]
+
+        if config['USE_DJANGO_CACHE']:
+            user = caches[config['CACHE_ALIAS']].get(self._shared_key(user_id))
+            if user is not None:
+                self._store_local(user_id, user, config)
+                with self._lock:
+                    self.hits += 1
+                AUTH_USER_CACHE_LOOKUPS.labels('shared').inc()
+                return copy.copy(user)
+
+        with self._lock:
+            self.misses += 1
+        AUTH_USER_CACHE_LOOKUPS.labels('miss').inc()
+        return None
+
+    def set(self, user_id, user):
+        user_id = str(user_id)
+        config = self.config
+        self._store_local(user_id, user, config)
+        if config['USE_DJANGO_CACHE']:
+            caches[config['CACHE_ALIAS']].set(self._shared_key(user_id), user, config['TTL'])
+
+    def _store_local(self, user_id, user, config):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + config['TTL'], user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > config['MAX_SIZE']:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        config = self.config
+        with self._lock:
+            self._entries.pop(user_id, None)
+        if config['USE_DJANGO_CACHE']:
+            caches[config['CACHE_ALIAS']].delete(self._shared_key(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+            }
+
+
+user_cache = UserCache()
@@ -3,11 +3,12 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from .serializers.auth_serializers import EmailTokenObtainSerializer
+from .token_versions import add_user_claims
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.permissions import AllowAny
-from rest_framework.parsers import JSONParser
+from api.parsers import JSONParser
 
 from drf_spectacular.utils import extend_schema,OpenApiResponse
 
@@ -43,7 +44,7 @@ def post_auth(request):
     serializer.is_valid(raise_exception=True)
 
     user = serializer.validated_data['user']
-    refresh = RefreshToken.for_user(user)
+    refresh = add_user_claims(RefreshToken.for_user(user), user)
 
     return Response({
         'user_id': user.id,
@@ -0,0 +1,110 @@
+import hashlib
+import random
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from api.post.models import Post
+from api.social.models import Follow
+from api.user.models import User
+
+EMAIL_DOMAIN = 'loadtest.invalid'
+PASSWORD = 'loadtest'
+
+
+def dataset_users():
+    return User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+
+
+def user_email(number):
+    return f'user{number}@{EMAIL_DOMAIN}'
+
+
+def password_hash():
+    return hashlib.md5(PASSWORD.encode()).hexdigest()
+
+
+def next_user_id():
+    """
+    One past the highest user id. Emails are numbered from here, so they
+    never collide with those of rows seeded earlier.
+    """
+    return (User.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+
+
+def pick_followed(rng, user_index, candidates, count, graph):
+    """
+    Choose ``count`` distinct accounts for a user to follow. With the ``zipf``
+    shape, low-index accounts attract most follows, which reproduces the
+    handful of very large accounts a real network has.
+    """
+    count = min(count, len(candidates) - 1)
+    chosen = set()
+    attempts = 0
+    while len(chosen) < count:
+        attempts += 1
+        # Fall back to uniform picks once the skewed draws keep colliding.
+        if graph == 'zipf' and attempts <= count * 20:
+            index = min(int(rng.paretovariate(1.2)) - 1, len(candidates) - 1)
+        else:
+            index = rng.randrange(len(candidates))
+        if index != user_index:
+            chosen.add(candidates[index])
+    return chosen
+
+
+def seed(users, posts_per_user, follows_per_user, graph='zipf', seed=0, batch_size=1000):
+    """
+    Create a self-contained dataset for load tests. Rows are tagged through
+    the users' email domain so they can be found again or removed with
+    :func:`clear`.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    with transaction.atomic():
+        first = next_user_id()
+        User.objects.bulk_create(
+            [
+                User(name=f'Load Test {i}', email=user_email(first + i), password_hash=password_hash())
+                for i in range(users)
+            ],
+            batch_size=batch_size,
+        )
+        user_ids = list(dataset_users().order_by('id').values_list('id', flat=True))
+
+        posts = []
+        for user_id in user_ids:
+            for _ in range(posts_per_user):
+                posts.append(Post(
+                    user_id=user_id,
+                    title=f'Post by {user_id}',
+                    content='Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * rng.randint(1, 6),
+                ))
+        Post.objects.bulk_create(posts, batch_size=batch_size)
+        # auto_now_add stamps every row with the same instant; spread them out
+        # so ordering and cursor pagination behave as they do in production.
+        posts = list(Post.objects.filter(user_id__in=dataset_users().values('id')).only('id', 'created_at'))
+        for post in posts:
+            post.created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+        Post.objects.bulk_update(posts, ['created_at'], batch_size=batch_size)
+
+        follows = []
+        for index, user_id in enumerate(user_ids):
+            for following_id in pick_followed(rng, index, user_ids, follows_per_user, graph):
+                follows.append(Follow(follower_id=user_id, following_id=following_id))
+        Follow.objects.bulk_create(follows, batch_size=batch_size, ignore_conflicts=True)
+
+        call_command('reconcile_user_counters', stdout=StringIO())
+
+    return {'users': len(user_ids), 'posts': len(user_ids) * posts_per_user, 'follows': len(follows)}
+
+
+def clear():
+    """Remove every row created by :func:`seed`."""
+    with transaction.atomic():
+        count, _ = dataset_users().delete()
+    return count
@@ -0,0 +1,318 @@
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.auth.token_versions import add_user_claims
+from api.post.models import Post
+from api.social.models import Follow
+
+from .dataset import PASSWORD, dataset_users
+
+
+class Scenario:
+    """
+    One endpoint of the mix. ``build`` receives the shared dataset, a
+    random generator and the index of the acting user, and returns
+    ``(method, path, body)``, or None when the actor has nothing to do
+    there; a response is counted as an error when its status is not in
+    ``expected``.
+    """
+
+    def __init__(self, name, weight, build, expected, authenticated=True):
+        self.name = name
+        self.weight = weight
+        self.build = build
+        self.expected = expected
+        self.authenticated = authenticated
+
+
+SCENARIOS = [
+    Scenario(
+        'list_user_posts', 20,
+        lambda data, rng, actor: ('GET', reverse('list_user_posts', args=[data.user_id(rng)]) + '?page_size=20', None),
+        {200},
+    ),
+    Scenario(
+        'home_feed', 20,
+        lambda data, rng, actor: ('GET', reverse('home_feed') + '?page_size=20', None),
+        {200},
+    ),
+    Scenario(
+        'post_detail', 20,
+        lambda data, rng, actor: ('GET', reverse('post_detail_operations', args=[rng.choice(data.post_ids)]), None),
+        {200},
+    ),
+    Scenario(
+        'user_detail', 10,
+        lambda data, rng, actor: ('GET', reverse('user_detail_operations', args=[data.user_id(rng)]), None),
+        {200},
+    ),
+    Scenario(
+        'list_followers', 10,
+        lambda data, rng, actor: ('GET', reverse('list_followers', args=[data.user_id(rng)]) + '?page_size=20', None),
+        {200},
+    ),
+    Scenario(
+        'create_post', 8,
+        lambda data, rng, actor: ('POST', reverse('create_post'), {'title': 'Load test', 'content': 'Lorem ipsum dolor sit amet.'}),
+        {201},
+    ),
+    # The dataset tracks who each actor follows, so follows only target users
+    # the actor does not follow yet and unfollows only ones it does.
+    Scenario(
+        'follow_user', 5,
+        lambda data, rng, actor: data.follow(rng, actor),
+        {201},
+    ),
+    Scenario(
+        'unfollow_user', 5,
+        lambda data, rng, actor: data.unfollow(rng, actor),
+        {204},
+    ),
+    Scenario(
+        'post_auth', 2,
+        lambda data, rng, actor: ('POST', reverse('post_auth'), {'email': rng.choice(data.emails), 'password': PASSWORD}),
+        {200},
+        authenticated=False,
+    ),
+]
+
+
+class Dataset:
+    """Ids and tokens of the seeded dataset, loaded once before a run."""
+
+    def __init__(self, sample_size=10000):
+        # seed_data soft-deletes a share of its users; they cannot sign in.
+        users = list(dataset_users().filter(deleted_at__isnull=True).order_by('id')[:sample_size])
+        if not users:
+            raise ValueError('No load test users found; seed the dataset first.')
+        self.user_ids = [user.id for user in users]
+        self.emails = [user.email for user in users]
+        self.tokens = [str(add_user_claims(RefreshToken.for_user(user), user).access_token) for user in users]
+        self.post_ids = list(
+            Post.objects.filter(user_id__in=self.user_ids, deleted_at__isnull=True)
+            .order_by('-id').values_list('id', flat=True)[:sample_size]
+        )
+        if not self.post_ids:
+            raise ValueError('The load test users have no posts; seed the dataset with --posts-per-user > 0.')
+        self.following = defaultdict(set)
+        for follower_id, following_id in Follow.objects.filter(follower_id__in=self.user_ids).values_list(
+            'follower_id', 'following_id'
+        ):
+            self.following[follower_id].add(following_id)
+
+    def user_id(self, rng):
+        return rng.choice(self.user_ids)
+
+    def follow(self, rng, actor, attempts=10):
+        """A follow of a user the actor does not follow yet, recorded as done."""
+        actor_id = self.user_ids[actor]
+        for _ in range(attempts):
+            user_id = self.user_id(rng)
+            if user_id != actor_id and user_id not in self.following[actor_id]:
+                self.following[actor_id].add(user_id)
+                return 'POST', reverse('follow_user', args=[user_id]), None
+        return None
+
+    def unfollow(self, rng, actor):
+        """An unfollow of a user the actor follows, recorded as done."""
+        following = self.following[self.user_ids[actor]]
+        if not following:
+            return None
+        user_id = rng.choice(sorted(following))
+        following.discard(user_id)
+        return 'DELETE', reverse('unfollow_user', args=[user_id]), None
+
+
+def allowed_host():
+    """A host name that passes ALLOWED_HOSTS, for requests made in process."""
+    for host in settings.ALLOWED_HOSTS:
+        if host == '*':
+            break
+        return host.lstrip('.')
+    return 'localhost'
+
+
+class InProcessTransport:
+    """Sends requests through Django's test client, without a server."""
+
+    def __init__(self):
+        # The test client's default host, testserver, is only allowed under
+        # the test runner.
+        host = allowed_host()
+        self.client = Client(SERVER_NAME=host, HTTP_HOST=host)
+
+    def request(self, method, path, body, token):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        data = json.dumps(body) if body is not None else None
+        response = self.client.generic(method, path, data or '', content_type='application/json', **headers)
+        return response.status_code
+
+    def close(self):
+        # Worker threads open their own database connection; the main thread
+        # keeps its one, which may be inside a transaction.
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+
+
+class HttpTransport:
+    """Sends requests to a running server over one keep-alive connection."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.netloc, timeout=30)
+        self.prefix = parts.path.rstrip('/')
+
+    def request(self, method, path, body, token):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+        try:
+            self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            return 0
+        return response.status
+
+    def close(self):
+        self.connection.close()
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(fraction * len(samples)), 1)
+    return samples[rank - 1]
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, name, seconds, ok):
+        with self._lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            self.errors.setdefault(name, 0)
+            if not ok:
+                self.errors[name] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for name, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            endpoints[name] = {
+                'requests': len(latencies),
+                'errors': self.errors[name],
+                'throughput': len(latencies) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(latencies, 0.50) * 1000,
+                'p95_ms': percentile(latencies, 0.95) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+            }
+        total = sum(endpoint['requests'] for endpoint in endpoints.values())
+        return {
+            'elapsed_s': elapsed,
+            'requests': total,
+            'errors': sum(endpoint['errors'] for endpoint in endpoints.values()),
+            'throughput': total / elapsed if elapsed else 0.0,
+            'endpoints': endpoints,
+        }
+
+
+def run(data, transport_factory, concurrency=1, requests=None, duration=None, seed=0, scenarios=SCENARIOS):
+    """
+    Drive the scenario mix with ``concurrency`` clients until ``requests``
+    have been sent in total or ``duration`` seconds have passed, and return
+    the per-endpoint summary.
+    """
+    if requests is None and duration is None:
+        raise ValueError('Either requests or duration is required.')
+
+    recorder = Recorder()
+    weights = [scenario.weight for scenario in scenarios]
+    remaining = [requests]
+    remaining_lock = threading.Lock()
+    deadline = time.perf_counter() + duration if duration is not None else None
+
+    def take():
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if requests is None:
+            return True
+        with remaining_lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(index):
+        rng = random.Random(seed * 1000003 + index)
+        # Each worker acts as its own share of the users, so the follow state
+        # the dataset tracks per actor is never raced by another worker.
+        actors = range(index, len(data.tokens), concurrency) if index < len(data.tokens) else range(len(data.tokens))
+        transport = transport_factory()
+        try:
+            while take():
+                actor = rng.choice(actors)
+                request = None
+                while request is None:
+                    scenario = rng.choices(scenarios, weights)[0]
+                    request = scenario.build(data, rng, actor)
+                method, path, body = request
+                token = data.tokens[actor] if scenario.authenticated else None
+                started = time.perf_counter()
+                status_code = transport.request(method, path, body, token)
+                recorder.record(scenario.name, time.perf_counter() - started, status_code in scenario.expected)
+        finally:
+            transport.close()
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        worker(0)
+    else:
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return recorder.summary(time.perf_counter() - started)
+
+
+def compare(baseline, current, threshold=0.2, metric='p95_ms'):
+    """
+    List the endpoints whose ``metric`` is more than ``threshold`` (a
+    fraction) slower than in the baseline run, or whose error rate grew.
+    """
+    regressions = []
+    for name, before in baseline.get('endpoints', {}).items():
+        after = current['endpoints'].get(name)
+        if after is None:
+            continue
+        if before[metric] and after[metric] > before[metric] * (1 + threshold):
+            regressions.append(
+                f"{name}: {metric} {before[metric]:.1f} -> {after[metric]:.1f} "
+                f"(+{(after[metric] / before[metric] - 1) * 100:.0f}%)"
+            )
+        before_rate = before['errors'] / before['requests'] if before['requests'] else 0.0
+        after_rate = after['errors'] / after['requests'] if after['requests'] else 0.0
+        if after_rate > before_rate:
+            regressions.append(f"{name}: error rate {before_rate:.1%} -> {after_rate:.1%}")
+    return regressions
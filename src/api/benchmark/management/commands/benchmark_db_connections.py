@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.postgresql import base
+
+from api.benchmark.loadtest import percentile
+from api.db.postgresql_pool import base as pooled
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of getting a database connection: a new connection per request "
+        "(CONN_MAX_AGE = 0), a persistent connection per thread and the pooled backend. Each simulated "
+        "request connects, runs SELECT 1 and releases the connection the way Django does at request end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='Simulated requests per thread and mode.')
+        parser.add_argument('--threads', type=int, default=4, help='Concurrent threads, like a threaded worker.')
+        parser.add_argument('--pool-size', type=int, default=4, help='MAX_SIZE of the pool.')
+
+    def handle(self, *args, requests, threads, pool_size, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark needs a PostgreSQL database.')
+
+        settings_dict = {**connection.settings_dict, 'CONN_MAX_AGE': 0}
+        pooled_settings = {**settings_dict, 'POOL': {'MAX_SIZE': pool_size}}
+        modes = [
+            ('new connection', lambda: base.DatabaseWrapper(settings_dict, 'benchmark_direct'), True),
+            ('persistent', lambda: base.DatabaseWrapper(settings_dict, 'benchmark_persistent'), False),
+            ('pooled', lambda: pooled.DatabaseWrapper(pooled_settings, 'benchmark_pooled'), True),
+        ]
+
+        self.stdout.write(f'{requests} requests x {threads} threads per mode:')
+        results = {}
+        for name, make_wrapper, close_per_request in modes:
+            latencies = self.run_mode(make_wrapper, close_per_request, requests, threads)
+            results[name] = latencies
+            self.stdout.write(
+                f'  {name:<15} mean {sum(latencies) / len(latencies) * 1000:7.3f} ms   '
+                f'p50 {percentile(latencies, 0.50) * 1000:7.3f} ms   p99 {percentile(latencies, 0.99) * 1000:7.3f} ms'
+            )
+        pooled.close_pools('benchmark_pooled')
+
+        direct = sum(results['new connection']) / len(results['new connection'])
+        pool = sum(results['pooled']) / len(results['pooled'])
+        self.stdout.write(self.style.SUCCESS(f'Pooling saves {(direct - pool) * 1000:.3f} ms per request.'))
+
+    def run_mode(self, make_wrapper, close_per_request, requests, threads):
+        latencies = []
+        lock = threading.Lock()
+
+        def worker():
+            wrapper = make_wrapper()
+            samples = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                with wrapper.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                if close_per_request:
+                    wrapper.close()
+                samples.append(time.perf_counter() - started)
+            wrapper.close()
+            with lock:
+                latencies.extend(samples)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return sorted(latencies)
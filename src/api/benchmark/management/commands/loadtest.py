@@ -0,0 +1,110 @@
+import json
+import time
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmark import dataset
+from api.benchmark.loadtest import Dataset, HttpTransport, InProcessTransport, compare, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a load test dataset and drive the API endpoints with concurrent clients, reporting "
+        "throughput and p50/p95/p99 latency per endpoint. Runs in process by default, or against "
+        "a running server with --base-url."
+    )
+
+    def add_arguments(self, parser):
+        seeding = parser.add_argument_group('dataset')
+        seeding.add_argument('--users', type=int, default=1000, help='Number of users to seed.')
+        seeding.add_argument('--posts-per-user', type=int, default=20, help='Posts created for each user.')
+        seeding.add_argument('--follows-per-user', type=int, default=50, help='Accounts each user follows.')
+        seeding.add_argument('--graph', choices=['zipf', 'uniform'], default='zipf',
+                             help='Shape of the follow graph. zipf concentrates followers on a few accounts.')
+        seeding.add_argument('--skip-seed', action='store_true', help='Reuse the dataset from a previous run.')
+        seeding.add_argument('--clear', action='store_true', help='Delete the dataset and exit.')
+
+        load = parser.add_argument_group('load')
+        load.add_argument('--base-url', help='Server to test, e.g. http://localhost:8000. Defaults to in process.')
+        load.add_argument('--concurrency', type=int, default=4, help='Number of concurrent clients.')
+        load.add_argument('--requests', type=int, help='Total number of requests to send.')
+        load.add_argument('--duration', type=float, help='Seconds to run for. Defaults to 30 without --requests.')
+        load.add_argument('--seed', type=int, default=0, help='Random seed for the dataset and the request mix.')
+
+        results = parser.add_argument_group('results')
+        results.add_argument('--output', help='Write the results as JSON to this file.')
+        results.add_argument('--baseline', help='JSON results of a previous run to compare against.')
+        results.add_argument('--threshold', type=float, default=0.2,
+                             help='Allowed p95 slowdown against the baseline, as a fraction.')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted = dataset.clear()
+            self.stdout.write(self.style.SUCCESS(f'{deleted} rows deleted.'))
+            return
+
+        if not options['skip_seed']:
+            if dataset.dataset_users().exists():
+                raise CommandError('A load test dataset already exists. Use --skip-seed to reuse it or --clear first.')
+            started = time.perf_counter()
+            counts = dataset.seed(
+                options['users'], options['posts_per_user'], options['follows_per_user'],
+                graph=options['graph'], seed=options['seed'],
+            )
+            self.stdout.write(
+                f"Seeded {counts['users']} users, {counts['posts']} posts and {counts['follows']} follows "
+                f"in {time.perf_counter() - started:.1f} s."
+            )
+
+        try:
+            data = Dataset()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if options['base_url']:
+            transport_factory = partial(HttpTransport, options['base_url'])
+        else:
+            transport_factory = InProcessTransport
+
+        duration = options['duration']
+        if duration is None and options['requests'] is None:
+            duration = 30.0
+        results = run(
+            data, transport_factory,
+            concurrency=options['concurrency'],
+            requests=options['requests'],
+            duration=duration,
+            seed=options['seed'],
+        )
+        results['config'] = {
+            key: options[key]
+            for key in ('users', 'posts_per_user', 'follows_per_user', 'graph', 'concurrency', 'seed', 'base_url')
+        }
+
+        self.report(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare(baseline, results, threshold=options['threshold'])
+            if regressions:
+                raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+
+    def report(self, results):
+        self.stdout.write(f"{'endpoint':<18}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, endpoint in results['endpoints'].items():
+            self.stdout.write(
+                f"{name:<18}{endpoint['requests']:>10}{endpoint['errors']:>8}{endpoint['throughput']:>10.1f}"
+                f"{endpoint['p50_ms']:>10.1f}{endpoint['p95_ms']:>10.1f}{endpoint['p99_ms']:>10.1f}"
+            )
+        self.stdout.write(
+            f"{results['requests']} requests, {results['errors']} errors in {results['elapsed_s']:.1f} s "
+            f"({results['throughput']:.1f} req/s)."
+        )
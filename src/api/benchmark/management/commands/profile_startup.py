@@ -0,0 +1,46 @@
+import statistics
+
+from django.core.management.base import BaseCommand
+
+from api.benchmark.startup import LAZY_MODULES, get_config, profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot fresh interpreters with the current settings, run django.setup() and resolve URLs the way "
+        "a new worker does, and report the wall time and the import time per module (python -X importtime)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths', help='URL to resolve. Repeatable.')
+        parser.add_argument('--runs', type=int, default=5, help='Timed boots; the best and median are reported.')
+        parser.add_argument('--top', type=int, default=25, help='Number of modules to list.')
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative',
+                            help='Rank modules by time including or excluding their own imports.')
+
+    def handle(self, *args, paths, runs, top, sort, **options):
+        config = get_config()
+        paths = paths or config['PATHS']
+
+        report = profile(paths, importtime=True)
+        self.stdout.write(f'Slowest {top} imports by {sort} time (ms, under -X importtime):')
+        self.stdout.write(f'  {"self":>8} {"cumulative":>11}  module')
+        for item in report.slowest(top, sort):
+            self.stdout.write(f'  {item.self_us / 1000:8.1f} {item.cumulative_us / 1000:11.1f}  {item.module}')
+
+        self.stdout.write('Self time per package (ms):')
+        for package, self_us in report.by_package()[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f}  {package}')
+
+        eager = [module for module in LAZY_MODULES if module in report.modules]
+        if eager:
+            self.stdout.write(self.style.WARNING(f'Imported at startup but meant to load lazily: {", ".join(eager)}'))
+
+        timings = sorted(profile(paths).seconds for _ in range(runs))
+        best, median = timings[0], statistics.median(timings)
+        summary = f'django.setup() + resolve {", ".join(paths)}: best {best:.3f} s, median {median:.3f} s over {runs} runs'
+        budget = config['BUDGET_SECONDS']
+        if best <= budget:
+            self.stdout.write(self.style.SUCCESS(f'{summary} (budget {budget:.3f} s)'))
+        else:
+            self.stdout.write(self.style.ERROR(f'{summary} exceeds the budget of {budget:.3f} s'))
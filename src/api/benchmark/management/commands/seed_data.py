@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from api.benchmark.seeding import Plan, chunks, load_chunk, reserve_user_ids, update_counters, uses_copy
+
+
+def init_worker():
+    # Forked workers inherit the parent's setup; spawned ones start empty.
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, realistic dataset: users with a power-law follower distribution, posts and "
+        "follows spread over several years and a share of soft-deleted rows. On PostgreSQL rows are "
+        "streamed with COPY FROM STDIN from parallel worker processes; other databases fall back to "
+        "batched bulk_create in a single process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000, help='Number of users to create.')
+        parser.add_argument('--posts-per-user', type=float, default=20, help='Average posts per user.')
+        parser.add_argument('--follows-per-user', type=float, default=50, help='Average accounts followed per user.')
+        parser.add_argument('--years', type=float, default=3, help='Period the timestamps are spread over.')
+        parser.add_argument('--deleted-ratio', type=float, default=0.02,
+                            help='Share of users and posts that are soft-deleted.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Worker processes used with COPY. Ignored on other databases.')
+        parser.add_argument('--chunk-size', type=int, default=10000, help='Users handled per worker task.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per COPY or bulk_create call.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data.')
+
+    def handle(self, *args, users, chunk_size, workers, **options):
+        if users < 1 or chunk_size < 1:
+            raise CommandError('--users and --chunk-size must be positive.')
+
+        plan = Plan(
+            reserve_user_ids(users), users,
+            posts_per_user=options['posts_per_user'],
+            follows_per_user=options['follows_per_user'],
+            years=options['years'],
+            deleted_ratio=options['deleted_ratio'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        tasks = chunks(plan, chunk_size)
+        parallel = uses_copy() and workers > 1
+        self.stdout.write(
+            f"Seeding users {plan.first_id}..{plan.first_id + users - 1} "
+            f"with {'COPY, %d workers' % workers if parallel else 'bulk_create'}."
+        )
+
+        started = time.perf_counter()
+        if parallel:
+            # Workers must open their own connections rather than share the parent's socket.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+                self.run_phases(plan, tasks, executor.map)
+        else:
+            self.run_phases(plan, tasks, map)
+
+        if uses_copy():
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE "users", posts, "follows"')
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.perf_counter() - started:.1f} s.'))
+
+    def run_phases(self, plan, tasks, map_function):
+        plans = [plan] * len(tasks)
+        starts = [start for start, _ in tasks]
+        stops = [stop for _, stop in tasks]
+
+        # Users must all exist before posts and follows reference them.
+        for phase in ('users', 'posts', 'follows'):
+            started = time.perf_counter()
+            written = sum(map_function(load_chunk, plans, [phase] * len(tasks), starts, stops))
+            self.stdout.write(f'  {phase}: {written} rows in {time.perf_counter() - started:.1f} s')
+
+        started = time.perf_counter()
+        list(map_function(update_counters, plans, starts, stops))
+        self.stdout.write(f'  counters: {time.perf_counter() - started:.1f} s')
@@ -0,0 +1,207 @@
+import csv
+import io
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from api.post.models import Post
+from api.social.models import Follow
+from api.user.models import User
+from .dataset import next_user_id, password_hash, pick_followed, user_email
+
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et '
+    'dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip ex ea '
+    'commodo consequat duis aute irure in reprehenderit voluptate velit esse cillum fugiat nulla pariatur'
+).split()
+
+# Columns created by the migrations have no database default, so COPY writes
+# security_version and the counters too. update_counters fills in the counts.
+USER_COLUMNS = (
+    'id', 'name', 'email', 'password_hash', 'created_at', 'updated_at', 'deleted_at',
+    'security_version', 'follower_count', 'following_count', 'post_count',
+)
+POST_COLUMNS = ('user_id', 'title', 'content', 'image_url', 'created_at', 'updated_at', 'deleted_at')
+FOLLOW_COLUMNS = ('follower_id', 'following_id', 'created_at')
+
+
+def uses_copy():
+    return connection.vendor == 'postgresql'
+
+
+def reserve_user_ids(count):
+    """
+    Return the first id of a block of ``count`` user ids. Ids are assigned
+    up front so that posts and follows can be generated independently of the
+    order in which the user rows land.
+    """
+    first_id = next_user_id()
+    if uses_copy():
+        # Move the sequence past the block so regular inserts cannot collide.
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT setval(pg_get_serial_sequence('users', 'id'), %s)", [first_id + count - 1])
+    return first_id
+
+
+def heavy_tailed(rng, mean, cap):
+    """A Pareto distributed count (shape 1.5, so three times the scale on average) with the given mean."""
+    return min(int(rng.paretovariate(1.5) * mean / 3), cap)
+
+
+class Plan:
+    """
+    Everything a worker needs to generate its share of the data. Kept
+    picklable so it can be shipped to worker processes.
+    """
+
+    def __init__(self, first_id, users, posts_per_user, follows_per_user, years, deleted_ratio, seed, batch_size):
+        self.first_id = first_id
+        self.users = users
+        self.posts_per_user = posts_per_user
+        self.follows_per_user = follows_per_user
+        self.deleted_ratio = deleted_ratio
+        self.seed = seed
+        self.batch_size = batch_size
+        self.now = datetime.now(dt_timezone.utc)
+        self.start = self.now - timedelta(days=365 * years)
+
+    def rng(self, phase, start):
+        return random.Random(f'{self.seed}:{phase}:{start}')
+
+    def joined_at(self, user_id):
+        # Sign-ups are spread evenly over the period in id order, so the most
+        # followed (lowest ranked) accounts are also the oldest ones.
+        position = (user_id - self.first_id) / max(self.users, 1)
+        return self.start + (self.now - self.start) * position
+
+    def between(self, rng, earliest):
+        return earliest + (self.now - earliest) * rng.random()
+
+    def deleted_at(self, rng, created_at):
+        return self.between(rng, created_at) if rng.random() < self.deleted_ratio else None
+
+    def user_rows(self, start, stop):
+        rng = self.rng('users', start)
+        hashed = password_hash()
+        for user_id in range(self.first_id + start, self.first_id + stop):
+            created_at = self.joined_at(user_id)
+            deleted_at = self.deleted_at(rng, created_at)
+            yield (
+                user_id, f'Seed User {user_id}', user_email(user_id), hashed,
+                created_at, deleted_at or created_at, deleted_at,
+                0, 0, 0, 0,
+            )
+
+    def post_rows(self, start, stop):
+        rng = self.rng('posts', start)
+        for user_id in range(self.first_id + start, self.first_id + stop):
+            joined_at = self.joined_at(user_id)
+            for _ in range(heavy_tailed(rng, self.posts_per_user, 10000)):
+                created_at = self.between(rng, joined_at)
+                deleted_at = self.deleted_at(rng, created_at)
+                yield (
+                    user_id,
+                    ' '.join(rng.choices(WORDS, k=rng.randint(2, 8))).capitalize(),
+                    ' '.join(rng.choices(WORDS, k=rng.randint(8, 80))).capitalize() + '.',
+                    f'https://example.com/images/{rng.getrandbits(32):08x}.jpg' if rng.random() < 0.2 else None,
+                    created_at, deleted_at or created_at, deleted_at,
+                )
+
+    def follow_rows(self, start, stop):
+        rng = self.rng('follows', start)
+        candidates = range(self.first_id, self.first_id + self.users)
+        cap = min(self.users - 1, 5000)
+        for user_id in candidates[start:stop]:
+            count = heavy_tailed(rng, self.follows_per_user, cap)
+            followed = pick_followed(rng, user_id - self.first_id, candidates, count, 'zipf')
+            joined_at = self.joined_at(user_id)
+            for target in sorted(followed):
+                yield (user_id, target, self.between(rng, max(joined_at, self.joined_at(target))))
+
+
+def copy_rows(table, columns, rows, batch_size):
+    """Stream rows into a table with ``COPY FROM STDIN``, one COPY per batch."""
+    sql = f'COPY {connection.ops.quote_name(table)} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)'
+    written = 0
+    with connection.cursor() as cursor:
+        while True:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            count = 0
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+                if count == batch_size:
+                    break
+            if not count:
+                return written
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            written += count
+
+
+def create_rows(model, columns, rows, batch_size):
+    """
+    ``bulk_create`` fallback for databases without COPY. ``auto_now`` fields
+    overwrite the generated timestamps on insert, so they are written again
+    with ``bulk_update``.
+    """
+    timestamps = [column for column in ('created_at', 'updated_at') if column in columns]
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(model(**dict(zip(columns, row))))
+        if len(batch) == batch_size:
+            written += flush(model, batch, timestamps)
+            batch = []
+    if batch:
+        written += flush(model, batch, timestamps)
+    return written
+
+
+def flush(model, batch, timestamps):
+    values = [{column: getattr(obj, column) for column in timestamps} for obj in batch]
+    model.objects.bulk_create(batch)
+    for obj, fields in zip(batch, values):
+        for column, value in fields.items():
+            setattr(obj, column, value)
+    model.objects.bulk_update(batch, timestamps)
+    return len(batch)
+
+
+PHASES = {
+    'users': (User, USER_COLUMNS, Plan.user_rows),
+    'posts': (Post, POST_COLUMNS, Plan.post_rows),
+    'follows': (Follow, FOLLOW_COLUMNS, Plan.follow_rows),
+}
+
+
+def load_chunk(plan, phase, start, stop):
+    """Generate and write one chunk of users (or of their posts or follows)."""
+    model, columns, generate = PHASES[phase]
+    rows = generate(plan, start, stop)
+    with transaction.atomic():
+        if uses_copy():
+            return copy_rows(model._meta.db_table, columns, rows, plan.batch_size)
+        return create_rows(model, columns, rows, plan.batch_size)
+
+
+def count_subquery(queryset, field):
+    counts = queryset.filter(**{field: OuterRef('id')}).order_by().values(field).annotate(n=Count('id')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def update_counters(plan, start, stop):
+    """Fill in the denormalized counters of a chunk of seeded users."""
+    return User.objects.filter(id__gte=plan.first_id + start, id__lt=plan.first_id + stop).update(
+        follower_count=count_subquery(Follow.objects.all(), 'following_id'),
+        following_count=count_subquery(Follow.objects.all(), 'follower_id'),
+        post_count=count_subquery(Post.objects.filter(deleted_at__isnull=True), 'user_id'),
+    )
+
+
+def chunks(plan, chunk_size):
+    return [(start, min(start + chunk_size, plan.users)) for start in range(0, plan.users, chunk_size)]
@@ -0,0 +1,96 @@
+"""
+Cold start cost of a worker: ``django.setup()`` plus resolving a URL, which
+loads the URLconf and every view module it imports.
+
+Each measurement runs in a fresh interpreter, so nothing imported by the
+calling process (a test run, a management command) is reused.
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+
+# Imported only when the schema or docs URLs are used.
+LAZY_MODULES = ['drf_spectacular.views', 'drf_spectacular.generators', 'api.openapi.schema']
+
+
+def get_config():
+    config = {
+        'BUDGET_SECONDS': 2.0,
+        'PATHS': ['/api/posts/1/'],
+    }
+    config.update(getattr(settings, 'STARTUP_PROFILE', {}))
+    return config
+
+
+BOOT_SCRIPT = """
+import sys
+import time
+
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import resolve
+for path in sys.argv[1:]:
+    resolve(path)
+print(time.perf_counter() - started)
+print(' '.join(sorted(sys.modules)))
+"""
+
+
+class Import:
+    def __init__(self, module, self_us, cumulative_us, depth):
+        self.module = module
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+    @property
+    def package(self):
+        return self.module.split('.')[0]
+
+
+class StartupProfile:
+    def __init__(self, seconds, modules, imports):
+        self.seconds = seconds
+        self.modules = modules
+        self.imports = imports
+
+    def slowest(self, n, key='cumulative'):
+        attribute = 'cumulative_us' if key == 'cumulative' else 'self_us'
+        return sorted(self.imports, key=lambda item: getattr(item, attribute), reverse=True)[:n]
+
+    def by_package(self):
+        """Self time summed per top-level package, slowest first."""
+        totals = defaultdict(int)
+        for item in self.imports:
+            totals[item.package] += item.self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def parse_importtime(output):
+    """Parse the ``-X importtime`` report written to stderr."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append(Import(name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def profile(paths=None, importtime=False):
+    """Boot a fresh interpreter with the current settings and time it."""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', BOOT_SCRIPT, *(paths or get_config()['PATHS'])]
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+    result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f'Startup failed:\n{result.stderr}')
+    seconds, modules = result.stdout.splitlines()[-2:]
+    return StartupProfile(float(seconds), set(modules.split()), parse_importtime(result.stderr) if importtime else [])
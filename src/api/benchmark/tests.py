@@ -0,0 +1,153 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from api.post.models import Post
+from api.social.models import Follow
+from api.user.models import User
+from . import dataset
+from .loadtest import Dataset, InProcessTransport, compare, percentile, run
+from .startup import LAZY_MODULES, get_config, parse_importtime, profile
+
+
+class DatasetTestCase(TestCase):
+    def test_seed_is_reproducible_and_counters_match(self):
+        counts = dataset.seed(users=20, posts_per_user=3, follows_per_user=5, seed=7)
+        self.assertEqual(counts['users'], 20)
+        self.assertEqual(Post.objects.filter(user__in=dataset.dataset_users()).count(), 60)
+        follows = sorted(Follow.objects.values_list('follower__email', 'following__email'))
+
+        top = dataset.dataset_users().order_by('-follower_count').first()
+        self.assertEqual(top.follower_count, Follow.objects.filter(following=top).count())
+
+        dataset.clear()
+        self.assertFalse(dataset.dataset_users().exists())
+        self.assertFalse(Follow.objects.exists())
+
+        dataset.seed(users=20, posts_per_user=3, follows_per_user=5, seed=7)
+        self.assertEqual(sorted(Follow.objects.values_list('follower__email', 'following__email')), follows)
+
+    def test_clear_leaves_other_users_alone(self):
+        User.objects.create(name='Real', email='real@example.com', password_hash='hashedpassword')
+        dataset.seed(users=5, posts_per_user=1, follows_per_user=2)
+        dataset.clear()
+        self.assertEqual(list(User.objects.values_list('email', flat=True)), ['real@example.com'])
+
+
+class LoadTestTestCase(TestCase):
+    def test_percentile_uses_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.50), 50)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile([3], 0.95), 3)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+    def test_compare_flags_slower_endpoints_and_new_errors(self):
+        baseline = {'endpoints': {
+            'home_feed': {'requests': 100, 'errors': 0, 'p95_ms': 10.0},
+            'post_detail': {'requests': 100, 'errors': 0, 'p95_ms': 10.0},
+            'user_detail': {'requests': 100, 'errors': 0, 'p95_ms': 10.0},
+        }}
+        current = {'endpoints': {
+            'home_feed': {'requests': 100, 'errors': 0, 'p95_ms': 15.0},
+            'post_detail': {'requests': 100, 'errors': 0, 'p95_ms': 11.0},
+            'user_detail': {'requests': 100, 'errors': 2, 'p95_ms': 10.0},
+        }}
+        regressions = compare(baseline, current, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('home_feed: p95_ms'))
+        self.assertTrue(regressions[1].startswith('user_detail: error rate'))
+
+    def test_run_drives_every_endpoint_without_errors(self):
+        dataset.seed(users=10, posts_per_user=2, follows_per_user=3)
+        results = run(Dataset(), InProcessTransport, concurrency=1, requests=300)
+
+        self.assertEqual(results['requests'], 300)
+        self.assertEqual(results['errors'], 0)
+        self.assertEqual(set(results['endpoints']), {
+            'list_user_posts', 'home_feed', 'post_detail', 'user_detail', 'list_followers',
+            'create_post', 'follow_user', 'unfollow_user', 'post_auth',
+        })
+        for endpoint in results['endpoints'].values():
+            self.assertLessEqual(endpoint['p50_ms'], endpoint['p99_ms'])
+
+    def test_in_process_transport_uses_an_allowed_host(self):
+        dataset.seed(users=3, posts_per_user=1, follows_per_user=1)
+        data = Dataset()
+        with override_settings(ALLOWED_HOSTS=['.example.com']):
+            transport = InProcessTransport()
+            self.assertEqual(transport.request('GET', reverse('home_feed'), None, data.tokens[0]), 200)
+
+
+class SeedDataTestCase(TestCase):
+    def seed_data(self, **options):
+        options = {'users': 60, 'posts_per_user': 4, 'follows_per_user': 6, 'batch_size': 50, 'chunk_size': 25, **options}
+        call_command('seed_data', stdout=StringIO(), **options)
+
+    def test_generates_consistent_rows_with_bulk_create_fallback(self):
+        self.seed_data(deleted_ratio=0.3)
+        users = dataset.dataset_users()
+        self.assertEqual(users.count(), 60)
+        self.assertTrue(users.filter(deleted_at__isnull=False).exists())
+        self.assertTrue(Post.objects.filter(deleted_at__isnull=False).exists())
+
+        # Timestamps are spread out rather than stamped with the insert time.
+        oldest, newest = users.order_by('created_at')[0], users.order_by('-created_at')[0]
+        self.assertGreater(newest.created_at - oldest.created_at, timedelta(days=365))
+        for post in Post.objects.select_related('user')[:50]:
+            self.assertGreaterEqual(post.created_at, post.user.created_at)
+
+        for user in users:
+            self.assertEqual(user.follower_count, Follow.objects.filter(following=user).count())
+            self.assertEqual(user.following_count, Follow.objects.filter(follower=user).count())
+            self.assertEqual(user.post_count, Post.objects.filter(user=user, deleted_at__isnull=True).count())
+
+    def test_follower_distribution_is_skewed(self):
+        self.seed_data(users=200, follows_per_user=10)
+        counts = sorted(User.objects.values_list('follower_count', flat=True), reverse=True)
+        self.assertGreater(counts[0], 5 * (sum(counts) / len(counts)))
+
+    def test_same_seed_gives_same_data(self):
+        self.seed_data(seed=3)
+        first_id = User.objects.order_by('id')[0].id
+        follows = sorted((a - first_id, b - first_id) for a, b in Follow.objects.values_list('follower_id', 'following_id'))
+        titles = sorted(Post.objects.values_list('title', flat=True))
+
+        Follow.objects.all().delete()
+        Post.objects.all().delete()
+        User.objects.all().delete()
+        self.seed_data(seed=3)
+        first_id = User.objects.order_by('id')[0].id
+        self.assertEqual(
+            sorted((a - first_id, b - first_id) for a, b in Follow.objects.values_list('follower_id', 'following_id')),
+            follows,
+        )
+        self.assertEqual(sorted(Post.objects.values_list('title', flat=True)), titles)
+
+
+class StartupBudgetTestCase(SimpleTestCase):
+    def test_cold_setup_and_url_resolution_stay_within_budget(self):
+        budget = get_config()['BUDGET_SECONDS']
+        # Best of three, so one slow boot on a busy machine does not fail the run.
+        best = min(profile().seconds for _ in range(3))
+        self.assertLessEqual(best, budget, f'Cold start took {best:.3f} s, budget is {budget:.3f} s')
+
+    def test_schema_machinery_loads_lazily(self):
+        self.assertFalse(set(LAZY_MODULES) & profile().modules)
+        self.assertTrue(set(LAZY_MODULES) <= profile(['/api/schema/']).modules)
+
+    def test_parse_importtime(self):
+        imports = parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |     yaml.error\n'
+            'import time:      2268 |       2388 |   yaml\n'
+            'unrelated line\n'
+        )
+        self.assertEqual([(item.module, item.self_us, item.cumulative_us, item.depth) for item in imports], [
+            ('yaml.error', 120, 120, 2),
+            ('yaml', 2268, 2388, 1),
+        ])
+        self.assertEqual(imports[0].package, 'yaml')
@@ -0,0 +1,43 @@
+import calendar
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_etag(instance):
+    """Strong ETag for a row, derived from its primary key and ``updated_at``."""
+    version = f"{calendar.timegm(instance.updated_at.utctimetuple())}{instance.updated_at.microsecond:06d}"
+    return quote_etag(f"{instance._meta.db_table}-{instance.pk}-{version}")
+
+
+def get_last_modified(instance):
+    return calendar.timegm(instance.updated_at.utctimetuple())
+
+
+def evaluate_preconditions(request, instance):
+    """
+    Evaluate If-Match / If-None-Match / If-Modified-Since / If-Unmodified-Since
+    against the row. Returns a 304 or 412 response when the request can be
+    answered without doing the work, otherwise None.
+    """
+    response = get_conditional_response(
+        request,
+        etag=get_etag(instance),
+        last_modified=get_last_modified(instance),
+    )
+    if response is None:
+        return None
+    if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+        return Response(
+            {"detail": "The resource has been modified since it was last retrieved."},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+        )
+    return set_validators(response, instance)
+
+
+def set_validators(response, instance):
+    response['ETag'] = get_etag(instance)
+    response['Last-Modified'] = http_date(get_last_modified(instance))
+    return response
@@ -0,0 +1,49 @@
+"""
+Migration operations for indexes on large, live tables.
+"""
+from django.db.migrations.operations import AddIndex
+
+
+def is_partitioned(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def builds_concurrently(connection, table):
+    # Partitioned tables cannot build an index concurrently; the plain
+    # CREATE INDEX cascades to the partitions instead.
+    return connection.vendor == 'postgresql' and not is_partitioned(connection, table)
+
+
+class AddIndexIfNotExists(AddIndex):
+    """
+    ``AddIndex`` that skips indexes which already exist, such as those
+    created by scripts/init_tables.sql, and builds them with
+    ``CREATE INDEX CONCURRENTLY`` on PostgreSQL so writes are not blocked.
+    Migrations using it must set ``atomic = False``.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        options = {}
+        if builds_concurrently(schema_editor.connection, model._meta.db_table):
+            options['concurrently'] = True
+        statement = self.index.create_sql(model, schema_editor, **options)
+        statement.parts['name'] = f"IF NOT EXISTS {statement.parts['name']}"
+        schema_editor.execute(statement, params=None)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if builds_concurrently(schema_editor.connection, model._meta.db_table):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(self.index.name)}')
+
+    def describe(self):
+        return f'{super().describe()} if it does not exist'
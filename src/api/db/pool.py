@@ -0,0 +1,218 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+from api.metrics.metrics import (
+    DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECTIONS, DB_POOL_CONNECTS, DB_POOL_HEALTH_CHECK_FAILURES, DB_POOL_TIMEOUTS,
+)
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    ``connect`` opens a new connection, ``check`` tells whether an idle
+    connection still works and ``reset`` prepares a returned connection for
+    the next borrower, returning False when it should be discarded instead.
+    Idle connections are reused newest first, so the pool shrinks back to
+    ``min_size`` once extra connections sit idle for ``max_idle`` seconds.
+    """
+
+    def __init__(self, name, connect, check, reset, min_size=0, max_size=10, timeout=30.0,
+                 check_interval=10.0, max_idle=600.0, max_lifetime=3600.0):
+        self.name = name
+        self.connect = connect
+        self.check = check
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, opened_at, returned_at), oldest first
+        self._in_use = {}  # id(connection) -> opened_at
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._pid = os.getpid()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.health_check_failures = 0
+
+    def fill(self):
+        """Open connections until ``min_size`` are available."""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            connection = self._open()
+            with self._cond:
+                self._idle.appendleft((connection, time.monotonic(), time.monotonic()))
+                self._cond.notify()
+            self._report()
+
+    def getconn(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        while True:
+            with self._cond:
+                self._after_fork()
+                self._prune_idle()
+                while not self._idle and self._size >= self.max_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        DB_POOL_TIMEOUTS.labels(self.name).inc()
+                        raise PoolTimeout(
+                            f'No connection available in pool {self.name!r} after {self.timeout} s '
+                            f'({self.max_size} in use).'
+                        )
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._closed:
+                    raise OperationalError(f'Connection pool {self.name!r} is closed.')
+                if self._idle:
+                    connection, opened_at, returned_at = self._idle.pop()
+                else:
+                    connection = None
+                    self._size += 1
+
+            if connection is None:
+                connection = self._open()
+                opened_at = time.monotonic()
+            elif time.monotonic() - opened_at >= self.max_lifetime:
+                self._discard(connection)
+                continue
+            elif time.monotonic() - returned_at >= self.check_interval and not self.check(connection):
+                with self._cond:
+                    self.health_check_failures += 1
+                DB_POOL_HEALTH_CHECK_FAILURES.labels(self.name).inc()
+                self._discard(connection)
+                continue
+
+            with self._cond:
+                self._in_use[id(connection)] = opened_at
+                self.checkouts += 1
+                if waited:
+                    self.waits += 1
+            DB_POOL_CHECKOUT_WAIT.labels(self.name).observe(time.monotonic() - started)
+            self._report()
+            return connection
+
+    def putconn(self, connection):
+        with self._cond:
+            opened_at = self._in_use.pop(id(connection), None)
+        if opened_at is None:
+            # Borrowed before a fork or from a closed pool; not ours to keep.
+            return
+
+        keep = (
+            not self._closed
+            and time.monotonic() - opened_at < self.max_lifetime
+            and self.reset(connection)
+        )
+        if not keep:
+            self._discard(connection)
+            return
+        with self._cond:
+            self._idle.append((connection, opened_at, time.monotonic()))
+            self._cond.notify()
+        self._report()
+
+    def close(self):
+        """Close idle connections now and in-use ones as they come back."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for connection, _, _ in idle:
+            self._close_quietly(connection)
+        self._report()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'health_check_failures': self.health_check_failures,
+            }
+
+    def _open(self):
+        try:
+            connection = self.connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.connects += 1
+        DB_POOL_CONNECTS.labels(self.name).inc()
+        return connection
+
+    def _discard(self, connection):
+        self._close_quietly(connection)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        self._report()
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _prune_idle(self):
+        # Called with the lock held. The oldest returned connections sit at
+        # the left end, so pruning stops at the first one still fresh.
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            connection, opened_at, returned_at = self._idle[0]
+            if now - returned_at < self.max_idle and now - opened_at < self.max_lifetime:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._close_quietly(connection)
+
+    def _after_fork(self):
+        # Called with the lock held. Sockets inherited from the parent must
+        # not be used or closed here: closing would end the parent's sessions.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._in_use.clear()
+            self._size = 0
+
+    def _report(self):
+        stats = self.stats()
+        DB_POOL_CONNECTIONS.labels(self.name, 'idle').set(stats['idle'])
+        DB_POOL_CONNECTIONS.labels(self.name, 'in_use').set(stats['in_use'])
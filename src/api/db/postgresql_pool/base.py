@@ -0,0 +1,144 @@
+"""
+PostgreSQL backend that borrows connections from a per-process pool.
+
+Django opens a connection on first use in a request and, with
+``CONN_MAX_AGE = 0``, closes it when the request finishes. With this backend
+"opening" checks a connection out of the pool and "closing" returns it, so
+sync, threaded and async (ASGI) workers all reuse connections without paying
+for a connect handshake on every request.
+
+Pool options live under the ``POOL`` key of the database settings.
+"""
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.utils.asyncio import async_unsafe
+
+from api.db.pool import ConnectionPool
+
+Database = base.Database
+
+# Transaction status codes, identical in psycopg2 and psycopg 3.
+TRANSACTION_STATUS_IDLE = 0
+TRANSACTION_STATUS_UNKNOWN = 4
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_config(settings_dict):
+    config = {
+        'MIN_SIZE': 0,
+        'MAX_SIZE': 10,
+        'TIMEOUT': 30,
+        'CHECK_INTERVAL': 10,
+        'MAX_IDLE': 600,
+        'MAX_LIFETIME': 3600,
+    }
+    config.update(settings_dict.get('POOL', {}))
+    return config
+
+
+def check(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Database.Error:
+        return False
+    return True
+
+
+def reset(connection):
+    if connection.closed:
+        return False
+    status = connection.info.transaction_status
+    if status == TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != TRANSACTION_STATUS_IDLE:
+        try:
+            connection.rollback()
+        except Database.Error:
+            return False
+    return True
+
+
+def get_pool(wrapper, conn_params):
+    # Keyed by the connection parameters too: the test runner points the
+    # same alias at another database.
+    key = (wrapper.alias, repr(sorted(conn_params.items())))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                config = get_config(wrapper.settings_dict)
+                pool = ConnectionPool(
+                    wrapper.alias,
+                    connect=lambda: base.DatabaseWrapper.get_new_connection(wrapper, conn_params),
+                    check=check,
+                    reset=reset,
+                    min_size=config['MIN_SIZE'],
+                    max_size=config['MAX_SIZE'],
+                    timeout=config['TIMEOUT'],
+                    check_interval=config['CHECK_INTERVAL'],
+                    max_idle=config['MAX_IDLE'],
+                    max_lifetime=config['MAX_LIFETIME'],
+                )
+                _pools[key] = pool
+                pool.fill()
+    return pool
+
+
+def close_pools(alias=None):
+    with _pools_lock:
+        keys = [key for key in _pools if alias is None or key[0] == alias]
+        pools = [_pools.pop(key) for key in keys]
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats():
+    """Stats of every pool in this process, by database alias."""
+    stats = {}
+    for (alias, _), pool in list(_pools.items()):
+        stats[alias] = pool.stats()
+    return stats
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would make DROP DATABASE fail.
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, settings_dict, alias='default'):
+        super().__init__(settings_dict, alias)
+        if settings_dict.get('CONN_MAX_AGE'):
+            raise ImproperlyConfigured(
+                'The pooled PostgreSQL backend requires CONN_MAX_AGE = 0: connections go back to the pool '
+                'when Django closes them at the end of each request.'
+            )
+        self._pool = None
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        self._pool = get_pool(self, conn_params)
+        connection = self._pool.getconn()
+        # The parent sets this while connecting; a reused connection skips that.
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool.putconn(self.connection)
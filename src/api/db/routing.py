@@ -0,0 +1,161 @@
+"""
+Primary/replica routing with read-your-writes stickiness.
+
+Reads are sent to a replica only while serving a GET on one of the
+``READ_VIEWS``. Everything else, including every write, uses ``default``.
+After a successful write, the writer's reads stay on the primary for
+``STICKY_SECONDS``. Two signals carry this: a cookie, which needs no server
+state, and a per-user pin in the Django cache, which also covers API clients
+that drop cookies. The pin is found through the user id in the access token
+before the auth user lookup runs.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from api.user.models import User
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+current_state = ContextVar('db_routing_state', default=None)
+
+
+def get_config():
+    config = {
+        'REPLICAS': [],
+        'READ_VIEWS': ['list_user_posts', 'post_detail_operations', 'user_detail_operations'],
+        'STICKY_SECONDS': 5,
+        'COOKIE_NAME': 'db_pin',
+        'CACHE_ALIAS': 'default',
+    }
+    config.update(getattr(settings, 'DB_ROUTING', {}))
+    return config
+
+
+def pin_key(user_id):
+    return f'db:pin:{user_id}'
+
+
+def pin_user(user_id):
+    config = get_config()
+    caches[config['CACHE_ALIAS']].set(pin_key(user_id), True, config['STICKY_SECONDS'])
+
+
+def is_user_pinned(user_id):
+    return caches[get_config()['CACHE_ALIAS']].get(pin_key(user_id)) is not None
+
+
+class RoutingState:
+    def __init__(self):
+        self.use_replica = False
+
+
+def reads_from_replica():
+    state = current_state.get()
+    return state is not None and state.use_replica
+
+
+def use_primary_for(user_id):
+    """Called from authentication with the token's user id."""
+    state = current_state.get()
+    if state is not None and state.use_replica and is_user_pinned(user_id):
+        state.use_replica = False
+
+
+async def ause_primary_for(user_id):
+    state = current_state.get()
+    if state is not None and state.use_replica:
+        await sync_to_async(use_primary_for)(user_id)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reads_from_replica():
+            return random.choice(get_config()['REPLICAS'])
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Decides per request whether reads may go to a replica, and pins the
+    client to the primary after a successful write.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = current_state.set(RoutingState())
+        try:
+            response = self.get_response(request)
+        finally:
+            current_state.reset(token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        token = current_state.set(RoutingState())
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_state.reset(token)
+        if request.method in SAFE_METHODS:
+            return response
+        return await sync_to_async(self.pin_after_write)(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        config = get_config()
+        state = current_state.get()
+        if (
+            state is not None
+            and config['REPLICAS']
+            and request.method == 'GET'
+            and request.resolver_match.url_name in config['READ_VIEWS']
+            and not self.has_pin_cookie(request, config)
+        ):
+            state.use_replica = True
+        return None
+
+    @staticmethod
+    def has_pin_cookie(request, config):
+        try:
+            return float(request.COOKIES.get(config['COOKIE_NAME'], 0)) > time.time()
+        except ValueError:
+            return False
+
+    @staticmethod
+    def pin_after_write(request, response):
+        config = get_config()
+        if not config['REPLICAS'] or request.method in SAFE_METHODS or response.status_code >= 400:
+            return response
+
+        sticky = config['STICKY_SECONDS']
+        response.set_cookie(
+            config['COOKIE_NAME'], f'{time.time() + sticky:.3f}',
+            max_age=sticky, httponly=True, samesite='Lax',
+        )
+        # DRF stores the authenticated user on the underlying request.
+        user = request.__dict__.get('user')
+        if isinstance(user, User):
+            pin_user(user.id)
+        return response
@@ -0,0 +1,321 @@
+import json
+import sqlite3
+import threading
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.auth.token_versions import add_user_claims, security_versions
+from api.post.models import Post
+from api.social.models import Follow
+from api.user.models import User
+from .pool import ConnectionPool, PoolTimeout
+from .postgresql_pool import base as pooled
+from api.post import response_cache
+from .routing import PrimaryReplicaRouter, ReplicaRoutingMiddleware, RoutingState, current_state, use_primary_for
+
+
+def check(connection):
+    try:
+        connection.execute('SELECT 1')
+    except sqlite3.ProgrammingError:
+        return False
+    return True
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    def make_pool(self, **options):
+        def connect():
+            return sqlite3.connect(':memory:', check_same_thread=False)
+        return ConnectionPool('test', connect, check, lambda connection: True, **options)
+
+    def test_returned_connections_are_reused(self):
+        pool = self.make_pool(max_size=2)
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(pool.stats()['connects'], 1)
+        self.assertEqual(pool.stats()['in_use'], 1)
+
+    def test_fill_opens_min_size_connections(self):
+        pool = self.make_pool(min_size=3, max_size=5)
+        pool.fill()
+        self.assertEqual(pool.stats()['idle'], 3)
+        self.assertEqual(pool.stats()['connects'], 3)
+
+    def test_exhausted_pool_waits_then_times_out(self):
+        pool = self.make_pool(max_size=1, timeout=2)
+        held = pool.getconn()
+
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(pool.getconn()))
+        waiter.start()
+        while not pool.stats()['waiting']:
+            pass
+        pool.putconn(held)
+        waiter.join()
+        self.assertIs(received[0], held)
+        self.assertEqual(pool.stats()['waits'], 1)
+
+        pool.timeout = 0.05
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_broken_idle_connection_is_replaced_on_checkout(self):
+        pool = self.make_pool(check_interval=0)
+        broken = pool.getconn()
+        pool.putconn(broken)
+        broken.close()
+
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, broken)
+        self.assertTrue(check(replacement))
+        self.assertEqual(pool.stats()['health_check_failures'], 1)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_connections_failing_reset_or_past_lifetime_are_closed(self):
+        pool = ConnectionPool(
+            'test', lambda: sqlite3.connect(':memory:', check_same_thread=False), check, lambda connection: False,
+        )
+        connection = pool.getconn()
+        pool.putconn(connection)
+        self.assertFalse(check(connection))
+        self.assertEqual(pool.stats()['size'], 0)
+
+        pool = self.make_pool(max_lifetime=0)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        self.assertIsNot(pool.getconn(), connection)
+
+    def test_close_releases_idle_connections(self):
+        pool = self.make_pool()
+        idle, busy = pool.getconn(), pool.getconn()
+        pool.putconn(idle)
+        pool.close()
+        self.assertFalse(check(idle))
+        pool.putconn(busy)
+        self.assertFalse(check(busy))
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+class PooledBackendTestCase(SimpleTestCase):
+    def test_persistent_connections_are_rejected(self):
+        settings_dict = {'NAME': 'codeleap', 'OPTIONS': {}, 'CONN_MAX_AGE': 60, 'TIME_ZONE': None}
+        with self.assertRaises(ImproperlyConfigured):
+            pooled.DatabaseWrapper(settings_dict)
+
+
+@override_settings(DB_ROUTING={'REPLICAS': ['replica_0'], 'STICKY_SECONDS': 5})
+class ReplicaRoutingTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create(name='Router', email='router@example.com', password_hash='hashedpassword')
+
+    def route(self, method, url_name, token_user_id=None, cookies=None, **kwargs):
+        """Run a request through the middleware and return the alias reads would use."""
+        url = reverse(url_name, kwargs=kwargs)
+        request = self.factory.generic(method, url)
+        request.COOKIES.update(cookies or {})
+        request.resolver_match = resolve(url)
+        decisions = []
+
+        def view(request):
+            middleware.process_view(request, None, (), kwargs)
+            if token_user_id is not None:
+                use_primary_for(token_user_id)
+            decisions.append(PrimaryReplicaRouter().db_for_read(Post))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        middleware(request)
+        return decisions[0]
+
+    def test_reads_outside_a_request_use_the_primary(self):
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(Post), 'default')
+        self.assertEqual(PrimaryReplicaRouter().db_for_write(Post), 'default')
+
+    def test_only_listed_get_views_read_from_replica(self):
+        self.assertEqual(self.route('GET', 'list_user_posts', token_user_id=self.user.id, user_id=self.user.id), 'replica_0')
+        self.assertEqual(self.route('GET', 'post_detail_operations', post_id=1), 'replica_0')
+        self.assertEqual(self.route('GET', 'home_feed'), 'default')
+        self.assertEqual(self.route('PATCH', 'post_detail_operations', post_id=1), 'default')
+
+    def test_write_pins_client_to_primary(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('create_post'), {'title': 'Pinned', 'content': 'Content'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        cookie = response.cookies['db_pin']
+        self.assertEqual(cookie['max-age'], 5)
+
+        # Through the cookie, or through the user id when the client drops cookies.
+        self.assertEqual(self.route('GET', 'list_user_posts', cookies={'db_pin': cookie.value}, user_id=self.user.id), 'default')
+        self.assertEqual(self.route('GET', 'list_user_posts', token_user_id=self.user.id, user_id=self.user.id), 'default')
+
+        other = User.objects.create(name='Other', email='other@example.com', password_hash='hashedpassword')
+        self.assertEqual(self.route('GET', 'list_user_posts', token_user_id=other.id, user_id=self.user.id), 'replica_0')
+
+    def test_failed_writes_do_not_pin(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('create_post'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('db_pin', response.cookies)
+        self.assertEqual(self.route('GET', 'list_user_posts', token_user_id=self.user.id, user_id=self.user.id), 'replica_0')
+
+    def test_replica_reads_do_not_fill_the_response_cache(self):
+        state = RoutingState()
+        state.use_replica = True
+        token = current_state.set(state)
+        try:
+            response_cache.set_cached('posts:test', {'results': []})
+        finally:
+            current_state.reset(token)
+        self.assertIsNone(cache.get('posts:test'))
+
+        response_cache.set_cached('posts:test', {'results': []})
+        self.assertEqual(cache.get('posts:test'), {'results': []})
+
+
+def seq_scans(plan):
+    """Relations read by a sequential scan anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    found = []
+    if plan.get('Node Type') == 'Seq Scan':
+        found.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def rows_read(plan, table):
+    """Rows returned by every scan of ``table`` in an EXPLAIN ANALYZE plan."""
+    count = plan['Actual Rows'] * plan['Actual Loops'] if plan.get('Relation Name') == table else 0
+    return count + sum(rows_read(child, table) for child in plan.get('Plans', []))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plans are only checked on PostgreSQL.')
+class QueryPlanTestCase(APITestCase):
+    """
+    Runs every API query against a seeded database and fails when one reads
+    a large table with a sequential scan. Sequential scans are disabled for
+    the test, so the planner only uses one when no index can serve the query.
+    """
+    hot_tables = {'users', 'posts', 'follows', 'timeline_entries'}
+    # Queries allowed to scan, keyed by a fragment of their SQL.
+    allowed_scans = {
+        # Cached between refreshes; an index on a counter would stop HOT
+        # updates on every follow.
+        '"follower_count" >=': 'celebrity ids',
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_data', users=2000, posts_per_user=10, follows_per_user=20, workers=1, stdout=StringIO(),
+        )
+        live_users = User.objects.filter(deleted_at__isnull=True)
+        cls.user = live_users.order_by('-following_count')[0]
+        cls.other = live_users.exclude(id=cls.user.id).order_by('-follower_count')[0]
+        cls.post = Post.objects.filter(user=cls.user, deleted_at__isnull=True).first() or Post.objects.create(
+            user=cls.user, title='Plan', content='Query plan fixture',
+        )
+        Follow.objects.filter(follower=cls.user, following=cls.other).delete()
+        cls.token = str(add_user_claims(RefreshToken.for_user(cls.user), cls.user).access_token)
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def get_second_page(self, url):
+        first = self.client.get(url, {'page_size': 2})
+        return self.client.get(first.data['next'] or url)
+
+    def assert_indexed(self, label, run):
+        with CaptureQueriesContext(connection) as queries:
+            result = run()
+        for query in queries.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+                continue
+            if any(fragment in sql for fragment in self.allowed_scans):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scanned = self.hot_tables.intersection(seq_scans(plan[0]['Plan']))
+            self.assertFalse(scanned, f'{label}: sequential scan of {sorted(scanned)} in\n{sql}')
+        return result
+
+    def test_read_endpoints_use_indexes(self):
+        user_posts = reverse('list_user_posts', kwargs={'user_id': self.user.id})
+        feed = reverse('home_feed')
+        reads = {
+            'login': lambda: self.client.post(
+                reverse('post_auth'), {'email': self.user.email, 'password': 'not-the-password'}, format='json',
+            ),
+            'user detail': lambda: self.client.get(reverse('user_detail_operations', kwargs={'user_id': self.user.id})),
+            'user posts': lambda: self.client.get(user_posts),
+            'user posts page': lambda: self.get_second_page(user_posts),
+            'post detail': lambda: self.client.get(reverse('post_detail_operations', kwargs={'post_id': self.post.id})),
+            'feed page': lambda: self.get_second_page(feed),
+            'followers': lambda: self.client.get(reverse('list_followers', kwargs={'user_id': self.other.id})),
+            'following': lambda: self.client.get(reverse('list_following', kwargs={'user_id': self.user.id})),
+            'search': lambda: self.client.get(reverse('search_posts'), {'q': 'post'}),
+            'token versions': lambda: (security_versions.refresh(force=True), security_versions.refresh(force=True)),
+        }
+        for label, run in reads.items():
+            with self.subTest(label):
+                self.assert_indexed(label, run)
+
+        with override_settings(TIMELINE={'MODE': 'write'}):
+            self.assert_indexed('materialized feed', lambda: self.client.get(feed, {'page_size': 5}))
+
+    def test_feed_reads_a_bounded_number_of_posts(self):
+        # The page comes from walking recent posts, not from sorting every
+        # post of every followed account.
+        following = Follow.objects.filter(follower=self.user).values('following_id')
+        feed_posts = Post.objects.filter(user_id__in=following, deleted_at__isnull=True).count()
+        page_size, budget = 20, 200
+        self.assertGreater(feed_posts, 5 * budget)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home_feed'), {'page_size': page_size})
+        self.assertEqual(len(response.data['results']), page_size)
+        [sql] = [query['sql'] for query in queries.captured_queries if 'FROM "posts"' in query['sql']]
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}')
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        self.assertLessEqual(rows_read(plan[0]['Plan'], 'posts'), budget, json.dumps(plan, indent=1))
+
+    def test_write_endpoints_use_indexes(self):
+        post_url = reverse('post_detail_operations', kwargs={'post_id': self.post.id})
+        writes = {
+            'create post': lambda: self.client.post(
+                reverse('create_post'), {'title': 'Plan', 'content': 'Checked'}, format='json',
+            ),
+            'patch post': lambda: self.client.patch(post_url, {'content': 'Edited'}, format='json'),
+            'follow': lambda: self.client.post(reverse('follow_user', kwargs={'user_id': self.other.id})),
+            'unfollow': lambda: self.client.delete(reverse('unfollow_user', kwargs={'user_id': self.other.id})),
+            'delete post': lambda: self.client.delete(post_url),
+        }
+        for label, run in writes.items():
+            with self.subTest(label):
+                response = self.assert_indexed(label, run)
+                # A rejected request would skip the queries under test.
+                self.assertLess(response.status_code, 400)
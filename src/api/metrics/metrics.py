@@ -0,0 +1,77 @@
+import os
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# gunicorn's on_starting creates the directory, but uvicorn, runserver and
+# management commands would fail to open their sample files without it.
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+REQUEST_LATENCY = Histogram(
+    'api_request_duration_seconds',
+    'Time spent handling a request, by resolved URL name.',
+    ['view', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'api_request_db_queries',
+    'Database queries executed per request.',
+    ['view', 'method'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME = Histogram(
+    'api_request_db_duration_seconds',
+    'Time spent in the database per request.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'api_response_size_bytes',
+    'Response body size in bytes.',
+    ['view', 'method'],
+    buckets=SIZE_BUCKETS,
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    'api_db_pool_connections',
+    'Open connections in the database connection pool, by state.',
+    ['alias', 'state'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'api_db_pool_checkout_duration_seconds',
+    'Time taken to check a connection out of the pool, including waits, health checks and connects.',
+    ['alias'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTS = Counter(
+    'api_db_pool_connects',
+    'New database connections opened by the pool.',
+    ['alias'],
+)
+DB_POOL_TIMEOUTS = Counter(
+    'api_db_pool_timeouts',
+    'Checkouts that gave up because the pool stayed exhausted.',
+    ['alias'],
+)
+DB_POOL_HEALTH_CHECK_FAILURES = Counter(
+    'api_db_pool_health_check_failures',
+    'Idle connections found broken on checkout and replaced.',
+    ['alias'],
+)
+
+RESPONSE_CACHE_LOOKUPS = Counter(
+    'api_response_cache_lookups',
+    'Lookups in the post response cache, by result (hit or miss).',
+    ['result'],
+)
+AUTH_USER_CACHE_LOOKUPS = Counter(
+    'api_auth_user_cache_lookups',
+    'Users looked up in the authentication user cache, by where they were found: '
+    'local (this process), shared (the Django cache) or miss (loaded from the database).',
+    ['result'],
+)
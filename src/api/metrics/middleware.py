@@ -0,0 +1,102 @@
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import DB_QUERIES, DB_TIME, REQUEST_LATENCY, RESPONSE_SIZE
+
+current_recorder = ContextVar('metrics_query_recorder', default=None)
+
+
+class QueryRecorder:
+    """Counts the queries of one request and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    ``execute_wrapper`` hook installed on every connection. The recorder is
+    looked up in a context variable rather than bound to the connection, so
+    queries made by async views from ``sync_to_async`` threads, which use
+    their own connections, are attributed to the right request.
+    """
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.duration += time.perf_counter() - started
+        recorder.count += 1
+
+
+def install(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def install_on_connect(sender, connection, **kwargs):
+    install(connection)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, DB query count, DB time and response size for every
+    request, labelled by the resolved URL name (e.g. ``create_post``).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Connections opened before this module was imported missed the signal.
+        for connection in connections.all():
+            install(connection)
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.observe(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.observe(request, response, recorder, time.perf_counter() - started)
+
+    @staticmethod
+    def observe(request, response, recorder, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        view = match.url_name if match and match.url_name else 'unresolved'
+        if view == 'metrics':
+            return response
+
+        method = request.method
+        REQUEST_LATENCY.labels(view, method, str(response.status_code)).observe(elapsed)
+        DB_QUERIES.labels(view, method).observe(recorder.count)
+        DB_TIME.labels(view, method).observe(recorder.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(view, method).observe(len(response.content))
+        return response
@@ -0,0 +1,42 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from api.user.models import User
+from api.post.models import Post
+
+
+class MetricsTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Observer', email='observer@example.com', password_hash='hashedpassword')
+        self.post = Post.objects.create(user=self.user, title='Observed', content='Content')
+        self.client.force_authenticate(user=self.user)
+
+    def test_metrics_are_labelled_by_url_name(self):
+        self.client.get(reverse('post_detail_operations', kwargs={'post_id': self.post.id}))
+        self.client.get(reverse('list_user_posts', kwargs={'user_id': self.user.id}))
+
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('api_request_duration_seconds_count{method="GET",status="200",view="post_detail_operations"}', body)
+        self.assertIn('api_request_db_queries_sum{method="GET",view="list_user_posts"}', body)
+        self.assertIn('api_response_size_bytes_bucket', body)
+        self.assertNotIn('view="metrics"', body)
+
+    def test_scrapes_from_other_networks_are_refused(self):
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 403)
+
+        with override_settings(METRICS={'ALLOWED_NETWORKS': ['203.0.113.0/24']}):
+            response = self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS={'ALLOWED_NETWORKS': [], 'TOKEN': 'scrape-secret'})
+    def test_token_grants_access(self):
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 403)
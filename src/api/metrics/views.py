@@ -0,0 +1,46 @@
+import hmac
+import ipaddress
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+
+def get_config():
+    config = {
+        'ALLOWED_NETWORKS': ['127.0.0.1/32', '::1/128'],
+        'TOKEN': None,
+    }
+    config.update(getattr(settings, 'METRICS', {}))
+    return config
+
+
+def is_allowed(request, config):
+    """A scrape from an allowed network, or with the bearer token."""
+    token = config['TOKEN']
+    if token:
+        scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+            return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network) for network in config['ALLOWED_NETWORKS'])
+
+
+def metrics(request):
+    """
+    Prometheus text exposition. Under gunicorn with PROMETHEUS_MULTIPROC_DIR
+    set, every worker writes its samples to that directory and this view
+    aggregates them, so any worker can answer the scrape.
+    """
+    if not is_allowed(request, get_config()):
+        return HttpResponse(status=403)
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.openapi.schema import get_config, write
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema once and write schema.yaml and schema.json, each with a gzipped "
+        "copy, for a web server to serve statically or for the API to load at startup "
+        "(OPENAPI_SCHEMA_DIR)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help='Target directory. Defaults to OPENAPI_SCHEMA_DIR.')
+
+    def handle(self, *args, output_dir, **options):
+        output_dir = output_dir or get_config()['DIRECTORY']
+        if not output_dir:
+            raise CommandError('Pass --output-dir or set OPENAPI_SCHEMA_DIR.')
+        for path in write(output_dir):
+            self.stdout.write(f'Wrote {path} ({path.stat().st_size} bytes)')
@@ -0,0 +1,114 @@
+"""
+The OpenAPI document, generated once per process instead of per request.
+
+``drf-spectacular`` walks every view to build the schema, which is only
+worth doing when the code changes. ``PrecomputedSchema`` renders the YAML
+and JSON documents the first time they are needed, or loads them from the
+files ``export_openapi_schema`` wrote at build time, and keeps the bytes,
+their ETags and gzipped copies in memory.
+"""
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.http import quote_etag
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+RENDERERS = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+
+
+def get_config():
+    config = {
+        'PRECOMPUTED': False,
+        'DIRECTORY': None,
+        'MAX_AGE': 300,
+    }
+    config.update(getattr(settings, 'OPENAPI_SCHEMA', {}))
+    return config
+
+
+def is_enabled():
+    return get_config()['PRECOMPUTED']
+
+
+def generate():
+    """Render the schema the way ``SpectacularAPIView`` does, in every format."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return {fmt: renderer().render(schema, renderer_context={}) for fmt, renderer in RENDERERS.items()}
+
+
+def filename(fmt):
+    return f'schema.{fmt}'
+
+
+def compress(body):
+    # A fixed mtime keeps the output, and so the ETag, reproducible.
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+class Representation:
+    """One format of the schema: the body, its gzipped copy and their ETags."""
+
+    def __init__(self, body, gzipped=None):
+        self.body = body
+        self.gzipped = compress(body) if gzipped is None else gzipped
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = quote_etag(digest)
+        self.gzip_etag = quote_etag(f'{digest}-gzip')
+
+
+class PrecomputedSchema:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.representations = None
+
+    def get(self, fmt):
+        if self.representations is None:
+            with self.lock:
+                if self.representations is None:
+                    self.representations = self.build()
+        return self.representations[fmt]
+
+    def build(self):
+        directory = get_config()['DIRECTORY']
+        if directory and all((Path(directory) / filename(fmt)).exists() for fmt in RENDERERS):
+            return self.load(Path(directory))
+        return {fmt: Representation(body) for fmt, body in generate().items()}
+
+    @staticmethod
+    def load(directory):
+        representations = {}
+        for fmt in RENDERERS:
+            path = directory / filename(fmt)
+            gzip_path = path.with_name(path.name + '.gz')
+            gzipped = gzip_path.read_bytes() if gzip_path.exists() else None
+            representations[fmt] = Representation(path.read_bytes(), gzipped)
+        return representations
+
+    def clear(self):
+        with self.lock:
+            self.representations = None
+
+
+def write(directory):
+    """Write every format and its ``.gz`` copy, for static serving."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for fmt, body in generate().items():
+        path = directory / filename(fmt)
+        gzip_path = path.with_name(path.name + '.gz')
+        path.write_bytes(body)
+        gzip_path.write_bytes(compress(body))
+        paths += [path, gzip_path]
+    return paths
+
+
+precomputed_schema = PrecomputedSchema()
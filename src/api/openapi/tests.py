@@ -0,0 +1,82 @@
+import gzip
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from . import schema
+from .schema import precomputed_schema
+from .views import PrecomputedSchemaView
+
+
+class PrecomputedSchemaTestCase(APITestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = PrecomputedSchemaView.as_view()
+        precomputed_schema.clear()
+        self.addCleanup(precomputed_schema.clear)
+
+    def get(self, view=None, **headers):
+        request = self.factory.get('/api/schema/', headers=headers)
+        response = (view or self.view)(request)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_matches_the_generated_schema(self):
+        for accept in ('application/vnd.oai.openapi', 'application/json'):
+            precomputed = self.get(Accept=accept)
+            generated = self.get(SpectacularAPIView.as_view(), Accept=accept)
+            self.assertEqual(precomputed.status_code, 200)
+            self.assertEqual(precomputed.content, generated.content)
+            self.assertEqual(precomputed['Content-Type'], generated['Content-Type'])
+            self.assertEqual(precomputed['Content-Disposition'], generated['Content-Disposition'])
+
+    def test_generates_the_schema_once(self):
+        with mock.patch.object(schema, 'generate', wraps=schema.generate) as generate:
+            self.get()
+            self.get(Accept='application/json')
+            self.get()
+        self.assertEqual(generate.call_count, 1)
+
+    def test_etag_answers_not_modified(self):
+        response = self.get()
+        self.assertIn('ETag', response)
+        self.assertIn('max-age=', response['Cache-Control'])
+
+        not_modified = self.get(If_None_Match=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+
+        json_response = self.get(Accept='application/json', If_None_Match=response['ETag'])
+        self.assertEqual(json_response.status_code, 200)
+        self.assertNotEqual(json_response['ETag'], response['ETag'])
+
+    def test_serves_gzip_when_accepted(self):
+        plain = self.get()
+        compressed = self.get(Accept_Encoding='br, gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertNotEqual(compressed['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertNotIn('Content-Encoding', plain)
+
+    def test_export_command_writes_files_the_view_loads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = StringIO()
+            call_command('export_openapi_schema', output_dir=directory, stdout=out)
+            names = sorted(path.name for path in Path(directory).iterdir())
+            self.assertEqual(names, ['schema.json', 'schema.json.gz', 'schema.yaml', 'schema.yaml.gz'])
+            self.assertIn('schema.yaml', out.getvalue())
+
+            yaml_path = Path(directory) / 'schema.yaml'
+            yaml_path.write_bytes(yaml_path.read_bytes() + b'# exported\n')
+            with override_settings(OPENAPI_SCHEMA={'DIRECTORY': directory}):
+                response = self.get()
+        self.assertTrue(response.content.endswith(b'# exported\n'))
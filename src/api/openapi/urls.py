@@ -0,0 +1,11 @@
+from django.urls import path
+from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+
+from .schema import is_enabled
+from .views import PrecomputedSchemaView
+
+urlpatterns = [
+    path('', (PrecomputedSchemaView if is_enabled() else SpectacularAPIView).as_view(), name='schema'),
+    path('swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+]
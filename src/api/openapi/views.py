@@ -0,0 +1,44 @@
+import re
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from drf_spectacular.views import SpectacularAPIView
+
+from .schema import get_config, precomputed_schema
+
+# Same test as django.middleware.gzip.GZipMiddleware.
+accepts_gzip = re.compile(r'\bgzip\b')
+
+
+class PrecomputedSchemaView(SpectacularAPIView):
+    """
+    ``SpectacularAPIView`` answered from the precomputed schema. Content
+    negotiation, permissions and the view's own entry in the schema are
+    inherited, so clients see the same document either way. Requests for
+    another version or language still generate the schema on demand.
+    """
+
+    def _get_schema_response(self, request):
+        if self.api_version or request.version or self._get_version_parameter(request) or request.GET.get('lang'):
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        representation = precomputed_schema.get(renderer.format)
+        if accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            body, etag, encoding = representation.gzipped, representation.gzip_etag, 'gzip'
+        else:
+            body, etag, encoding = representation.body, representation.etag, None
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            content_type = request.accepted_media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            response = HttpResponse(body, content_type=content_type)
+            response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        patch_cache_control(response, public=True, max_age=get_config()['MAX_AGE'])
+        return response
@@ -0,0 +1,40 @@
+"""
+``JSONParser`` that decodes UTF-8 bodies with orjson.
+
+Bodies orjson cannot reproduce exactly go through DRF's stdlib parser:
+other charsets, ``STRICT_JSON = False``, digit runs long enough to be an
+integer beyond 64 bits (orjson would return a float), and anything orjson
+rejects, so invalid JSON fails with DRF's own error message.
+"""
+import codecs
+from io import BytesIO
+
+import orjson
+from django.conf import settings
+from rest_framework import parsers
+
+from .renderers import JSONRenderer, is_enabled
+
+# Maps every digit to b'0' and every other byte to b' ', so a run of 19
+# digits can be found with a plain substring search, which is several times
+# faster than a regular expression.
+DIGITS = bytes(ord('0') if byte in b'0123456789' else ord(' ') for byte in range(256))
+LONG_INTEGER = b'0' * 19
+
+
+class JSONParser(parsers.JSONParser):
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not is_enabled() or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_INTEGER not in body.translate(DIGITS):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(BytesIO(body), media_type, parser_context)
@@ -0,0 +1,50 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.async_api import async_api_view
+from api.user.models import User
+from . import response_cache, views
+from .models import Post
+from .pagination import KeysetPagination
+from .partitions import by_id
+from .serializers.serializers import POST_ROW_FIELDS, serialize_post_rows
+from .utils import handle_get_post
+
+
+@async_api_view(views.post_detail_operations)
+async def post_detail_operations(request, post_id: int):
+    try:
+        post = await by_id(Post.objects.select_related('user'), post_id).aget(deleted_at__isnull=True)
+    except Post.DoesNotExist:
+        return Response({"detail": "Post not found or has been deleted."}, status=status.HTTP_404_NOT_FOUND)
+
+    if response_cache.is_enabled():
+        return await sync_to_async(handle_get_post)(request, post)
+    return handle_get_post(request, post)
+
+
+@async_api_view(views.list_user_posts)
+async def list_user_posts(request, user_id: int):
+    use_cache = response_cache.is_enabled()
+    if use_cache:
+        cache_key = await sync_to_async(response_cache.list_key)(user_id, request)
+        data = await sync_to_async(response_cache.get_cached)(cache_key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
+    if not await User.objects.filter(id=user_id).aexists():
+        return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    posts = Post.objects.filter(user_id=user_id, deleted_at__isnull=True).values(*POST_ROW_FIELDS)
+
+    if KeysetPagination.is_requested(request):
+        paginator = KeysetPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(posts, request)
+        data = paginator.get_paginated_response(serialize_post_rows(page)).data
+    else:
+        data = serialize_post_rows([row async for row in posts.order_by('-created_at')])
+
+    if use_cache:
+        await sync_to_async(response_cache.set_cached)(cache_key, data)
+    return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,82 @@
+import time
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework import parsers, renderers
+
+from api.parsers import JSONParser
+from api.post.serializers.serializers import serialize_post_rows
+from api.renderers import JSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's stdlib JSONRenderer/JSONParser with the orjson-based api.renderers.JSONRenderer "
+        "and api.parsers.JSONParser on list_user_posts pages. No database access."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, nargs='+', default=[20, 100, 1000],
+                            help='Posts per page; 20 and 100 are the default and maximum page sizes.')
+        parser.add_argument('--iterations', type=int, default=200, help='Renders or parses per timed run.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case; the best is reported.')
+
+    def handle(self, *args, posts, iterations, repeat, **options):
+        for size in posts:
+            page = self.page(size)
+            stdlib_body = renderers.JSONRenderer().render(page)
+            fast_body = JSONRenderer().render(page)
+            if fast_body != stdlib_body:
+                raise CommandError('api.renderers.JSONRenderer output differs from DRF.')
+            if JSONParser().parse(BytesIO(fast_body)) != parsers.JSONParser().parse(BytesIO(stdlib_body)):
+                raise CommandError('api.parsers.JSONParser output differs from DRF.')
+
+            self.stdout.write(f'{size} posts ({len(stdlib_body) / 1024:.1f} KiB), best of {repeat} x {iterations}:')
+            self.report('render', iterations, repeat, lambda: renderers.JSONRenderer().render(page),
+                        lambda: JSONRenderer().render(page))
+            self.report('parse', iterations, repeat, lambda: parsers.JSONParser().parse(BytesIO(stdlib_body)),
+                        lambda: JSONParser().parse(BytesIO(stdlib_body)))
+        self.stdout.write(self.style.SUCCESS('Identical output.'))
+
+    @staticmethod
+    def page(size):
+        """A list_user_posts page as the view builds it, before rendering."""
+        now = timezone.now()
+        rows = [
+            {
+                'id': 1_000_000 + i,
+                'title': f'Post {i}',
+                'content': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4,
+                'image_url': 'https://example.com/image.jpg' if i % 3 else None,
+                'user_id': 42,
+                'user__name': 'Benchmark Author',
+                'created_at': now - timedelta(minutes=i),
+                'updated_at': now - timedelta(minutes=i, microseconds=-i),
+            }
+            for i in range(size)
+        ]
+        return {
+            'next': 'http://testserver/api/users/42/posts/?cursor=cD0yMDI0LTA1LTAxKzEyJTNBMDAlM0EwMC4wMDAwMDA%3D',
+            'previous': None,
+            'results': serialize_post_rows(rows),
+        }
+
+    def report(self, name, iterations, repeat, stdlib, fast):
+        stdlib_time = self.best_of(iterations, repeat, stdlib)
+        fast_time = self.best_of(iterations, repeat, fast)
+        self.stdout.write(
+            f'  {name:<7} stdlib {stdlib_time * 1e6:9.1f} us   orjson {fast_time * 1e6:9.1f} us   '
+            f'{stdlib_time / fast_time:5.1f}x'
+        )
+
+    @staticmethod
+    def best_of(iterations, repeat, run):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                run()
+            best = min(best, (time.perf_counter() - started) / iterations)
+        return best
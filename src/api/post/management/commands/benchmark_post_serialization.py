@@ -0,0 +1,58 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.post.models import Post
+from api.post.serializers.serializers import POST_ROW_FIELDS, PostSerializer, serialize_post_rows
+from api.user.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare PostSerializer(many=True) with the values()-based fast path on a large post list. "
+        "Seeds the posts inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000, help='Number of posts in the list.')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the best time is reported.')
+
+    def handle(self, *args, posts, repeat, **options):
+        with transaction.atomic():
+            author = User.objects.create(name='BENCHMARK', email='benchmark@example.invalid', password_hash='-')
+            Post.objects.bulk_create(
+                [
+                    Post(user=author, title=f'Post {i}', content='Lorem ipsum dolor sit amet. ' * 8,
+                         image_url='http://example.com/image.jpg' if i % 3 else None)
+                    for i in range(posts)
+                ],
+                batch_size=1000,
+            )
+            queryset = Post.objects.filter(user=author, deleted_at__isnull=True).order_by('-created_at', '-id')
+
+            model_time, model_data = self.best_of(
+                repeat, lambda: PostSerializer(queryset.select_related('user'), many=True).data
+            )
+            rows_time, rows_data = self.best_of(
+                repeat, lambda: serialize_post_rows(queryset.values(*POST_ROW_FIELDS))
+            )
+            transaction.set_rollback(True)
+
+        if json.dumps(model_data) != json.dumps(rows_data):
+            raise CommandError('The fast path output differs from PostSerializer.')
+
+        self.stdout.write(f'{posts} posts, best of {repeat} runs (query + serialization):')
+        self.stdout.write(f'  PostSerializer(many=True): {model_time * 1000:.1f} ms')
+        self.stdout.write(f'  serialize_post_rows:       {rows_time * 1000:.1f} ms')
+        self.stdout.write(self.style.SUCCESS(f'Identical output, {model_time / rows_time:.1f}x faster.'))
+
+    @staticmethod
+    def best_of(repeat, run):
+        best, result = float('inf'), None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            best = min(best, time.perf_counter() - started)
+        return best, result
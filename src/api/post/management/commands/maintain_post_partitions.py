@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.post import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintain the monthly partitions of the posts table on PostgreSQL: create partitions for the coming "
+        "months and detach those older than the retention window. --convert partitions the plain table first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help='Convert the plain posts table into a partitioned one (run once).')
+        parser.add_argument('--months-ahead', type=int, help='Months after the current one to create partitions for.')
+        parser.add_argument('--retain-months', type=int,
+                            help='Detach partitions older than this many months; 0 keeps all of them.')
+
+    def handle(self, *args, convert, months_ahead, retain_months, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning needs a PostgreSQL database.')
+
+        config = partitions.get_config()
+        months_ahead = config['MONTHS_AHEAD'] if months_ahead is None else months_ahead
+        retain_months = config['RETAIN_MONTHS'] if retain_months is None else retain_months
+
+        if not partitions.is_partitioned(connection):
+            if not convert:
+                raise CommandError('The posts table is not partitioned yet; run with --convert first.')
+            partitions.convert(connection, config['BATCH_SIZE'], self.stdout)
+            self.stdout.write('Set POSTS_PARTITIONED=true so id lookups use post_locations.')
+
+        for name in partitions.ensure_partitions(connection, months_ahead):
+            self.stdout.write(f'Partition {name} is ready.')
+        for name in partitions.detach_expired(connection, retain_months, config['BATCH_SIZE']):
+            self.stdout.write(f'Detached {name}; archive or drop it when no longer needed.')
+        self.stdout.write(self.style.SUCCESS('Partitions are up to date.'))
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.20 on 2026-10-17 21:54
+
+from django.db import migrations, models
+
+from api.db.operations import AddIndexIfNotExists
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL.
+    atomic = False
+
+    dependencies = [
+        ('post', '0002_timelineentry'),
+    ]
+
+    operations = [
+        AddIndexIfNotExists(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', '-created_at', '-id'], name='posts_user_live_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='post',
+            index=models.Index(fields=['user'], name='posts_user_id_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='posts_deleted_at_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='timelineentry',
+            index=models.Index(fields=['owner', '-created_at', '-post'], name='timeline_owner_created_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='timelineentry',
+            index=models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='timelineentry',
+            index=models.Index(fields=['post'], name='timeline_post_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='timelineentry',
+            index=models.Index(fields=['author'], name='timeline_author_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+from api.db.operations import builds_concurrently
+
+# Kept identical to scripts/init_tables.sql.
+ADD_COLUMN_SQL = """
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(content, '')), 'B')
+) STORED
+"""
+
+
+def add_search_vector(apps, schema_editor):
+    # Full-text search only exists on PostgreSQL; see api.post.search.
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(ADD_COLUMN_SQL)
+    concurrently = 'CONCURRENTLY ' if builds_concurrently(connection, 'posts') else ''
+    schema_editor.execute(
+        f'CREATE INDEX {concurrently}IF NOT EXISTS posts_search_vector_idx ON posts USING GIN (search_vector)'
+    )
+
+
+def remove_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS posts_search_vector_idx')
+    schema_editor.execute('ALTER TABLE posts DROP COLUMN IF EXISTS search_vector')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('post', '0003_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, remove_search_vector),
+    ]
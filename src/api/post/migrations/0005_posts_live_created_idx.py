@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+from api.db.operations import AddIndexIfNotExists
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL.
+    atomic = False
+
+    dependencies = [
+        ('post', '0004_search_vector'),
+    ]
+
+    operations = [
+        AddIndexIfNotExists(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-created_at', '-id'], name='posts_live_created_idx'),
+        ),
+    ]
@@ -4,7 +4,7 @@ from api.user.models import User
 class Post(models.Model):
     
     id = models.AutoField(primary_key=True)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts', db_index=False)
     title = models.CharField(max_length=100)
     content = models.TextField()
     image_url = models.CharField(max_length=255, blank=True, null=True)
@@ -18,3 +18,49 @@ class Post(models.Model):
     class Meta:
         db_table = 'posts'
         ordering = ['-created_at']
+        indexes = [
+            # Post lists, feeds and per-user counts only ever read live posts.
+            models.Index(
+                fields=['user', '-created_at', '-id'], name='posts_user_live_idx',
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # The home feed walks this newest first and stops once it has a
+            # page of posts by followed authors, whatever their number.
+            models.Index(
+                fields=['-created_at', '-id'], name='posts_live_created_idx',
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # Cascades and the purge job, which also see deleted posts.
+            models.Index(fields=['user'], name='posts_user_id_idx'),
+            # Only soft-deleted rows, for the purge job; live rows add no entries.
+            models.Index(
+                fields=['deleted_at'], name='posts_deleted_at_idx', condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    """
+    A post materialized into a follower's home timeline (fan-out on write).
+
+    ``created_at`` is copied from the post so a timeline page is a single
+    range scan on (owner, created_at) without touching the posts table.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_entries', db_index=False)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries', db_index=False)
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Post {self.post_id} in timeline of user {self.owner_id}"
+
+    class Meta:
+        db_table = 'timeline_entries'
+        unique_together = ('owner', 'post')
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-post'], name='timeline_owner_created_idx'),
+            models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx'),
+            # Cascades when posts and users are deleted.
+            models.Index(fields=['post'], name='timeline_post_idx'),
+            models.Index(fields=['author'], name='timeline_author_idx'),
+        ]
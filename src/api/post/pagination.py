@@ -0,0 +1,176 @@
+import base64
+import binascii
+import math
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination over (created_at, id), newest first.
+
+    Each page is a single indexed range scan: the cursor carries the boundary
+    row, so the cost of a page does not depend on how deep the client is, and
+    rows inserted while paging never shift or duplicate results.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    order_field = 'created_at'
+    id_field = 'id'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self):
+        config = getattr(settings, 'KEYSET_PAGINATION', {})
+        self.page_size = config.get('PAGE_SIZE', 20)
+        self.max_page_size = config.get('MAX_PAGE_SIZE', 100)
+
+    @classmethod
+    def is_requested(cls, request):
+        params = request.query_params
+        return cls.cursor_query_param in params or cls.page_size_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def format_value(self, value):
+        return value.isoformat()
+
+    def parse_value(self, raw):
+        """Inverse of ``format_value``; None or ValueError for a bad cursor."""
+        return parse_datetime(raw)
+
+    def encode_cursor(self, position, reverse=False):
+        value, row_id = position
+        raw = f"{'r' if reverse else 'f'}|{self.format_value(value)}|{row_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            direction, value, row_id = base64.urlsafe_b64decode(encoded.encode()).decode().split('|')
+            value = self.parse_value(value)
+            row_id = int(row_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if direction not in ('f', 'r') or value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return direction == 'r', value, row_id
+
+    def get_position(self, row, id_field=None):
+        id_field = id_field or self.id_field
+        if isinstance(row, dict):
+            return row[self.order_field], row[id_field]
+        return getattr(row, self.order_field), getattr(row, id_field)
+
+    def fetch(self, queryset, cursor, limit, id_field=None):
+        """
+        Return up to ``limit`` rows past ``cursor`` in scan order (newest
+        first going forward, oldest first going backwards).
+        """
+        t, pk = self.order_field, id_field or self.id_field
+        reverse = cursor is not None and cursor[0]
+        if cursor is not None:
+            _, value, row_id = cursor
+            op = 'gt' if reverse else 'lt'
+            # The first condition is implied by the second; stated on its
+            # own it is a plain range that lets PostgreSQL prune partitions.
+            queryset = queryset.filter(**{f'{t}__{op}e': value}).filter(
+                Q(**{f'{t}__{op}': value}) | Q(**{t: value, f'{pk}__{op}': row_id})
+            )
+        ordering = (t, pk) if reverse else (f'-{t}', f'-{pk}')
+        return list(queryset.order_by(*ordering)[:limit])
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_sources([(queryset, self.id_field)], request)
+
+    def paginate_sources(self, sources, request):
+        """
+        Paginate the k-way merge of several ``(queryset, id_field)`` sources
+        that share the same (order_field, id) key space. Rows whose position
+        appears in more than one source are returned once.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[0]
+
+        merged = {}
+        for queryset, id_field in sources:
+            for row in self.fetch(queryset, cursor, self.page_size + 1, id_field):
+                merged.setdefault(self.get_position(row, id_field), row)
+
+        positions = sorted(merged, reverse=not reverse)
+        has_more = len(positions) > self.page_size
+        positions = positions[:self.page_size]
+        if reverse:
+            positions.reverse()
+
+        # Going forward we know there is a previous page whenever we came in
+        # with a cursor; going backwards, the next page is the one we came from.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None if not reverse else has_more
+        self.positions = positions
+        self.page = [merged[position] for position in positions]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.positions:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.positions[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.positions:
+            return remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.positions[0], reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class SearchPagination(KeysetPagination):
+    """
+    Cursor pagination over (rank, id), best match first. The rank is a
+    double precision value computed by the database, and the cursor keeps
+    its exact repr so the boundary row compares equal on the next page.
+    """
+    order_field = 'rank'
+
+    def format_value(self, value):
+        return repr(value)
+
+    def parse_value(self, raw):
+        value = float(raw)
+        return value if math.isfinite(value) else None
@@ -0,0 +1,341 @@
+"""
+Monthly range partitioning of ``posts`` by ``created_at`` on PostgreSQL.
+
+``convert`` turns the plain table, created by init_tables.sql or by the
+migrations, into a partitioned one without rewriting it. The existing heap
+is attached as the ``posts_legacy`` partition for everything before the
+next month, and new months get their own partitions. The slow steps (index builds, constraint
+validation, locator backfill) run before or after the brief switch, which
+holds an exclusive lock only for catalog changes.
+
+A partitioned table cannot have a primary key on ``id`` alone, so:
+
+* the primary key becomes ``(id, created_at)``;
+* ``post_locations`` maps every id to its ``created_at``, kept up to date
+  by a trigger. Its primary key keeps ids unique, and ``by_id`` uses it so
+  that an id lookup reads a single partition instead of probing all of them;
+* timeline entries reference ``(post_id, created_at)``, which they already
+  copy from the post.
+
+``ensure_partitions`` creates partitions ahead of time and ``detach_expired``
+detaches partitions older than the retention window. Both are run by the
+``maintain_post_partitions`` command, for example daily from cron.
+"""
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+PARENT = 'posts'
+LEGACY = 'posts_legacy'
+LOCATIONS = 'post_locations'
+
+# Secondary indexes of posts (see the post migrations), recreated on the
+# partitioned parent.
+POST_INDEXES = {
+    'posts_user_live_idx': '(user_id, created_at DESC, id DESC) WHERE deleted_at IS NULL',
+    'posts_live_created_idx': '(created_at DESC, id DESC) WHERE deleted_at IS NULL',
+    'posts_user_id_idx': '(user_id)',
+    'posts_deleted_at_idx': '(deleted_at) WHERE deleted_at IS NOT NULL',
+    'posts_search_vector_idx': 'USING GIN (search_vector)',
+}
+
+BOUND_RE = re.compile(r"FROM \((MINVALUE|'[^']+')\) TO \('([^']+)'\)")
+
+
+def get_config():
+    config = {
+        'ENABLED': False,
+        'MONTHS_AHEAD': 3,
+        # 0 keeps every partition attached.
+        'RETAIN_MONTHS': 0,
+        'BATCH_SIZE': 10000,
+    }
+    config.update(getattr(settings, 'POST_PARTITIONING', {}))
+    return config
+
+
+def is_enabled(using='default'):
+    return get_config()['ENABLED'] and connections[using].vendor == 'postgresql'
+
+
+def by_id(queryset, post_id):
+    """
+    Filter posts by id. On a partitioned table the ``created_at`` looked up
+    in ``post_locations`` lets PostgreSQL prune every other partition at
+    execution time.
+    """
+    queryset = queryset.filter(id=post_id)
+    if is_enabled(queryset.db):
+        queryset = queryset.filter(
+            created_at=RawSQL(f'SELECT created_at FROM {LOCATIONS} WHERE id = %s', [post_id])
+        )
+    return queryset
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_of(day):
+    return date(day.year, day.month, 1)
+
+
+def partition_name(month):
+    return f'{PARENT}_p{month.year:04d}_{month.month:02d}'
+
+
+def parse_bounds(expression):
+    """``(lower, upper)`` dates of a ``pg_get_expr`` range bound; lower is None for MINVALUE."""
+    match = BOUND_RE.search(expression)
+    if match is None:
+        return None
+    lower, upper = match.groups()
+    lower = None if lower == 'MINVALUE' else date.fromisoformat(lower.strip("'")[:10])
+    return lower, date.fromisoformat(upper[:10])
+
+
+def plan_partitions(partitions, today, months_ahead):
+    """
+    Months to create so that every month up to ``months_ahead`` after
+    ``today`` has a partition. ``partitions`` maps names to their bounds.
+    """
+    covered_until = max((upper for _, upper in partitions.values()), default=None)
+    month = month_of(today)
+    if covered_until is not None and covered_until > month:
+        month = covered_until
+    last = add_months(month_of(today), months_ahead)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def plan_detach(partitions, today, retain_months):
+    """Names of partitions entirely older than ``retain_months`` before ``today``, oldest first."""
+    if retain_months <= 0:
+        return []
+    cutoff = add_months(month_of(today), -retain_months)
+    expired = [(upper, name) for name, (_, upper) in partitions.items() if upper <= cutoff]
+    return [name for _, name in sorted(expired)]
+
+
+def list_partitions(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) '
+            'FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = %s::regclass',
+            [PARENT],
+        )
+        return {name: parse_bounds(bound) for name, bound in cursor.fetchall()}
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", [PARENT])
+        return cursor.fetchone()[0] == 'p'
+
+
+def foreign_keys(connection, table, referenced):
+    """Names of the foreign keys from ``table`` to ``referenced``."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE contype = 'f' AND conrelid = %s::regclass AND confrelid = %s::regclass",
+            [table, referenced],
+        )
+        return [name for name, in cursor.fetchall()]
+
+
+def ensure_partitions(connection, months_ahead, today=None):
+    today = today or timezone.now().date()
+    created = []
+    for month in plan_partitions(list_partitions(connection), today, months_ahead):
+        name = partition_name(month)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} FOR VALUES FROM (%s) TO (%s)',
+                [month.isoformat(), add_months(month, 1).isoformat()],
+            )
+        created.append(name)
+    return created
+
+
+def detach_expired(connection, retain_months, batch_size, today=None):
+    """
+    Detach old partitions, leaving them as standalone tables to archive or
+    drop. Timeline entries pointing into them are deleted first, and their
+    ids are removed from ``post_locations`` afterwards in batches.
+    """
+    today = today or timezone.now().date()
+    partitions = list_partitions(connection)
+    detached = []
+    for name in plan_detach(partitions, today, retain_months):
+        lower, upper = partitions[name]
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM timeline_entries WHERE created_at < %s' + (' AND created_at >= %s' if lower else ''),
+                [upper.isoformat()] + ([lower.isoformat()] if lower else []),
+            )
+            cursor.execute(f'ALTER TABLE {PARENT} DETACH PARTITION {name}')
+        forget_locations(connection, name, batch_size)
+        detached.append(name)
+    return detached
+
+
+def in_batches(connection, table, statement, batch_size):
+    """
+    Run ``statement`` (which reads ids from ``batch``) over the rows of
+    ``table`` in id order, one short statement per ``batch_size`` rows.
+    """
+    last_id = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'WITH batch AS (SELECT id, created_at FROM {table} WHERE id > %s ORDER BY id LIMIT %s), '
+                f'applied AS ({statement}) SELECT max(id) FROM batch',
+                [last_id, batch_size],
+            )
+            last_id = cursor.fetchone()[0]
+        if last_id is None:
+            return
+
+
+def forget_locations(connection, table, batch_size):
+    in_batches(connection, table, f'DELETE FROM {LOCATIONS} WHERE id IN (SELECT id FROM batch)', batch_size)
+
+
+LOCATE_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION {LOCATIONS}_sync() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    DELETE FROM {LOCATIONS} WHERE id = OLD.id;
+    RETURN OLD;
+  ELSIF TG_OP = 'UPDATE' AND OLD.id = NEW.id THEN
+    INSERT INTO {LOCATIONS} (id, created_at) VALUES (NEW.id, NEW.created_at)
+      ON CONFLICT (id) DO UPDATE SET created_at = EXCLUDED.created_at;
+    RETURN NEW;
+  ELSIF TG_OP = 'UPDATE' THEN
+    DELETE FROM {LOCATIONS} WHERE id = OLD.id;
+  END IF;
+  -- A new id: the primary key rejects one already used in another partition.
+  INSERT INTO {LOCATIONS} (id, created_at) VALUES (NEW.id, NEW.created_at);
+  RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def locate_trigger_sql(table):
+    return (
+        f'CREATE TRIGGER {LOCATIONS}_sync AFTER INSERT OR DELETE OR UPDATE OF id, created_at ON {table} '
+        f'FOR EACH ROW EXECUTE FUNCTION {LOCATIONS}_sync()'
+    )
+
+
+def column_info(connection, table, column):
+    """The type of a column and its identity kind: 'a', 'd', or '' for none."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT format_type(atttypid, atttypmod), attidentity FROM pg_attribute '
+            'WHERE attrelid = %s::regclass AND attname = %s',
+            [table, column],
+        )
+        return cursor.fetchone()
+
+
+def convert(connection, batch_size, stdout, today=None):
+    """
+    Partition the plain ``posts`` table in place. Must run outside a
+    transaction: indexes are built concurrently.
+    """
+    boundary = add_months(month_of(today or timezone.now().date()), 1).isoformat()
+
+    def execute(sql, params=None):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    # init_tables.sql creates TIMESTAMP columns and a serial id, the
+    # migrations TIMESTAMPTZ and an identity column.
+    created_at_type, _ = column_info(connection, PARENT, 'created_at')
+
+    stdout.write('Preparing indexes, constraints and the id locator.')
+    execute(f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {LEGACY}_id_created_at_key ON {PARENT} (id, created_at)')
+    for name, definition in POST_INDEXES.items():
+        execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {PARENT} {definition}')
+    # Validating a CHECK constraint only takes a SHARE UPDATE EXCLUSIVE
+    # lock, and lets ATTACH PARTITION skip its own scan.
+    execute(f'ALTER TABLE {PARENT} DROP CONSTRAINT IF EXISTS {LEGACY}_range')
+    execute(f'ALTER TABLE {PARENT} ADD CONSTRAINT {LEGACY}_range CHECK (created_at < %s) NOT VALID', [boundary])
+    execute(f'ALTER TABLE {PARENT} VALIDATE CONSTRAINT {LEGACY}_range')
+    execute(f'CREATE TABLE IF NOT EXISTS {LOCATIONS} (id INT PRIMARY KEY, created_at {created_at_type} NOT NULL)')
+    execute(LOCATE_FUNCTION_SQL)
+    execute(f'DROP TRIGGER IF EXISTS {LOCATIONS}_sync ON {PARENT}')
+    execute(locate_trigger_sql(PARENT))
+
+    stdout.write('Backfilling post_locations.')
+    in_batches(
+        connection, PARENT,
+        f'INSERT INTO {LOCATIONS} (id, created_at) SELECT id, created_at FROM batch ON CONFLICT (id) DO NOTHING',
+        batch_size,
+    )
+
+    stdout.write('Switching to the partitioned table.')
+    with transaction.atomic(using=connection.alias):
+        execute(f'LOCK TABLE {PARENT}, timeline_entries IN ACCESS EXCLUSIVE MODE')
+        # The timeline key depends on the primary key replaced below. Its name
+        # depends on whether init_tables.sql or the migrations created it, so
+        # it is looked up.
+        for name in foreign_keys(connection, 'timeline_entries', PARENT):
+            execute(f'ALTER TABLE timeline_entries DROP CONSTRAINT {connection.ops.quote_name(name)}')
+        execute(f'ALTER TABLE {PARENT} RENAME TO {LEGACY}')
+        # A partition must carry the parent's primary key. The unique index
+        # built above becomes it without another scan.
+        execute(f'ALTER TABLE {LEGACY} DROP CONSTRAINT posts_pkey')
+        execute(
+            f'ALTER TABLE {LEGACY} ADD CONSTRAINT {LEGACY}_pkey PRIMARY KEY USING INDEX {LEGACY}_id_created_at_key'
+        )
+        for name in POST_INDEXES:
+            execute(f'ALTER INDEX {name} RENAME TO {LEGACY}{name[len(PARENT):]}')
+        execute(f'DROP TRIGGER {LOCATIONS}_sync ON {LEGACY}')
+        _, identity = column_info(connection, LEGACY, 'id')
+        if identity:
+            # LIKE does not copy an identity, and its sequence cannot change
+            # owner. It is recreated on the parent, continuing the numbering.
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT nextval(pg_get_serial_sequence('{LEGACY}', 'id'))")
+                next_id = cursor.fetchone()[0]
+            execute(f'ALTER TABLE {LEGACY} ALTER id DROP IDENTITY')
+
+        execute(
+            f'CREATE TABLE {PARENT} (LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING GENERATED) '
+            f'PARTITION BY RANGE (created_at)'
+        )
+        if identity:
+            generated = 'ALWAYS' if identity == 'a' else 'BY DEFAULT'
+            execute(f'ALTER TABLE {PARENT} ALTER id ADD GENERATED {generated} AS IDENTITY (START WITH {next_id})')
+        else:
+            execute(f'ALTER SEQUENCE posts_id_seq OWNED BY {PARENT}.id')
+        execute(f'ALTER TABLE {PARENT} ADD CONSTRAINT posts_pkey PRIMARY KEY (id, created_at)')
+        execute(f'ALTER TABLE {PARENT} ADD CONSTRAINT posts_user_id_fkey FOREIGN KEY (user_id) REFERENCES "users"(id)')
+        for name, definition in POST_INDEXES.items():
+            execute(f'CREATE INDEX {name} ON {PARENT} {definition}')
+        execute(locate_trigger_sql(PARENT))
+
+        # Existing indexes and the validated CHECK match, so nothing is rebuilt or scanned.
+        execute(f'ALTER TABLE {PARENT} ATTACH PARTITION {LEGACY} FOR VALUES FROM (MINVALUE) TO (%s)', [boundary])
+        execute(f'ALTER TABLE {LEGACY} DROP CONSTRAINT {LEGACY}_range')
+
+        execute(
+            'ALTER TABLE timeline_entries ADD CONSTRAINT timeline_entries_post_fkey '
+            f'FOREIGN KEY (post_id, created_at) REFERENCES {PARENT} (id, created_at) ON DELETE CASCADE NOT VALID'
+        )
+
+    stdout.write('Validating the timeline foreign key.')
+    execute('ALTER TABLE timeline_entries VALIDATE CONSTRAINT timeline_entries_post_fkey')
@@ -0,0 +1,119 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from api.db.routing import reads_from_replica
+from api.metrics.metrics import RESPONSE_CACHE_LOOKUPS
+
+
+def get_config():
+    config = {
+        'ENABLED': False,
+        'CACHE_ALIAS': 'default',
+        'TIMEOUT': 300,
+    }
+    config.update(getattr(settings, 'RESPONSE_CACHE', {}))
+    return config
+
+
+def is_enabled():
+    return get_config()['ENABLED']
+
+
+def get_cache():
+    return caches[get_config()['CACHE_ALIAS']]
+
+
+def version_key(author_id):
+    return f'posts:version:{author_id}'
+
+
+def new_version():
+    # Time based rather than starting at 1, so that a version key evicted
+    # from the cache can never come back at a value that was already used.
+    return time.time_ns()
+
+
+def get_posts_version(author_id):
+    cache = get_cache()
+    key = version_key(author_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_posts_version(author_id):
+    """
+    Invalidate every cached response derived from an author's posts. Keys
+    embed the version, so changing it orphans the old entries in O(1) and
+    they simply expire.
+    """
+    if not is_enabled():
+        return
+    cache = get_cache()
+    key = version_key(author_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_version(), timeout=None)
+
+
+def list_key(author_id, request):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'posts:list:{author_id}:{get_posts_version(author_id)}:{url}'
+
+
+def detail_key(post):
+    return f'posts:detail:{post.id}:{get_posts_version(post.user_id)}'
+
+
+class ResponseCacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        RESPONSE_CACHE_LOOKUPS.labels('hit' if hit else 'miss').inc()
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def get_cached(key):
+    data = get_cache().get(key)
+    response_cache_stats.record(data is not None)
+    return data
+
+
+def set_cached(key, data):
+    # A replica may not have caught up with the write that bumped the
+    # version yet, and the entry would then serve that stale page to the
+    # writer too, whose reads go to the primary but check this cache first.
+    if reads_from_replica():
+        return
+    get_cache().set(key, data, get_config()['TIMEOUT'])
@@ -0,0 +1,60 @@
+"""
+Full-text search over posts.
+
+On PostgreSQL the ``posts`` table has a stored, generated ``search_vector``
+column (title weighted above content) with a GIN index. Being generated, it
+is recomputed by the database whenever a post is created or its title or
+content is patched, so no application code has to keep it in sync. It is
+added by migration post.0003 rather than declared as a model field: Django
+never selects or writes it, and it is only referenced by the search query.
+
+Other databases (SQLite in tests) fall back to ``icontains`` matching of
+every term with a simple match-count rank. That is a sequential scan and
+only meant for development.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+SEARCH_COLUMN = 'search_vector'
+
+# Weights of a title and a content match in the fallback rank, mirroring
+# the default ts_rank weights of the 'A' and 'B' labels.
+FALLBACK_TITLE_WEIGHT = 1.0
+FALLBACK_CONTENT_WEIGHT = 0.4
+
+
+def uses_tsvector(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def search(queryset, terms):
+    """
+    Filter ``queryset`` of posts to those matching ``terms`` and annotate
+    each with a ``rank``, higher meaning a better match.
+    """
+    if uses_tsvector(queryset.db):
+        column = connections[queryset.db].ops.quote_name(SEARCH_COLUMN)
+        vector = RawSQL(f'"posts".{column}', [], output_field=SearchVectorField())
+        query = SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+        # ts_rank returns a real; as double precision the value round-trips
+        # exactly through the cursor.
+        return queryset.annotate(document=vector).filter(document=query).annotate(
+            rank=Cast(SearchRank(vector, query), FloatField())
+        )
+
+    words = terms.split()
+    if not words:
+        return queryset.none()
+    rank = Value(0.0)
+    for word in words:
+        queryset = queryset.filter(Q(title__icontains=word) | Q(content__icontains=word))
+        rank = rank + Case(
+            When(title__icontains=word, then=Value(FALLBACK_TITLE_WEIGHT)), default=Value(0.0),
+        ) + Case(
+            When(content__icontains=word, then=Value(FALLBACK_CONTENT_WEIGHT)), default=Value(0.0),
+        )
+    return queryset.annotate(rank=Cast(rank, FloatField()))
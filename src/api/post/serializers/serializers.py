@@ -1,4 +1,5 @@
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from ..models import Post
 from api.user.models import User
 
@@ -40,4 +41,51 @@ class PostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = ['id', 'title', 'content', 'image_url', 'user', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+
+
+def datetime_formatter():
+    """
+    Equivalent of ``DateTimeField().to_representation`` with the field and
+    timezone lookups hoisted out of the per-value call.
+    """
+    field = serializers.DateTimeField()
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def to_representation(value):
+        if not value:
+            return None
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return to_representation
+
+
+POST_ROW_FIELDS = ('id', 'title', 'content', 'image_url', 'user_id', 'user__name', 'created_at', 'updated_at')
+
+
+def serialize_post_rows(rows):
+    """
+    Read-only fast path producing exactly what ``PostSerializer(many=True).data``
+    does, from ``Post.objects.values(*POST_ROW_FIELDS)`` rows. It skips the
+    per-field machinery of ModelSerializer, which dominates CPU time on large
+    lists. Keep it in sync with PostSerializer.Meta.fields.
+    """
+    datetime_to_representation = datetime_formatter()
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'content': row['content'],
+            'image_url': row['image_url'],
+            'user': {'id': row['user_id'], 'name': row['user__name']},
+            'created_at': datetime_to_representation(row['created_at']),
+            'updated_at': datetime_to_representation(row['updated_at']),
+        }
+        for row in rows
+    ]
@@ -1,9 +1,34 @@
+import json
+import tempfile
+import uuid
+import zoneinfo
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock, skipIf
+
+import orjson
+from asgiref.sync import sync_to_async
+from prometheus_client import REGISTRY
+from django.core.management import call_command
+from django.db import DatabaseError, connection
 from django.urls import reverse
-from rest_framework import status
+from django.test import AsyncRequestFactory, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework import parsers, renderers, status
+from rest_framework.exceptions import ParseError
 from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 from api.user.models import User
-from .models import Post
+from . import async_views, partitions
+from .models import Post, TimelineEntry
+from .response_cache import response_cache_stats
+from .serializers.serializers import POST_ROW_FIELDS, PostSerializer, serialize_post_rows
+from api.social.models import Follow
 from django.utils import timezone
+from django.core.cache import cache
+from api.parsers import JSONParser
+from api.renderers import JSONRenderer
 
 
 class PostAPITestCase(APITestCase):
@@ -170,3 +195,662 @@ class PostAPITestCase(APITestCase):
 
         response_second_delete = self.client.delete(self.post_detail_url_post1_user1)
         self.assertEqual(response_second_delete.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ListUserPostsPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Paged User', email='paged@example.com', password_hash='hashedpassword')
+        self.client.force_authenticate(user=self.user)
+
+        base = timezone.now()
+        self.posts = []
+        # Posts 1 and 2 share a timestamp to exercise the id tie-breaker.
+        for i, minutes_ago in enumerate([0, 1, 1, 2, 3]):
+            post = Post.objects.create(user=self.user, title=f'Post {i}', content=f'Content {i}')
+            post.created_at = base - timezone.timedelta(minutes=minutes_ago)
+            post.save(update_fields=['created_at'])
+            self.posts.append(post)
+
+        self.url = reverse('list_user_posts', kwargs={'user_id': self.user.id})
+        self.expected_ids = [
+            p.id for p in sorted(self.posts, key=lambda p: (p.created_at, p.id), reverse=True)
+        ]
+
+    def test_without_pagination_params_returns_plain_list(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_walks_all_pages_forward_and_back(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['previous'])
+
+        seen, pages = [], []
+        while True:
+            pages.append(response.data)
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(seen, self.expected_ids)
+        self.assertEqual(len(pages), 3)
+
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual([item['id'] for item in response.data['results']], self.expected_ids[2:4])
+
+    def test_new_posts_do_not_shift_later_pages(self):
+        first = self.client.get(self.url, {'page_size': 2})
+        Post.objects.create(user=self.user, title='Newest', content='Inserted while paging')
+        second = self.client.get(first.data['next'])
+        self.assertEqual([item['id'] for item in second.data['results']], self.expected_ids[2:4])
+
+    def test_page_size_is_capped(self):
+        with self.settings(KEYSET_PAGINATION={'PAGE_SIZE': 2, 'MAX_PAGE_SIZE': 3}):
+            response = self.client.get(self.url, {'page_size': 50})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_deleted_posts_are_skipped(self):
+        self.posts[0].deleted_at = timezone.now()
+        self.posts[0].save()
+        response = self.client.get(self.url, {'page_size': 10})
+        self.assertNotIn(self.posts[0].id, [item['id'] for item in response.data['results']])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class HomeFeedTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.reader = User.objects.create(name='Reader', email='reader@example.com', password_hash='hashedpassword')
+        self.author1 = User.objects.create(name='Author One', email='author1@example.com', password_hash='hashedpassword')
+        self.author2 = User.objects.create(name='Author Two', email='author2@example.com', password_hash='hashedpassword')
+        self.stranger = User.objects.create(name='Stranger', email='stranger@example.com', password_hash='hashedpassword')
+
+        Follow.objects.create(follower=self.reader, following=self.author1)
+        Follow.objects.create(follower=self.reader, following=self.author2)
+
+        self.a1_old = Post.objects.create(user=self.author1, title='A1 old', content='x')
+        self.a2_mid = Post.objects.create(user=self.author2, title='A2 mid', content='x')
+        self.a1_new = Post.objects.create(user=self.author1, title='A1 new', content='x')
+        self.hidden = Post.objects.create(user=self.stranger, title='Not followed', content='x')
+        self.deleted = Post.objects.create(user=self.author2, title='Deleted', content='x', deleted_at=timezone.now())
+
+        self.url = reverse('home_feed')
+        self.client.force_authenticate(user=self.reader)
+
+    def test_feed_merges_followed_authors_newest_first(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [self.a1_new.id, self.a2_mid.id, self.a1_old.id])
+
+    def test_feed_is_paginated(self):
+        first = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(len(first.data['results']), 2)
+        second = self.client.get(first.data['next'])
+        self.assertEqual([item['id'] for item in second.data['results']], [self.a1_old.id])
+        self.assertIsNone(second.data['next'])
+
+    def test_feed_uses_a_single_query_per_page(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_feed_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(TIMELINE={'MODE': 'write', 'FANOUT_MAX_FOLLOWERS': 2})
+class MaterializedTimelineTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.reader = User.objects.create(name='Reader', email='reader@example.com', password_hash='hashedpassword')
+        self.author = User.objects.create(name='Author', email='author@example.com', password_hash='hashedpassword')
+        self.celebrity = User.objects.create(name='Celebrity', email='celebrity@example.com', password_hash='hashedpassword')
+        self.fan = User.objects.create(name='Fan', email='fan@example.com', password_hash='hashedpassword')
+
+        cache.clear()
+
+        self.client.force_authenticate(user=self.reader)
+        self.client.post(reverse('follow_user', kwargs={'user_id': self.author.id}))
+        self.client.post(reverse('follow_user', kwargs={'user_id': self.celebrity.id}))
+        self.client.force_authenticate(user=self.fan)
+        self.client.post(reverse('follow_user', kwargs={'user_id': self.celebrity.id}))
+        self.client.force_authenticate(user=self.reader)
+
+    def create_post_as(self, user, title):
+        self.client.force_authenticate(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('create_post'), {'title': title, 'content': 'x'}, format='json')
+        self.client.force_authenticate(user=self.reader)
+        return response.data['id']
+
+    def feed_ids(self):
+        response = self.client.get(reverse('home_feed'))
+        return [item['id'] for item in response.data['results']]
+
+    def test_create_post_fans_out_to_followers(self):
+        post_id = self.create_post_as(self.author, 'Fanned out')
+        self.assertTrue(TimelineEntry.objects.filter(owner=self.reader, post_id=post_id).exists())
+        self.assertEqual(self.feed_ids(), [post_id])
+
+    def test_celebrity_posts_are_merged_at_read_time(self):
+        author_post = self.create_post_as(self.author, 'Regular')
+        celebrity_post = self.create_post_as(self.celebrity, 'Celebrity')
+        self.assertFalse(TimelineEntry.objects.filter(post_id=celebrity_post).exists())
+        self.assertEqual(self.feed_ids(), [celebrity_post, author_post])
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        other = User.objects.create(name='Other', email='other@example.com', password_hash='hashedpassword')
+        old_post = Post.objects.create(user=other, title='Old', content='x')
+
+        self.client.post(reverse('follow_user', kwargs={'user_id': other.id}))
+        self.assertEqual(self.feed_ids(), [old_post.id])
+
+        self.client.delete(reverse('unfollow_user', kwargs={'user_id': other.id}))
+        self.assertEqual(self.feed_ids(), [])
+
+    def test_posts_of_deleted_authors_are_hidden(self):
+        self.create_post_as(self.author, 'Author deleted later')
+        self.author.deleted_at = timezone.now()
+        self.author.save()
+        self.assertEqual(self.feed_ids(), [])
+
+    def test_fan_out_failure_does_not_fail_the_request(self):
+        self.client.force_authenticate(user=self.author)
+        with mock.patch('api.post.views.fan_out_post', side_effect=DatabaseError('fan-out failed')):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('create_post'), {'title': 'Saved', 'content': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Post.objects.filter(id=response.data['id']).exists())
+
+    def test_deleted_post_is_removed_from_timelines(self):
+        post_id = self.create_post_as(self.author, 'Soon deleted')
+        self.client.force_authenticate(user=self.author)
+        self.client.delete(reverse('post_detail_operations', kwargs={'post_id': post_id}))
+        self.assertFalse(TimelineEntry.objects.filter(post_id=post_id).exists())
+
+
+class CreatePostsBatchTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Importer', email='importer@example.com', password_hash='hashedpassword')
+        self.url = reverse('create_posts_batch')
+        self.client.force_authenticate(user=self.user)
+
+    def test_creates_all_posts(self):
+        data = [{'title': f'Post {i}', 'content': 'Imported'} for i in range(3)]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Post.objects.filter(user=self.user).count(), 3)
+        self.assertEqual([r['status'] for r in response.data['results']], ['created'] * 3)
+        self.assertEqual(response.data['results'][1]['post']['title'], 'Post 1')
+
+    def test_reports_per_item_errors(self):
+        data = [
+            {'title': 'Valid', 'content': 'Imported'},
+            {'title': '', 'content': 'Imported'},
+            'not an object',
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data['results']
+        self.assertEqual(results[0]['status'], 'created')
+        self.assertIn('title', results[1]['errors'])
+        self.assertEqual(results[2]['status'], 'error')
+        self.assertEqual(Post.objects.filter(user=self.user).count(), 1)
+
+    def test_all_invalid(self):
+        response = self.client.post(self.url, [{'title': 'No content'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
+
+    def test_rejects_non_list_and_oversized_batches(self):
+        response = self.client.post(self.url, {'title': 'x', 'content': 'y'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.settings(POST_BATCH_MAX_SIZE=2):
+            data = [{'title': 'x', 'content': 'y'}] * 3
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
+
+    def test_batch_uses_a_single_insert(self):
+        data = [{'title': f'Post {i}', 'content': 'Imported'} for i in range(20)]
+        with self.assertNumQueries(4):  # savepoint, bulk insert, post_count update, release
+            self.client.post(self.url, data, format='json')
+
+
+class PostCounterTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Writer', email='writer@example.com', password_hash='hashedpassword')
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_batch_and_delete_update_post_count(self):
+        response = self.client.post(reverse('create_post'), {'title': 'One', 'content': 'x'}, format='json')
+        self.client.post(reverse('create_posts_batch'), [{'title': 'Two', 'content': 'x'}, {'title': 'Three', 'content': 'x'}], format='json')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.post_count, 3)
+
+        self.client.delete(reverse('post_detail_operations', kwargs={'post_id': response.data['id']}))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.post_count, 2)
+
+    def test_profile_exposes_counts(self):
+        response = self.client.get(reverse('user_detail_operations', kwargs={'user_id': self.user.id}))
+        self.assertEqual(response.data['post_count'], 0)
+        self.assertIn('follower_count', response.data)
+        self.assertIn('following_count', response.data)
+
+
+class ConditionalRequestTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Owner', email='owner@example.com', password_hash='hashedpassword')
+        self.post = Post.objects.create(user=self.user, title='Cached', content='Content')
+        self.post_url = reverse('post_detail_operations', kwargs={'post_id': self.post.id})
+        self.user_url = reverse('user_detail_operations', kwargs={'user_id': self.user.id})
+        self.client.force_authenticate(user=self.user)
+
+    def test_post_if_none_match_returns_304_without_body(self):
+        response = self.client.get(self.post_url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.post_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_post_if_modified_since(self):
+        response = self.client.get(self.post_url)
+        response = self.client.get(self.post_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_post_etag_changes_after_update(self):
+        etag = self.client.get(self.post_url)['ETag']
+        self.client.patch(self.post_url, {'title': 'Changed'}, format='json')
+        response = self.client.get(self.post_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_post_patch_if_match(self):
+        etag = self.client.get(self.post_url)['ETag']
+        response = self.client.patch(self.post_url, {'title': 'First'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.patch(self.post_url, {'title': 'Stale'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'First')
+
+    def test_user_conditional_get_and_patch(self):
+        etag = self.client.get(self.user_url)['ETag']
+        response = self.client.get(self.user_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.patch(self.user_url, {'name': 'Renamed'}, format='json', HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_counter_change_invalidates_user_etag(self):
+        etag = self.client.get(self.user_url)['ETag']
+        self.client.post(reverse('create_post'), {'title': 'New', 'content': 'x'}, format='json')
+        response = self.client.get(self.user_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': True, 'CACHE_ALIAS': 'default', 'TIMEOUT': 300})
+class ResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        response_cache_stats.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(name='Author', email='author@example.com', password_hash='hashedpassword')
+        self.post = Post.objects.create(user=self.user, title='Cached', content='Content')
+        self.list_url = reverse('list_user_posts', kwargs={'user_id': self.user.id})
+        self.detail_url = reverse('post_detail_operations', kwargs={'post_id': self.post.id})
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_url)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(response_cache_stats.stats()['hit_ratio'], 0.5)
+
+    def test_lookups_are_exported_to_prometheus(self):
+        def lookups(result):
+            return REGISTRY.get_sample_value('api_response_cache_lookups_total', {'result': result}) or 0
+
+        hits, misses = lookups('hit'), lookups('miss')
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        self.assertEqual(lookups('hit') - hits, 1)
+        self.assertEqual(lookups('miss') - misses, 1)
+
+    def test_pages_are_cached_separately(self):
+        full = self.client.get(self.list_url)
+        paged = self.client.get(self.list_url, {'page_size': 1})
+        self.assertIsInstance(full.data, list)
+        self.assertIn('results', paged.data)
+
+    def test_writes_invalidate_the_author(self):
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+
+        self.client.post(reverse('create_post'), {'title': 'New', 'content': 'x'}, format='json')
+        self.assertEqual(len(self.client.get(self.list_url).data), 2)
+
+        self.client.patch(self.detail_url, {'title': 'Edited'}, format='json')
+        self.assertEqual(self.client.get(self.detail_url).data['title'], 'Edited')
+
+        self.client.delete(self.detail_url)
+        self.assertEqual(len(self.client.get(self.list_url).data), 1)
+
+    def test_other_authors_are_not_invalidated(self):
+        other = User.objects.create(name='Other', email='other@example.com', password_hash='hashedpassword')
+        other_url = reverse('list_user_posts', kwargs={'user_id': other.id})
+        self.client.get(other_url)
+        self.client.post(reverse('create_post'), {'title': 'New', 'content': 'x'}, format='json')
+        with self.assertNumQueries(0):
+            self.client.get(other_url)
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches_setting = {
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'files': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+            }
+            with self.settings(CACHES=caches_setting, RESPONSE_CACHE={'ENABLED': True, 'CACHE_ALIAS': 'files'}):
+                self.client.get(self.list_url)
+                with self.assertNumQueries(0):
+                    self.client.get(self.list_url)
+                self.client.post(reverse('create_post'), {'title': 'New', 'content': 'x'}, format='json')
+                self.assertEqual(len(self.client.get(self.list_url).data), 2)
+
+
+class PostReadPathTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Reader', email='reader@example.com', password_hash='hashedpassword')
+        self.author = User.objects.create(name='Author', email='author@example.com', password_hash='hashedpassword')
+        for i, image_url in enumerate([None, '', 'http://example.com/image.jpg']):
+            Post.objects.create(user=self.author, title=f'Post {i}', content='Content', image_url=image_url)
+        self.client.force_authenticate(user=self.user)
+
+    def test_fast_path_matches_post_serializer(self):
+        posts = Post.objects.filter(user=self.author).order_by('-created_at')
+        expected = PostSerializer(posts, many=True).data
+        self.assertEqual(serialize_post_rows(posts.values(*POST_ROW_FIELDS)), expected)
+
+    def test_list_user_posts_query_count_is_constant(self):
+        url = reverse('list_user_posts', kwargs={'user_id': self.author.id})
+        with self.assertNumQueries(2):  # the user lookup and the posts with their author joined
+            response = self.client.get(url)
+        self.assertEqual(response.data[0]['user'], {'id': self.author.id, 'name': 'Author'})
+
+    def test_benchmark_command_reports_identical_output(self):
+        out = StringIO()
+        call_command('benchmark_post_serialization', '--posts', '50', '--repeat', '1', stdout=out)
+        self.assertIn('Identical output', out.getvalue())
+        self.assertEqual(Post.objects.count(), 3)
+
+
+class AsyncReadViewsTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.factory = AsyncRequestFactory()
+        self.user = User.objects.create(name='Async Reader', email='async@example.com', password_hash='hashedpassword')
+        self.posts = [
+            Post.objects.create(user=self.user, title=f'Async {i}', content='Content', image_url='http://example.com/a.jpg')
+            for i in range(3)
+        ]
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url, **headers):
+        return self.factory.get(url, headers={'Authorization': f'Bearer {self.token}', **headers})
+
+    async def test_post_detail_matches_sync_view(self):
+        url = reverse('post_detail_operations', kwargs={'post_id': self.posts[0].id})
+        response = await async_views.post_detail_operations(self.get(url), post_id=self.posts[0].id)
+        expected = await sync_to_async(self.client.get)(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response['ETag'], expected['ETag'])
+
+        not_modified = await async_views.post_detail_operations(
+            self.get(url, **{'If-None-Match': response['ETag']}), post_id=self.posts[0].id
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        missing = await async_views.post_detail_operations(self.get(url), post_id=999)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_list_user_posts_matches_sync_view(self):
+        url = reverse('list_user_posts', kwargs={'user_id': self.user.id})
+        for query in ('', '?page_size=2'):
+            response = await async_views.list_user_posts(self.get(url + query), user_id=self.user.id)
+            expected = await sync_to_async(self.client.get)(url + query)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(response.content), expected.json())
+
+        invalid = await async_views.list_user_posts(self.get(url + '?cursor=bogus'), user_id=self.user.id)
+        self.assertEqual(invalid.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_requires_authentication(self):
+        url = reverse('post_detail_operations', kwargs={'post_id': self.posts[0].id})
+        response = await async_views.post_detail_operations(self.factory.get(url), post_id=self.posts[0].id)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+        response = await async_views.post_detail_operations(
+            self.factory.get(url, headers={'Authorization': 'Bearer not-a-token'}), post_id=self.posts[0].id
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_other_methods_use_sync_view(self):
+        url = reverse('post_detail_operations', kwargs={'post_id': self.posts[0].id})
+        request = self.factory.delete(url, headers={'Authorization': f'Bearer {self.token}'})
+        response = await async_views.post_detail_operations(request, post_id=self.posts[0].id)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(await Post.objects.filter(id=self.posts[0].id, deleted_at__isnull=True).aexists())
+
+
+class SearchPostsTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Searcher', email='searcher@example.com', password_hash='hashedpassword')
+        self.client.force_authenticate(user=self.user)
+
+        self.title_match = Post.objects.create(user=self.user, title='Django tips', content='Short notes')
+        self.content_match = Post.objects.create(user=self.user, title='Weekly notes', content='Some django tips')
+        self.both_words = Post.objects.create(user=self.user, title='Django and postgres', content='postgres search')
+        self.unrelated = Post.objects.create(user=self.user, title='Cooking', content='Pasta recipes')
+        self.deleted = Post.objects.create(user=self.user, title='Django deleted', content='x', deleted_at=timezone.now())
+        self.url = reverse('search_posts')
+
+    def search(self, q, **params):
+        return self.client.get(self.url, {'q': q, **params})
+
+    def test_ranks_title_matches_first_and_skips_deleted(self):
+        response = self.search('django')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(set(ids), {self.title_match.id, self.content_match.id, self.both_words.id})
+        self.assertEqual(ids[-1], self.content_match.id)
+        self.assertNotIn('rank', response.data['results'][0])
+
+    def test_every_term_must_match(self):
+        response = self.search('django postgres')
+        self.assertEqual([item['id'] for item in response.data['results']], [self.both_words.id])
+
+    def test_patched_post_is_found_by_new_content(self):
+        url = reverse('post_detail_operations', kwargs={'post_id': self.unrelated.id})
+        self.client.patch(url, {'content': 'Now about django'}, format='json')
+        ids = [item['id'] for item in self.search('django').data['results']]
+        self.assertIn(self.unrelated.id, ids)
+
+    def test_walks_pages_without_duplicates(self):
+        expected = [item['id'] for item in self.search('django').data['results']]
+        response = self.search('django', page_size=1)
+        seen = []
+        while True:
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, expected)
+
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([item['id'] for item in response.data['results']], expected[1:2])
+
+    def test_requires_query(self):
+        response = self.search('  ')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor(self):
+        response = self.search('django', cursor='not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PostPartitionsTestCase(APITestCase):
+    def test_partition_names_and_bounds(self):
+        self.assertEqual(partitions.partition_name(date(2024, 5, 1)), 'posts_p2024_05')
+        self.assertEqual(partitions.add_months(date(2024, 11, 1), 3), date(2025, 2, 1))
+        self.assertEqual(partitions.add_months(date(2024, 1, 1), -1), date(2023, 12, 1))
+        self.assertEqual(
+            partitions.parse_bounds("FOR VALUES FROM ('2024-05-01 00:00:00') TO ('2024-06-01 00:00:00')"),
+            (date(2024, 5, 1), date(2024, 6, 1)),
+        )
+        self.assertEqual(
+            partitions.parse_bounds("FOR VALUES FROM (MINVALUE) TO ('2024-06-01 00:00:00')"),
+            (None, date(2024, 6, 1)),
+        )
+
+    def test_plans_future_partitions_after_existing_ones(self):
+        existing = {'posts_legacy': (None, date(2024, 6, 1))}
+        months = partitions.plan_partitions(existing, date(2024, 5, 20), months_ahead=2)
+        self.assertEqual(months, [date(2024, 6, 1), date(2024, 7, 1)])
+        self.assertEqual(partitions.plan_partitions({}, date(2024, 5, 20), months_ahead=0), [date(2024, 5, 1)])
+
+    def test_plans_detaching_expired_partitions_oldest_first(self):
+        existing = {
+            'posts_p2024_03': (date(2024, 3, 1), date(2024, 4, 1)),
+            'posts_legacy': (None, date(2024, 3, 1)),
+            'posts_p2024_04': (date(2024, 4, 1), date(2024, 5, 1)),
+        }
+        today = date(2024, 6, 15)
+        self.assertEqual(partitions.plan_detach(existing, today, 2), ['posts_legacy', 'posts_p2024_03'])
+        self.assertEqual(partitions.plan_detach(existing, today, 0), [])
+
+    @skipIf(connection.vendor == 'postgresql', 'post_locations only exists once the table is converted.')
+    def test_id_lookup_is_unchanged_outside_postgresql(self):
+        user = User.objects.create(name='Author', email='author@example.com', password_hash='hashedpassword')
+        post = Post.objects.create(user=user, title='Title', content='Content')
+        with override_settings(POST_PARTITIONING={'ENABLED': True}):
+            self.assertEqual(list(partitions.by_id(Post.objects.all(), post.id)), [post])
+
+
+class JSONRendererParserTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Renderer', email='renderer@example.com', password_hash='hashedpassword')
+        self.client.force_authenticate(user=self.user)
+
+    def sample(self):
+        london = zoneinfo.ZoneInfo('Europe/London')
+        return {
+            'utc': datetime(2024, 1, 1, 12, 30, tzinfo=dt_timezone.utc),
+            'utc_micro': datetime(2024, 1, 1, 12, 30, 0, 4500, tzinfo=zoneinfo.ZoneInfo('UTC')),
+            'london_winter': datetime(2024, 1, 1, tzinfo=london),
+            'london_summer': datetime(2024, 7, 1, tzinfo=london),
+            'naive': datetime(2024, 1, 1, 8, 0, 0, 1),
+            'date': date(2024, 2, 29),
+            'time': time(23, 59, 59, 999999),
+            'duration': timedelta(hours=1, milliseconds=5),
+            'decimal': Decimal('12.50'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Not found.'),
+            'text': 'Ünïcödé \u2028 and \u2029 "quoted" \\ </script>',
+            'numbers': [0, -1, 2 ** 63 - 1, 2 ** 64 - 1, 0.1, 1.5, -0.0, True, False, None],
+            'big': 2 ** 70,
+            'nested': ({'a': [1, (2, 3)]}, []),
+            1: 'integer key',
+        }
+
+    def test_renders_same_bytes_as_drf(self):
+        data = self.sample()
+        self.assertEqual(JSONRenderer().render(data), renderers.JSONRenderer().render(data))
+
+        data.pop('big')
+        with mock.patch('orjson.dumps', wraps=orjson.dumps) as dumps:
+            self.assertEqual(JSONRenderer().render(data), renderers.JSONRenderer().render(data))
+        self.assertEqual(dumps.call_count, 1)
+
+    def test_indent_and_disabled_fall_back_to_drf(self):
+        data = self.sample()
+        for media_type in ('application/json; indent=4', 'application/json; indent=2'):
+            self.assertEqual(
+                JSONRenderer().render(data, media_type), renderers.JSONRenderer().render(data, media_type),
+            )
+        with override_settings(FAST_JSON={'ENABLED': False}), mock.patch('orjson.dumps') as dumps:
+            self.assertEqual(JSONRenderer().render(data), renderers.JSONRenderer().render(data))
+        dumps.assert_not_called()
+        self.assertEqual(JSONRenderer().render(None), b'')
+
+    def test_unsupported_values_raise_like_drf(self):
+        for value in (float('nan'), object(), time(12, tzinfo=dt_timezone.utc)):
+            with self.assertRaises((TypeError, ValueError)) as expected:
+                renderers.JSONRenderer().render({'value': value})
+            if isinstance(value, float):
+                # orjson writes NaN as null instead of refusing it.
+                continue
+            with self.assertRaises(type(expected.exception)) as raised:
+                JSONRenderer().render({'value': value})
+            self.assertEqual(str(raised.exception), str(expected.exception))
+
+    def test_parses_like_drf(self):
+        for body in (
+            b'{"title": "\\u00fcber", "content": "\xc3\xbcber \\ud83d\\ude00", "tags": [1, 2.5, -0.0, null, true]}',
+            b'{"id": 123456789012345678901234567890}',
+            b'[1e400]',
+            b'{"a": 1, "a": 2}',
+        ):
+            self.assertEqual(self.parse(JSONParser(), body), self.parse(parsers.JSONParser(), body))
+
+    def test_invalid_json_fails_with_drf_message(self):
+        for body in (b'', b'{"title": ', b'NaN', b'{"bad": "\\ud800"', b'\xef\xbb\xbf{}'):
+            with self.assertRaises(ParseError) as expected:
+                self.parse(parsers.JSONParser(), body)
+            with self.assertRaises(ParseError) as raised:
+                self.parse(JSONParser(), body)
+            self.assertEqual(str(raised.exception), str(expected.exception))
+
+    @staticmethod
+    def parse(parser, body):
+        return parser.parse(BytesIO(body), 'application/json', {'encoding': 'utf-8'})
+
+    def test_views_use_the_fast_renderer_and_parser(self):
+        response = self.client.post(
+            reverse('create_post'), {'title': 'Fast \u2028 JSON', 'content': 'Content'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(reverse('list_user_posts', kwargs={'user_id': self.user.id}))
+        self.assertIsInstance(response.accepted_renderer, JSONRenderer)
+        self.assertEqual(response.content, renderers.JSONRenderer().render(response.data))
+        self.assertIn(b'Fast \\u2028 JSON', response.content)
+
+    def test_benchmark_command_reports_identical_output(self):
+        out = StringIO()
+        call_command('benchmark_json', '--posts', '20', '--iterations', '2', '--repeat', '1', stdout=out)
+        self.assertIn('Identical output', out.getvalue())
@@ -0,0 +1,137 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from api.social.models import Follow
+from api.user.models import User
+from . import partitions
+from .models import Post, TimelineEntry
+
+CELEBRITY_CACHE_KEY = 'timeline:celebrity_ids'
+
+
+def get_config():
+    config = {
+        'MODE': 'read',
+        'FANOUT_MAX_FOLLOWERS': 10000,
+        'BACKFILL_SIZE': 50,
+        'BATCH_SIZE': 1000,
+        'CELEBRITY_CACHE_TIMEOUT': 300,
+    }
+    config.update(getattr(settings, 'TIMELINE', {}))
+    return config
+
+
+def is_materialized():
+    return get_config()['MODE'] == 'write'
+
+
+def is_celebrity(user_id):
+    return User.objects.filter(
+        id=user_id,
+        follower_count__gte=get_config()['FANOUT_MAX_FOLLOWERS'],
+    ).exists()
+
+
+def get_celebrity_ids():
+    """
+    Ids of authors whose posts are merged at read time instead of fanned out.
+    The set is small and changes slowly, so it is cached rather than
+    recounted on every timeline read.
+    """
+    celebrity_ids = cache.get(CELEBRITY_CACHE_KEY)
+    if celebrity_ids is None:
+        config = get_config()
+        celebrity_ids = list(
+            User.objects.filter(follower_count__gte=config['FANOUT_MAX_FOLLOWERS']).values_list('id', flat=True)
+        )
+        cache.set(CELEBRITY_CACHE_KEY, celebrity_ids, config['CELEBRITY_CACHE_TIMEOUT'])
+    return celebrity_ids
+
+
+def fan_out_post(post):
+    """Push a newly created post into the timeline of every follower."""
+    fan_out_posts(post.user_id, [post])
+
+
+def fan_out_posts(author_id, posts):
+    """Push several new posts by the same author with one follower scan."""
+    if not posts or not is_materialized() or is_celebrity(author_id):
+        return
+
+    batch_size = get_config()['BATCH_SIZE']
+    follower_ids = Follow.objects.filter(following_id=author_id).values_list('follower_id', flat=True)
+    batch = []
+    for follower_id in follower_ids.iterator(chunk_size=batch_size):
+        for post in posts:
+            batch.append(TimelineEntry(owner_id=follower_id, post=post, author_id=author_id, created_at=post.created_at))
+        if len(batch) >= batch_size:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def remove_post(post):
+    """Drop a (soft-)deleted post from every timeline it was pushed to."""
+    if not is_materialized():
+        return
+    TimelineEntry.objects.filter(post=post).delete()
+
+
+def backfill(follower, author):
+    """Copy the author's most recent posts into a new follower's timeline."""
+    if not is_materialized() or is_celebrity(author.id):
+        return
+
+    recent = Post.objects.filter(user=author, deleted_at__isnull=True).order_by('-created_at', '-id')
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(owner=follower, post_id=post_id, author=author, created_at=created_at)
+            for post_id, created_at in recent.values_list('id', 'created_at')[:get_config()['BACKFILL_SIZE']]
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def prune(follower, author):
+    """Remove an unfollowed author's posts from the follower's timeline."""
+    prune_authors(follower, [author.id])
+
+
+def prune_authors(follower, author_ids):
+    """Remove the posts of several unfollowed authors in one statement."""
+    if not author_ids or not is_materialized():
+        return
+    TimelineEntry.objects.filter(owner=follower, author_id__in=author_ids).delete()
+
+
+def paginate_timeline(paginator, request):
+    """
+    Read a page of the materialized timeline, merging in posts from followed
+    celebrities that were not fanned out.
+    """
+    user = request.user
+    # Soft-deleting an account leaves its entries in place; they are skipped
+    # here, as in the read-time feed.
+    entries = TimelineEntry.objects.filter(
+        owner=user,
+        post__user__deleted_at__isnull=True,
+    ).select_related('post__user')
+    if partitions.is_enabled(entries.db):
+        # Entries copy the post's created_at; joining on it as well prunes
+        # the posts partitions probed for each entry.
+        entries = entries.filter(post__created_at=F('created_at'))
+    sources = [(entries, 'post_id')]
+
+    celebrity_ids = get_celebrity_ids()
+    if celebrity_ids:
+        followed = Follow.objects.filter(follower=user, following_id__in=celebrity_ids).values('following_id')
+        celebrity_posts = Post.objects.filter(
+            user_id__in=followed,
+            user__deleted_at__isnull=True,
+            deleted_at__isnull=True,
+        ).select_related('user')
+        sources.append((celebrity_posts, 'id'))
+
+    rows = paginator.paginate_sources(sources, request)
+    return [row.post if isinstance(row, TimelineEntry) else row for row in rows]
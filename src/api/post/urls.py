@@ -1,9 +1,15 @@
 
 from django.urls import path
-from . import views
+from api.async_api import is_enabled as async_views_enabled
+from . import views, async_views
+
+read_views = async_views if async_views_enabled() else views
 
 urlpatterns = [
    path('posts/', views.create_post, name='create_post'),
-   path('users/<int:user_id>/posts/', views.list_user_posts, name='list_user_posts'),
-   path('posts/<int:post_id>/', views.post_detail_operations, name='post_detail_operations')
+   path('posts/batch/', views.create_posts_batch, name='create_posts_batch'),
+   path('posts/search/', views.search_posts, name='search_posts'),
+   path('users/<int:user_id>/posts/', read_views.list_user_posts, name='list_user_posts'),
+   path('feed/', views.home_feed, name='home_feed'),
+   path('posts/<int:post_id>/', read_views.post_detail_operations, name='post_detail_operations')
 ]
\ No newline at end of file
@@ -3,21 +3,42 @@ from rest_framework import status
 from django.utils import timezone
 
 from .serializers.serializers import PostSerializer
+from .timeline import remove_post
+from . import response_cache
+from api.conditional import evaluate_preconditions, set_validators
+from api.user.counters import adjust_counter
+from django.db import transaction
 
 
 def handle_get_post(request, post):
-    serializer = PostSerializer(post)
-    return Response(serializer.data)
+    not_modified = evaluate_preconditions(request, post)
+    if not_modified:
+        return not_modified
+
+    if not response_cache.is_enabled():
+        return set_validators(Response(PostSerializer(post).data), post)
+
+    cache_key = response_cache.detail_key(post)
+    data = response_cache.get_cached(cache_key)
+    if data is None:
+        data = PostSerializer(post).data
+        response_cache.set_cached(cache_key, data)
+    return set_validators(Response(data), post)
 
 def handle_patch_post(request, post):
     if post.user != request.user:
         return Response({"detail": "You do not have permission to edit this post."}, status=status.HTTP_403_FORBIDDEN)
 
+    precondition_failed = evaluate_preconditions(request, post)
+    if precondition_failed:
+        return precondition_failed
+
     serializer = PostSerializer(post, data=request.data, partial=True)
     if serializer.is_valid():
         try:
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            response_cache.bump_posts_version(post.user_id)
+            return set_validators(Response(serializer.data, status=status.HTTP_200_OK), post)
         except Exception as e:
             return Response({"detail": "An unexpected error occurred while updating the post."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -26,8 +47,12 @@ def handle_delete_post(request, post):
     if post.user != request.user:
         return Response({"detail": "You do not have permission to delete this post."}, status=status.HTTP_403_FORBIDDEN)
 
-    post.deleted_at = timezone.now()
-    post.save()
+    with transaction.atomic():
+        post.deleted_at = timezone.now()
+        post.save()
+        adjust_counter(post.user_id, 'post_count', -1)
+    response_cache.bump_posts_version(post.user_id)
+    remove_post(post)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -1,13 +1,23 @@
 from rest_framework.decorators import api_view, permission_classes, parser_classes, authentication_classes
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import JSONParser
-from .serializers.serializers import PostSerializer
+from api.parsers import JSONParser
+from django.conf import settings
+from django.db import transaction
+from .serializers.serializers import POST_ROW_FIELDS, PostSerializer, serialize_post_rows
 from .models import Post
+from .pagination import KeysetPagination, SearchPagination
+from .search import search
+from .partitions import by_id
 from api.user.models import User
+from api.social.models import Follow
+from api.user.counters import adjust_counter
 
 from .utils import METHOD_HANDLERS
+from . import response_cache
+from .timeline import fan_out_post, fan_out_posts, is_materialized, paginate_timeline
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
@@ -51,7 +61,13 @@ def create_post(request):
     if serializer.is_valid():
 
         try:
-            serializer.save(user=request.user)
+            with transaction.atomic():
+                post = serializer.save(user=request.user)
+                adjust_counter(request.user.id, 'post_count', 1)
+                # The post is saved either way, so a failed fan-out is logged
+                # instead of turning the response into an error.
+                transaction.on_commit(lambda: fan_out_post(post), robust=True)
+            response_cache.bump_posts_version(request.user.id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except Exception as e:
             return Response({"detail": "An unexpected error occurred while creating the post."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -59,9 +75,91 @@ def create_post(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@extend_schema(
+    summary="Create posts in batch",
+    description="Creates several posts for the authenticated user in a single transaction. The request body is a list "
+                "of posts; each item is validated like a single post and the response lists one result per item, in "
+                "order, with either the created post or its validation errors.",
+    request=PostSerializer(many=True),
+    parameters=[
+        OpenApiParameter(
+            name='Authorization',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.HEADER,
+            required=True,
+            description='Bearer authentication token. Format: "Bearer &lt;seu_token&gt;"',
+            examples=[OpenApiExample(name='Example', value='Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...')],
+        )
+    ],
+    responses={
+        201: OpenApiResponse(description="All posts created successfully."),
+        207: OpenApiResponse(description="Some posts were created; the others carry their validation errors."),
+        400: OpenApiResponse(
+            description="No post could be created, the body is not a list, or the batch exceeds the maximum size.",
+            examples=[
+                OpenApiExample(
+                    name="BatchResultExample",
+                    value={"results": [{"status": "error", "errors": {"title": ["The title cannot be blank."]}}]}
+                )
+            ]
+        ),
+        500: OpenApiResponse(description="An unexpected error occurred while creating the posts.")
+    },
+    tags=['Posts']
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser])
+def create_posts_batch(request):
+    max_size = getattr(settings, 'POST_BATCH_MAX_SIZE', 100)
+    if not isinstance(request.data, list):
+        return Response({"detail": "Expected a list of posts."}, status=status.HTTP_400_BAD_REQUEST)
+    if not request.data:
+        return Response({"detail": "The batch cannot be empty."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(request.data) > max_size:
+        return Response({"detail": f"A batch cannot contain more than {max_size} posts."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # PostSerializer(many=True) rejects the whole list as soon as one item
+    # fails, so its child is run per item to keep the valid ones.
+    batch_serializer = PostSerializer(many=True)
+    new_posts, item_errors = [], []
+    for item in request.data:
+        try:
+            validated = batch_serializer.child.run_validation(item)
+        except ValidationError as exc:
+            item_errors.append(exc.detail)
+            continue
+        new_posts.append(Post(user=request.user, **validated))
+        item_errors.append(None)
+
+    try:
+        with transaction.atomic():
+            created = Post.objects.bulk_create(new_posts)
+            adjust_counter(request.user.id, 'post_count', len(created))
+            transaction.on_commit(lambda: fan_out_posts(request.user.id, created), robust=True)
+        response_cache.bump_posts_version(request.user.id)
+    except Exception as e:
+        return Response({"detail": "An unexpected error occurred while creating the posts."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    created_data = iter(PostSerializer(created, many=True).data)
+    results = [
+        {"status": "error", "errors": errors} if errors else {"status": "created", "post": next(created_data)}
+        for errors in item_errors
+    ]
+
+    if not created:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif len(created) < len(results):
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_201_CREATED
+    return Response({"results": results}, status=response_status)
+
+
 @extend_schema(
     summary="List posts by a specific user",
-    description="Retrieves all non-deleted posts created by a specific user, ordered by creation date (newest first).",
+    description="Retrieves all non-deleted posts created by a specific user, ordered by creation date (newest first). "
+                "Passing 'cursor' or 'page_size' switches to cursor pagination and returns a page with 'next'/'previous' links.",
     parameters=[
         OpenApiParameter(
             name='user_id',
@@ -70,6 +168,20 @@ def create_post(request):
             type=OpenApiTypes.INT,
             location=OpenApiParameter.PATH
         ),
+        OpenApiParameter(
+            name='cursor',
+            description='Opaque cursor taken from the "next" or "previous" link of a previous page.',
+            required=False,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY
+        ),
+        OpenApiParameter(
+            name='page_size',
+            description='Number of posts per page (capped by the server).',
+            required=False,
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY
+        ),
         OpenApiParameter(
             name='Authorization',
             type=OpenApiTypes.STR,
@@ -82,16 +194,23 @@ def create_post(request):
     responses={
         200: OpenApiResponse(
             response=PostSerializer(many=True),
-            description="A list of posts by the specified user."
+            description="A list of posts by the specified user, or a page of them when paginating."
         ),
         400: OpenApiResponse(description="Invalid user ID format."),
-        404: OpenApiResponse(description="User not found.")
+        404: OpenApiResponse(description="User not found or invalid cursor.")
     },
     tags=['Posts']
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_user_posts(request, user_id: int):
+    use_cache = response_cache.is_enabled()
+    if use_cache:
+        cache_key = response_cache.list_key(user_id, request)
+        data = response_cache.get_cached(cache_key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
     try:
         user = User.objects.get(id=user_id)
     except User.DoesNotExist:
@@ -99,10 +218,143 @@ def list_user_posts(request, user_id: int):
     except ValueError:
         return Response({"detail": "Invalid user ID format."}, status=status.HTTP_400_BAD_REQUEST)
 
-    posts = Post.objects.filter(user=user, deleted_at__isnull=True).order_by('-created_at')
+    posts = Post.objects.filter(user=user, deleted_at__isnull=True).values(*POST_ROW_FIELDS)
+
+    if KeysetPagination.is_requested(request):
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(posts, request)
+        data = paginator.get_paginated_response(serialize_post_rows(page)).data
+    else:
+        data = serialize_post_rows(posts.order_by('-created_at'))
+
+    if use_cache:
+        response_cache.set_cached(cache_key, data)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    summary="Home feed",
+    description="Returns the non-deleted posts of every user the authenticated user follows, merged newest first "
+                "and paginated by cursor.",
+    parameters=[
+        OpenApiParameter(
+            name='cursor',
+            description='Opaque cursor taken from the "next" or "previous" link of a previous page.',
+            required=False,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY
+        ),
+        OpenApiParameter(
+            name='page_size',
+            description='Number of posts per page (capped by the server).',
+            required=False,
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY
+        ),
+        OpenApiParameter(
+            name='Authorization',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.HEADER,
+            required=True,
+            description='Bearer authentication token. Format: "Bearer &lt;seu_token&gt;"',
+            examples=[OpenApiExample(name='Example', value='Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...')],
+        )
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=PostSerializer(many=True),
+            description="A page of posts from followed users."
+        ),
+        404: OpenApiResponse(description="Invalid cursor.")
+    },
+    tags=['Posts']
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def home_feed(request):
+    paginator = KeysetPagination()
+
+    if is_materialized():
+        page = paginate_timeline(paginator, request)
+        serializer = PostSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    # One query regardless of how many accounts are followed: the follow
+    # list stays in the database as a subquery instead of being expanded
+    # into an IN list. posts_live_created_idx lets the page walk recent
+    # posts and stop once it is full instead of sorting every post of
+    # every followed account.
+    following_ids = Follow.objects.filter(follower=request.user).values('following_id')
+    posts = Post.objects.filter(
+        user_id__in=following_ids,
+        user__deleted_at__isnull=True,
+        deleted_at__isnull=True,
+    ).values(*POST_ROW_FIELDS)
+
+    page = paginator.paginate_queryset(posts, request)
+    return paginator.get_paginated_response(serialize_post_rows(page))
+
+
+@extend_schema(
+    summary="Search posts",
+    description="Full-text search over the title and content of non-deleted posts. Title matches rank above "
+                "content matches; results are ordered by rank (best first) and paginated by cursor. 'q' accepts "
+                "web search syntax: quoted phrases, 'or' and '-' to exclude a word.",
+    parameters=[
+        OpenApiParameter(
+            name='q',
+            description='The search query.',
+            required=True,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY
+        ),
+        OpenApiParameter(
+            name='cursor',
+            description='Opaque cursor taken from the "next" or "previous" link of a previous page.',
+            required=False,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY
+        ),
+        OpenApiParameter(
+            name='page_size',
+            description='Number of posts per page (capped by the server).',
+            required=False,
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY
+        ),
+        OpenApiParameter(
+            name='Authorization',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.HEADER,
+            required=True,
+            description='Bearer authentication token. Format: "Bearer &lt;seu_token&gt;"',
+            examples=[OpenApiExample(name='Example', value='Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...')],
+        )
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=PostSerializer(many=True),
+            description="A page of matching posts, best match first."
+        ),
+        400: OpenApiResponse(description="Missing search query."),
+        404: OpenApiResponse(description="Invalid cursor.")
+    },
+    tags=['Posts']
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_posts(request):
+    terms = request.query_params.get('q', '').strip()
+    if not terms:
+        return Response({"detail": "The 'q' parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+    posts = search(
+        Post.objects.filter(deleted_at__isnull=True, user__deleted_at__isnull=True), terms
+    ).values(*POST_ROW_FIELDS, 'rank')
 
-    serializer = PostSerializer(posts, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    paginator = SearchPagination()
+    page = paginator.paginate_queryset(posts, request)
+    return paginator.get_paginated_response(serialize_post_rows(page))
 
 
 @extend_schema(
@@ -132,6 +384,7 @@ def list_user_posts(request, user_id: int):
     description="Retrieves the details of an existing post by its ID.",
     responses={
         200: OpenApiResponse(response=PostSerializer, description="Detalhes do post."),
+        304: OpenApiResponse(description="Not modified: the ETag in If-None-Match (or If-Modified-Since) is still current."),
         404: OpenApiResponse(description="Post não encontrado.", response={'type': 'object', 'properties': {'detail': {'type': 'string'}}}),
         400: OpenApiResponse(description="ID do post inválido.", response={'type': 'object', 'properties': {'detail': {'type': 'string'}}})
     }
@@ -144,6 +397,7 @@ def list_user_posts(request, user_id: int):
     request=PostSerializer,
     responses={
         200: OpenApiResponse(response=PostSerializer, description="Post updated successfully."),
+        412: OpenApiResponse(description="The ETag in If-Match no longer matches the post.", response={'type': 'object', 'properties': {'detail': {'type': 'string'}}}),
         400: OpenApiResponse(description="Invalid data.", response={'type': 'object', 'properties': {'detail': {'type': 'string'}}}),
         404: OpenApiResponse(description="Post not found.", response={'type': 'object', 'properties': {'detail': {'type': 'string'}}})
     }
@@ -163,7 +417,7 @@ def list_user_posts(request, user_id: int):
 @parser_classes([JSONParser])
 def post_detail_operations(request, post_id: int):
     try:
-        post = Post.objects.get(id=post_id, deleted_at__isnull=True)
+        post = by_id(Post.objects.select_related('user'), post_id).get(deleted_at__isnull=True)
     except Post.DoesNotExist:
         return Response({"detail": "Post not found or has been deleted."}, status=status.HTTP_404_NOT_FOUND)
     except ValueError:
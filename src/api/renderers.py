@@ -0,0 +1,63 @@
+"""
+``JSONRenderer`` that encodes with orjson when it can do so with the same
+result as DRF's stdlib renderer.
+
+orjson writes compact UTF-8 like DRF's defaults (``COMPACT_JSON`` and
+``UNICODE_JSON``), formats datetimes the way DRF's ``JSONEncoder`` does
+(``Z`` for UTC, microseconds only when non-zero) and hands every type it
+does not know, Decimals included, to that encoder. Requests for indented
+output, non-default JSON settings, and data orjson rejects, such as
+integers beyond 64 bits, go through DRF's implementation unchanged.
+
+Floats are the exception. Very large or small ones are spelled differently
+(``1e16`` rather than ``1e+16``) but parse to the same value. With
+``STRICT_JSON``, DRF refuses to render NaN and infinity, while orjson
+writes them as ``null``.
+"""
+import orjson
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def get_config():
+    config = {
+        'ENABLED': True,
+    }
+    config.update(getattr(settings, 'FAST_JSON', {}))
+    return config
+
+
+def is_enabled():
+    return get_config()['ENABLED']
+
+
+encode_default = JSONEncoder().default
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            not is_enabled()
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Let DRF render it, or raise the error it would have raised.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping of U+2028 and U+2029 as DRF, keeping the output a strict
+        # JavaScript subset. Both start with the byte 0xE2, and looking for a
+        # single byte is much faster than for the sequences.
+        if b'\xe2' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
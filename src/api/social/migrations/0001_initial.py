@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-17 21:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('user', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('follower', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='following_relations', to='user.user')),
+                ('following', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='follower_relations', to='user.user')),
+            ],
+            options={
+                'db_table': 'follows',
+                'ordering': ['-created_at'],
+                'unique_together': {('follower', 'following')},
+            },
+        ),
+    ]
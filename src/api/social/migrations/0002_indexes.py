@@ -0,0 +1,25 @@
+# Generated by Django 4.2.20 on 2026-10-17 21:54
+
+from django.db import migrations, models
+
+from api.db.operations import AddIndexIfNotExists
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL.
+    atomic = False
+
+    dependencies = [
+        ('social', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexIfNotExists(
+            model_name='follow',
+            index=models.Index(fields=['following', '-created_at', '-id'], name='follows_following_created_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='follow',
+            index=models.Index(fields=['follower', '-created_at', '-id'], name='follows_follower_created_idx'),
+        ),
+    ]
@@ -2,17 +2,19 @@ from django.db import models
 from api.user.models import User
 
 class Follow(models.Model):
-    follower = models.ForeignKey(User, related_name='following_relations', on_delete=models.CASCADE)
-    following = models.ForeignKey(User, related_name='follower_relations', on_delete=models.CASCADE)
+    # Both columns lead an index below, so the default FK indexes are redundant.
+    follower = models.ForeignKey(User, related_name='following_relations', on_delete=models.CASCADE, db_index=False)
+    following = models.ForeignKey(User, related_name='follower_relations', on_delete=models.CASCADE, db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    class Meta:
-        unique_together = ('follower', 'following')
-        ordering = ['-created_at']
-
     def __str__(self):
         return f"{self.follower.name} follows {self.following.name}"
 
     class Meta:
         db_table = 'follows'
-        ordering = ['-created_at']
\ No newline at end of file
+        unique_together = ('follower', 'following')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['following', '-created_at', '-id'], name='follows_following_created_idx'),
+            models.Index(fields=['follower', '-created_at', '-id'], name='follows_follower_created_idx'),
+        ]
\ No newline at end of file
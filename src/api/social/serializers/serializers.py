@@ -1,9 +1,50 @@
+from django.conf import settings
 from rest_framework import serializers
 from ..models import Follow
+from api.user.models import User
 
 class FollowSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Follow
         fields = ['id', 'follower', 'following', 'created_at']
-        read_only_fields = ['id', 'follower', 'following', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'follower', 'following', 'created_at']
+
+
+class FollowUserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'name']
+
+
+class FollowerSerializer(serializers.ModelSerializer):
+    user = FollowUserSummarySerializer(source='follower', read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ['id', 'user', 'created_at']
+
+
+class FollowingSerializer(serializers.ModelSerializer):
+    user = FollowUserSummarySerializer(source='following', read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ['id', 'user', 'created_at']
+
+
+class BulkFollowSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        error_messages={
+            'empty': 'Provide at least one user ID.',
+        }
+    )
+
+    def validate_user_ids(self, value):
+        max_size = getattr(settings, 'FOLLOW_BULK_MAX_SIZE', 100)
+        if len(value) > max_size:
+            raise serializers.ValidationError(f'A request cannot contain more than {max_size} user IDs.')
+        # Keep the client's order for the per-id results, without repeats.
+        return list(dict.fromkeys(value))
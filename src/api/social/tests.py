@@ -0,0 +1,175 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from api.user.models import User
+from .models import Follow
+
+
+class BulkFollowTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Newcomer', email='newcomer@example.com', password_hash='hashedpassword')
+        self.others = [
+            User.objects.create(name=f'Suggested {i}', email=f'suggested{i}@example.com', password_hash='hashedpassword')
+            for i in range(3)
+        ]
+        self.follow_url = reverse('follow_users_bulk')
+        self.unfollow_url = reverse('unfollow_users_bulk')
+        self.client.force_authenticate(user=self.user)
+
+    def test_follow_many_reports_per_id_outcome(self):
+        Follow.objects.create(follower=self.user, following=self.others[0])
+        user_ids = [self.others[0].id, self.others[1].id, self.user.id, 999, self.others[2].id, self.others[1].id]
+        response = self.client.post(self.follow_url, {'user_ids': user_ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'user_id': self.others[0].id, 'status': 'already_following'},
+            {'user_id': self.others[1].id, 'status': 'followed'},
+            {'user_id': self.user.id, 'status': 'self'},
+            {'user_id': 999, 'status': 'not_found'},
+            {'user_id': self.others[2].id, 'status': 'followed'},
+        ])
+        self.assertEqual(Follow.objects.filter(follower=self.user).count(), 3)
+
+    def test_follow_many_query_count_does_not_grow_with_targets(self):
+        user_ids = [other.id for other in self.others]
+        # savepoint, follower lock, targets, existing follows, savepoint, bulk insert, release,
+        # two counter updates, release
+        with self.assertNumQueries(10):
+            self.client.post(self.follow_url, {'user_ids': user_ids}, format='json')
+
+    def test_follow_many_retries_a_conflicting_insert(self):
+        bulk_create = Follow.objects.bulk_create
+        raced = []
+
+        def race(follows):
+            # Another writer adds one of the follows after they were read.
+            # Here it shares the savepoint and is rolled back with the batch.
+            if not raced:
+                raced.append(Follow.objects.create(follower=self.user, following=self.others[1]))
+            return bulk_create(follows)
+
+        user_ids = [other.id for other in self.others]
+        with mock.patch.object(Follow.objects, 'bulk_create', side_effect=race) as insert:
+            response = self.client.post(self.follow_url, {'user_ids': user_ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(insert.call_count, 2)
+        self.assertEqual([r['status'] for r in response.data['results']], ['followed'] * 3)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.following_count, 3)
+        self.assertEqual(Follow.objects.filter(follower=self.user).count(), 3)
+
+    def test_unfollow_many(self):
+        Follow.objects.create(follower=self.user, following=self.others[0])
+        Follow.objects.create(follower=self.user, following=self.others[1])
+        user_ids = [self.others[0].id, self.others[1].id, self.others[2].id]
+        response = self.client.delete(self.unfollow_url, {'user_ids': user_ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['status'] for r in response.data['results']], ['unfollowed', 'unfollowed', 'not_following'])
+        self.assertFalse(Follow.objects.filter(follower=self.user).exists())
+
+    def test_rejects_invalid_payloads(self):
+        for payload in ({}, {'user_ids': []}, {'user_ids': ['abc']}):
+            response = self.client.post(self.follow_url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.settings(FOLLOW_BULK_MAX_SIZE=2):
+            response = self.client.post(self.follow_url, {'user_ids': [1, 2, 3]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FollowCountersTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name='Follower', email='follower@example.com', password_hash='hashedpassword')
+        self.target = User.objects.create(name='Target', email='target@example.com', password_hash='hashedpassword')
+        self.client.force_authenticate(user=self.user)
+
+    def assertCounts(self, user, followers, following):
+        user.refresh_from_db()
+        self.assertEqual((user.follower_count, user.following_count), (followers, following))
+
+    def test_follow_and_unfollow_update_counters(self):
+        self.client.post(reverse('follow_user', kwargs={'user_id': self.target.id}))
+        self.assertCounts(self.user, 0, 1)
+        self.assertCounts(self.target, 1, 0)
+
+        self.client.post(reverse('follow_user', kwargs={'user_id': self.target.id}))
+        self.assertCounts(self.target, 1, 0)
+
+        self.client.delete(reverse('unfollow_user', kwargs={'user_id': self.target.id}))
+        self.assertCounts(self.user, 0, 0)
+        self.assertCounts(self.target, 0, 0)
+
+    def test_bulk_operations_update_counters(self):
+        self.client.post(reverse('follow_users_bulk'), {'user_ids': [self.target.id, 999]}, format='json')
+        self.assertCounts(self.user, 0, 1)
+        self.assertCounts(self.target, 1, 0)
+
+        self.client.delete(reverse('unfollow_users_bulk'), {'user_ids': [self.target.id]}, format='json')
+        self.assertCounts(self.user, 0, 0)
+        self.assertCounts(self.target, 0, 0)
+
+    def test_reconcile_command_fixes_drift(self):
+        Follow.objects.create(follower=self.user, following=self.target)
+        past = timezone.now() - timedelta(days=1)
+        User.objects.filter(id=self.target.id).update(post_count=7, updated_at=past)
+        bystander = User.objects.create(name='Bystander', email='bystander@example.com', password_hash='hashedpassword')
+        User.objects.filter(id=bystander.id).update(updated_at=past)
+
+        out = StringIO()
+        call_command('reconcile_user_counters', '--batch-size', '1', stdout=out)
+
+        self.assertCounts(self.user, 0, 1)
+        self.assertCounts(self.target, 1, 0)
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.post_count, 0)
+        self.assertGreater(self.target.updated_at, past)
+        bystander.refresh_from_db()
+        self.assertEqual(bystander.updated_at, past)
+        self.assertIn('2 users fixed', out.getvalue())
+
+
+class FollowListTestCase(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.star = User.objects.create(name='Star', email='star@example.com', password_hash='hashedpassword')
+        self.fans = [
+            User.objects.create(name=f'Fan {i}', email=f'fan{i}@example.com', password_hash='hashedpassword')
+            for i in range(5)
+        ]
+        for fan in self.fans:
+            Follow.objects.create(follower=fan, following=self.star)
+        self.client.force_authenticate(user=self.fans[0])
+
+    def test_followers_are_paginated_newest_first(self):
+        url = reverse('list_followers', kwargs={'user_id': self.star.id})
+        response = self.client.get(url, {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [item['user']['name'] for item in response.data['results']]
+        self.assertEqual(names, ['Fan 4', 'Fan 3', 'Fan 2'])
+
+        response = self.client.get(response.data['next'])
+        names = [item['user']['name'] for item in response.data['results']]
+        self.assertEqual(names, ['Fan 1', 'Fan 0'])
+        self.assertIsNone(response.data['next'])
+
+    def test_following(self):
+        url = reverse('list_following', kwargs={'user_id': self.fans[0].id})
+        response = self.client.get(url)
+        self.assertEqual([item['user']['id'] for item in response.data['results']], [self.star.id])
+
+    def test_followers_page_query_count_is_constant(self):
+        url = reverse('list_followers', kwargs={'user_id': self.star.id})
+        with self.assertNumQueries(2):  # user existence check, page with authors joined
+            self.client.get(url)
+
+    def test_unknown_user(self):
+        response = self.client.get(reverse('list_followers', kwargs={'user_id': 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -2,6 +2,10 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    path('users/follow/', views.follow_users_bulk, name='follow_users_bulk'),
+    path('users/unfollow/', views.unfollow_users_bulk, name='unfollow_users_bulk'),
     path('users/<int:user_id>/follow/', views.follow_user, name='follow_user'),
-    path('users/<int:user_id>/unfollow/', views.unfollow_user, name='unfollow_user')
+    path('users/<int:user_id>/unfollow/', views.unfollow_user, name='unfollow_user'),
+    path('users/<int:user_id>/followers/', views.list_followers, name='list_followers'),
+    path('users/<int:user_id>/following/', views.list_following, name='list_following')
 ]
\ No newline at end of file
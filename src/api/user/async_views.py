@@ -0,0 +1,16 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.async_api import async_api_view
+from . import views
+from .models import User
+from .utils import handle_get_user
+
+
+@async_api_view(views.user_detail_operations)
+async def user_detail_operations(request, user_id: int):
+    try:
+        user = await User.objects.aget(id=user_id, deleted_at__isnull=True)
+    except User.DoesNotExist:
+        return Response({"detail": "User not found or has been deleted."}, status=status.HTTP_404_NOT_FOUND)
+    return handle_get_user(request, user)
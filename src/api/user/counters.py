@@ -0,0 +1,22 @@
+from django.db.models import F
+from django.utils import timezone
+
+from .models import User
+
+COUNTER_FIELDS = ('follower_count', 'following_count', 'post_count')
+
+
+def adjust_counter(user_ids, field, delta):
+    """
+    Atomically add ``delta`` to a denormalized counter for the given users.
+    The arithmetic happens in the UPDATE itself, so concurrent requests never
+    overwrite each other's increments. ``updated_at`` is bumped as well since
+    the counters are part of the user's representation.
+    """
+    if field not in COUNTER_FIELDS:
+        raise ValueError(f'Unknown counter field: {field}')
+    if not delta:
+        return
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+    User.objects.filter(id__in=user_ids).update(**{field: F(field) + delta, 'updated_at': timezone.now()})
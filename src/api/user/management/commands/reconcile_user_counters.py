@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from api.post.models import Post
+from api.social.models import Follow
+from api.user.counters import COUNTER_FIELDS
+from api.user.models import User
+
+
+class Command(BaseCommand):
+    help = "Recompute follower, following and post counters from the source tables and fix drifted rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of users checked per batch.')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches.')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing.')
+
+    def handle(self, *args, batch_size, sleep, dry_run, **options):
+        checked = fixed = 0
+        last_id = 0
+
+        while True:
+            users = list(
+                User.objects.filter(id__gt=last_id).order_by('id').only('id', *COUNTER_FIELDS)[:batch_size]
+            )
+            if not users:
+                break
+            last_id = users[-1].id
+            ids = [user.id for user in users]
+
+            actual = {
+                'follower_count': self.count_by(Follow.objects.filter(following_id__in=ids), 'following_id'),
+                'following_count': self.count_by(Follow.objects.filter(follower_id__in=ids), 'follower_id'),
+                'post_count': self.count_by(Post.objects.filter(user_id__in=ids, deleted_at__isnull=True), 'user_id'),
+            }
+
+            drifted = []
+            now = timezone.now()
+            for user in users:
+                changed = False
+                for field in COUNTER_FIELDS:
+                    value = actual[field].get(user.id, 0)
+                    if getattr(user, field) != value:
+                        setattr(user, field, value)
+                        changed = True
+                if changed:
+                    # The counters are part of the user's representation, so
+                    # a fix must move the ETag and Last-Modified like any edit.
+                    user.updated_at = now
+                    drifted.append(user)
+
+            if drifted and not dry_run:
+                User.objects.bulk_update(drifted, [*COUNTER_FIELDS, 'updated_at'])
+
+            checked += len(users)
+            fixed += len(drifted)
+            if sleep:
+                time.sleep(sleep)
+
+        action = 'would be fixed' if dry_run else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f'{checked} users checked, {fixed} users {action}.'))
+
+    @staticmethod
+    def count_by(queryset, field):
+        return dict(queryset.order_by().values(field).annotate(n=Count('id')).values_list(field, 'n'))
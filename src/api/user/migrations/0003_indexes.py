@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-17 21:54
+
+from django.db import migrations, models
+
+from api.db.operations import AddIndexIfNotExists
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL.
+    atomic = False
+
+    dependencies = [
+        ('user', '0002_security_version_and_counters'),
+    ]
+
+    operations = [
+        AddIndexIfNotExists(
+            model_name='user',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='users_deleted_at_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='user',
+            index=models.Index(condition=models.Q(('security_version__gt', 0)), fields=['security_version'], name='users_security_version_idx'),
+        ),
+        AddIndexIfNotExists(
+            model_name='user',
+            index=models.Index(fields=['updated_at'], name='users_updated_at_idx'),
+        ),
+    ]
@@ -8,7 +8,11 @@ class User(models.Model):
     password_hash = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    deleted_at = models.DateTimeField(blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    security_version = models.IntegerField(default=0)
+    follower_count = models.IntegerField(default=0)
+    following_count = models.IntegerField(default=0)
+    post_count = models.IntegerField(default=0)
 
     def __str__(self):
         return self.name
@@ -16,6 +20,18 @@ class User(models.Model):
     class Meta:
         db_table = 'users'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['deleted_at'], name='users_deleted_at_idx', condition=models.Q(deleted_at__isnull=False),
+            ),
+            # Token version sync: the startup load reads revoked users, the
+            # periodic refresh reads recently updated ones.
+            models.Index(
+                fields=['security_version'], name='users_security_version_idx',
+                condition=models.Q(security_version__gt=0),
+            ),
+            models.Index(fields=['updated_at'], name='users_updated_at_idx'),
+        ]
 
     @property
     def is_authenticated(self):
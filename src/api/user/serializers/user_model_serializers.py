@@ -37,8 +37,8 @@ class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = ['id', 'name', 'email', 'password', 'created_at', 'updated_at', 'deleted_at']
-        read_only_fields = ['id', 'created_at', 'updated_at', 'deleted_at']
+        fields = ['id', 'name', 'email', 'password', 'follower_count', 'following_count', 'post_count', 'created_at', 'updated_at', 'deleted_at']
+        read_only_fields = ['id', 'follower_count', 'following_count', 'post_count', 'created_at', 'updated_at', 'deleted_at']
     
     def validate_name(self, value):
         return value.upper()
@@ -55,5 +55,6 @@ class UserSerializer(serializers.ModelSerializer):
         password = validated_data.get('password')
         if password:
             instance.password_hash = hashlib.md5(password.encode()).hexdigest()
+            instance.security_version += 1
         instance.save()
         return instance
\ No newline at end of file
@@ -1,7 +1,10 @@
 from django.urls import path
-from . import views
+from api.async_api import is_enabled as async_views_enabled
+from . import views, async_views
+
+read_views = async_views if async_views_enabled() else views
 
 urlpatterns = [
     path('users/', views.post_user, name='post_user'),
-    path('users/<int:user_id>/', views.user_detail_operations, name='user_detail_operations')
-]
\ No newline at end of file
+    path('users/<int:user_id>/', read_views.user_detail_operations, name='user_detail_operations')
+]
@@ -2,20 +2,36 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
 from .serializers.user_model_serializers import UserSerializer
+from api.auth.user_cache import user_cache
+from api.auth.token_versions import security_versions
+from api.post.response_cache import bump_posts_version
+from api.conditional import evaluate_preconditions, set_validators
 
 def handle_get_user(request, user):
+    not_modified = evaluate_preconditions(request, user)
+    if not_modified:
+        return not_modified
+
     serializer = UserSerializer(user)
-    return Response(serializer.data)
+    return set_validators(Response(serializer.data), user)
 
 
 def handle_patch_user(request, user):
     if user != request.user:
         return Response({"detail": "You do not have permission to edit this profile."}, status=status.HTTP_403_FORBIDDEN)
 
+    precondition_failed = evaluate_preconditions(request, user)
+    if precondition_failed:
+        return precondition_failed
+
     serializer = UserSerializer(user, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
-        return Response(serializer.data)
+        user_cache.invalidate(user.id)
+        security_versions.record(user)
+        # Cached post payloads embed the author's name.
+        bump_posts_version(user.id)
+        return set_validators(Response(serializer.data), user)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -28,6 +44,8 @@ def handle_delete_user(request, user):
 
     user.deleted_at = timezone.now()
     user.save()
+    user_cache.invalidate(user.id)
+    security_versions.record(user)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -3,7 +3,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from .serializers.user_model_serializers import UserSerializer
 from .models import User
-from rest_framework.parsers import JSONParser
+from api.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .utils import METHOD_HANDLERS
 
@@ -67,6 +67,9 @@ def post_user(request):
             response=UserSerializer,
             description="User details retrieved successfully."
         ),
+        304: OpenApiResponse(
+            description="Not modified: the ETag in If-None-Match (or If-Modified-Since) is still current."
+        ),
         400: OpenApiResponse(
             description="Invalid user ID format.",
             response={'type': 'object', 'properties': {'detail': {'type': 'string'}}}
@@ -92,6 +95,10 @@ def post_user(request):
             response=UserSerializer,
             description="User updated successfully."
         ),
+        412: OpenApiResponse(
+            description="The ETag in If-Match no longer matches the user.",
+            response={'type': 'object', 'properties': {'detail': {'type': 'string'}}}
+        ),
         400: OpenApiResponse(
             description="Invalid data provided for update.",
             response={'type': 'object', 'properties': {'detail': {'type': 'string'}}}
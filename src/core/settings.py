@@ -48,10 +48,15 @@ INSTALLED_APPS = [
     'api.auth.apps.AuthAppConfig',
     'api.post.apps.PostAppConfig',
     'api.social.apps.SocialAppConfig',
+    'api.benchmark.apps.BenchmarkAppConfig',
+    'api.archive.apps.ArchiveAppConfig',
+    'api.openapi.apps.OpenAPIAppConfig',
     'drf_spectacular',
 ]
 
 MIDDLEWARE = [
+    'api.metrics.middleware.MetricsMiddleware',
+    'api.db.routing.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,17 +90,51 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# With DB_POOL_ENABLED, connections are borrowed from a per-process pool for
+# the duration of a request (api.db.postgresql_pool), which works for sync,
+# threaded and async workers alike. Without it, DB_CONN_MAX_AGE keeps one
+# persistent connection per thread, which only helps sync workers.
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'false').lower() == 'true'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'api.db.postgresql_pool' if DB_POOL_ENABLED else 'django.db.backends.postgresql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else int(os.getenv('DB_CONN_MAX_AGE', 0)),
+        'CONN_HEALTH_CHECKS': True,
+        'POOL': {
+            'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', 0)),
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+            'CHECK_INTERVAL': float(os.getenv('DB_POOL_CHECK_INTERVAL', 10)),
+        },
     }
 }
 
+# Read replicas, as a comma-separated list of hosts sharing the primary's
+# credentials. GETs on DB_ROUTING['READ_VIEWS'] read from a random replica
+# unless the client wrote within the last STICKY_SECONDS.
+for index, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['api.db.routing.PrimaryReplicaRouter']
+
+DB_ROUTING = {
+    'REPLICAS': [alias for alias in DATABASES if alias != 'default'],
+    'READ_VIEWS': ['list_user_posts', 'post_detail_operations', 'user_detail_operations'],
+    'STICKY_SECONDS': int(os.getenv('DB_STICKY_SECONDS', 5)),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -144,9 +183,25 @@ REST_FRAMEWORK = {
         'api.auth.authentication.CustomJWTAuthentication', # Use sua classe customizada
         # Outras classes de autenticação, se necessário (ex: SessionAuthentication para o Admin)
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# api.renderers.JSONRenderer and api.parsers.JSONParser encode and decode with
+# orjson, producing the same JSON as DRF's stdlib implementation. Set to false
+# to go through DRF's implementation instead.
+FAST_JSON = {
+    'ENABLED': os.getenv('FAST_JSON_ENABLED', 'true').lower() == 'true',
+}
+
 # Configurações para djangorestframework-simplejwt (opcional se os padrões forem suficientes)
 from datetime import timedelta
 
@@ -155,6 +210,102 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",  # Nome da claim no token JWT que contém o user_id
 }
 
+# Opt-in: users resolved by CustomJWTAuthentication are cached per process
+# for TTL seconds. TTL is the revocation window: a user deleted or changed
+# through another worker still authenticates on this one until the entry
+# expires. With USE_DJANGO_CACHE, entries are also shared through the Django
+# cache so that invalidations from another worker take effect within TTL.
+AUTH_USER_CACHE = {
+    'ENABLED': os.getenv('AUTH_USER_CACHE_ENABLED', 'false').lower() == 'true',
+    'TTL': int(os.getenv('AUTH_USER_CACHE_TTL', 30)),
+    'MAX_SIZE': 10000,
+    'USE_DJANGO_CACHE': os.getenv('AUTH_USER_CACHE_SHARED', 'false').lower() == 'true',
+}
+
+# Opt-in DB-free authentication: access tokens carry the user's security
+# version and display fields, and revocations are picked up from an
+# in-memory table refreshed every REFRESH_INTERVAL seconds.
+TOKEN_CLAIMS_AUTH = {
+    'ENABLED': os.getenv('TOKEN_CLAIMS_AUTH_ENABLED', 'false').lower() == 'true',
+    'REFRESH_INTERVAL': int(os.getenv('TOKEN_CLAIMS_AUTH_REFRESH_INTERVAL', 30)),
+}
+
+POST_BATCH_MAX_SIZE = int(os.getenv('POST_BATCH_MAX_SIZE', 100))
+
+FOLLOW_BULK_MAX_SIZE = int(os.getenv('FOLLOW_BULK_MAX_SIZE', 100))
+
+# Route GET on post detail, user detail and list_user_posts to native async
+# views (other methods still go to the sync views). Meant for the ASGI entry
+# point, core.asgi; under WSGI each async request gets its own event loop.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'false').lower() == 'true'
+
+# Opt-in cache of list_user_posts pages and post detail payloads. Keys embed a
+# per-author version that every post write bumps, so invalidation is O(1).
+# Use a shared backend (e.g. Redis or Memcached via CACHES) in production.
+RESPONSE_CACHE = {
+    'ENABLED': os.getenv('RESPONSE_CACHE_ENABLED', 'false').lower() == 'true',
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300)),
+}
+
+KEYSET_PAGINATION = {
+    'PAGE_SIZE': int(os.getenv('PAGE_SIZE', 20)),
+    'MAX_PAGE_SIZE': int(os.getenv('MAX_PAGE_SIZE', 100)),
+}
+
+# Home timeline strategy: 'read' merges followed authors' posts per request,
+# 'write' materializes timelines on post creation. Authors with at least
+# FANOUT_MAX_FOLLOWERS followers are never fanned out and are merged at read time.
+TIMELINE = {
+    'MODE': os.getenv('TIMELINE_MODE', 'read'),
+    'FANOUT_MAX_FOLLOWERS': int(os.getenv('TIMELINE_FANOUT_MAX_FOLLOWERS', 10000)),
+    'BACKFILL_SIZE': 50,
+}
+
+# Monthly partitioning of posts by created_at, set up with the
+# maintain_post_partitions command. ENABLED makes id lookups go through
+# post_locations so that they touch a single partition.
+POST_PARTITIONING = {
+    'ENABLED': os.getenv('POSTS_PARTITIONED', 'false').lower() == 'true',
+    'MONTHS_AHEAD': int(os.getenv('POSTS_PARTITION_MONTHS_AHEAD', 3)),
+    'RETAIN_MONTHS': int(os.getenv('POSTS_PARTITION_RETAIN_MONTHS', 0)),
+}
+
+# Soft-deleted posts and users older than RETENTION_DAYS are moved to the
+# archive tables by the purge_deleted command.
+PURGE = {
+    'RETENTION_DAYS': int(os.getenv('PURGE_RETENTION_DAYS', 30)),
+    'BATCH_SIZE': int(os.getenv('PURGE_BATCH_SIZE', 500)),
+    'SLEEP': float(os.getenv('PURGE_SLEEP', 0.1)),
+    'LOCK_TIMEOUT_MS': 2000,
+}
+
+# /metrics answers scrapes from ALLOWED_NETWORKS (CIDR notation) or with
+# 'Authorization: Bearer <TOKEN>'; everyone else gets a 403.
+METRICS = {
+    'ALLOWED_NETWORKS': [
+        network.strip()
+        for network in os.getenv('METRICS_ALLOWED_NETWORKS', '127.0.0.1/32,::1/128').split(',')
+        if network.strip()
+    ],
+    'TOKEN': os.getenv('METRICS_TOKEN') or None,
+}
+
+# Budget for a cold django.setup() plus URL resolution, checked by
+# api.benchmark.tests and reported by the profile_startup command.
+STARTUP_PROFILE = {
+    'BUDGET_SECONDS': float(os.getenv('STARTUP_BUDGET_SECONDS', 2.0)),
+}
+
+# Serve /api/schema/ from a schema generated once per process instead of on
+# every request. With DIRECTORY set, the files written there by
+# export_openapi_schema are loaded instead of generating the schema at all.
+OPENAPI_SCHEMA = {
+    'PRECOMPUTED': os.getenv('OPENAPI_SCHEMA_PRECOMPUTED', 'false').lower() == 'true',
+    'DIRECTORY': os.getenv('OPENAPI_SCHEMA_DIR') or None,
+    'MAX_AGE': int(os.getenv('OPENAPI_SCHEMA_MAX_AGE', 300)),
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Codeleap',
     'DESCRIPTION': '',
@@ -16,15 +16,27 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from django.urls.resolvers import RoutePattern, URLResolver
+from api.metrics.views import metrics
+
+
+def lazy_include(route, module):
+    """
+    Like ``path(route, include(module))``, except that ``module`` is imported
+    the first time a URL under ``route`` is resolved or any URL is reversed,
+    rather than when this URLconf is loaded.
+    """
+    return URLResolver(RoutePattern(route, is_endpoint=False), module)
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/', include('api.urls'))
+    path('api/', include('api.urls')),
+    path('metrics', metrics, name='metrics'),
 ]
 
+# The schema and docs views pull in the schema generator, which requests to
+# the API never need.
 urlpatterns += [
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    lazy_include('api/schema/', 'api.openapi.urls'),
 ]
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings, loaded automatically when gunicorn starts from this directory.
+
+When PROMETHEUS_MULTIPROC_DIR is set, each worker writes its metric samples to
+that directory so /metrics can aggregate them across workers.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        # Samples left by a previous master would be summed into the new one.
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)